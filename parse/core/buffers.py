@@ -0,0 +1,140 @@
+from contextlib import contextmanager
+import mmap
+
+@contextmanager
+def mapped(filename):
+    """
+    Memory maps a file, read-only, for the duration of a `with` block.
+    Only the pages that are searched or sliced are read from disk, and
+    the blocks found by `RegexRangeExtractor.spans` stay in the mapping
+    until they are needed.
+
+    Example:
+
+    ```
+    with mapped('gaussian.log') as buf:
+        for begin, end in rre.spans(buf):
+            block = span_text(buf, begin, end)
+    ```
+
+    Parameters
+    ----------
+    :filename, str: name of the file to map.
+
+    Returns
+    -------
+    mmap object (or an empty bytes object, since an empty file cannot
+    be mapped).
+    """
+    with open(filename, 'rb') as ifs:
+        try:
+            buf = mmap.mmap(ifs.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file
+            buf = b''
+    try:
+        yield buf
+    finally:
+        if isinstance(buf, mmap.mmap):
+            buf.close()
+
+
+@contextmanager
+def searchable(ifs):
+    """
+    Exposes the unread contents of a stream as a buffer that can be
+    searched in place, for the duration of a `with` block: the string
+    behind a StringIO, or a memory map of a regular file that has not
+    been read from. On exit, the stream is left at its end, as though
+    it had been read line by line.
+
+    Parameters
+    ----------
+    :ifs, file-like object: stream to expose.
+
+    Returns
+    -------
+    (buffer, offset of the unread contents), or (None, None) if the
+    stream cannot be searched in place, e.g. a pipe.
+    """
+    buf, pos = None, None
+    owned = False
+    try:
+        if hasattr(ifs, 'getvalue'):
+            # StringIO (or a `Searched` stream, whose buffer it shares)
+            pos = ifs.tell()
+            buf = ifs.getvalue()
+        elif hasattr(ifs, 'fileno') and (ifs.tell() == 0) and \
+             ('b' not in getattr(ifs, 'mode', 'r')):
+            pos = 0
+            buf = mmap.mmap(ifs.fileno(), 0, access=mmap.ACCESS_READ)
+            owned = True
+    except (AttributeError, EnvironmentError, ValueError):
+        # e.g. pipes and sockets, or an empty file (which cannot be mapped)
+        buf, pos = None, None
+        owned = False
+    try:
+        yield buf, pos
+    finally:
+        if owned:
+            buf.close()
+        if buf is not None:
+            ifs.seek(0, 2)
+
+
+def span_text(buf, begin, end):
+    """
+    Returns the text of `buf[begin:end]`, decoding it if `buf` holds
+    bytes, e.g. a memory-mapped file.
+    """
+    text = buf[begin:end]
+    if not isinstance(text, str):
+        text = text.decode('utf-8', 'replace')
+    # match the universal newlines of a file opened in text mode
+    return text.replace('\r\n', '\n')
+
+
+class Searched(object):
+    def __init__(self, buf, spans, pos=0):
+        """
+        A stream over a buffer that has already been searched, e.g. by
+        `MultiRegexRangeExtractor.spans`, to be handed to a getter: the
+        extractors whose spans were found slice their blocks straight
+        from the buffer, as from a sidecar index (see `parse.core.index`),
+        rather than search it again. Any other extractor searches the
+        buffer, as it would that of a StringIO.
+
+        Parameters
+        ----------
+        :buf, {mmap|bytes|str}: the buffer that was searched.
+        :spans, dict: extractor signature (see
+                `RegexRangeExtractor.signature`) --> list of the
+                (begin, end) offsets of its blocks in `buf`.
+
+        Keywords
+        --------
+        :pos, int: offset of the line at which the search started.
+                (Default: 0)
+        """
+        self.buf = buf
+        self.spans = spans
+        self._pos = pos
+
+    def getvalue(self):
+        return self.buf
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self._pos
+        elif whence == 2:
+            offset += len(self.buf)
+        self._pos = offset
+
+    def __iter__(self):
+        # read line by line, e.g. by an extractor called with debug=True
+        text = span_text(self.buf, self._pos, len(self.buf))
+        self._pos = len(self.buf)
+        return iter(text.splitlines(True))
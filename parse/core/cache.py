@@ -0,0 +1,258 @@
+from functools import wraps
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import time
+
+from .. import __version__
+
+# bytes hashed from each end of a file for its fingerprint
+_SAMPLE = 1 << 16
+# default cap on the size of the cached values
+DEFAULT_MAX_BYTES = 1 << 30
+# errors raised by a pickle that cannot be loaded, e.g. one that is cut
+# short, or that refers to a class that has since been moved or changed
+_STALE = (pickle.UnpicklingError, AttributeError, EOFError, ImportError,
+          IndexError, KeyError, TypeError, ValueError)
+
+def sample_digest(filename, size=None):
+    """
+    Returns a hash of the first and last 64 KiB of `filename`, where a
+    Gaussian log records the job and how it ended.
+
+    Keywords
+    --------
+    :size, int: size of the file, if known. (Default: None, stat it)
+    """
+    if size is None:
+        size = os.path.getsize(filename)
+    digest = hashlib.sha1()
+    with open(filename, 'rb') as ifs:
+        digest.update(ifs.read(_SAMPLE))
+        if size > _SAMPLE:
+            ifs.seek(max(_SAMPLE, size - _SAMPLE))
+            digest.update(ifs.read(_SAMPLE))
+    return digest.hexdigest()
+
+
+def content_fingerprint(filename):
+    """
+    Returns a fingerprint of the contents of `filename` that is cheap to
+    compute, even for a large file: its size, modification time, and a
+    hash of its first and last 64 KiB (see `sample_digest`).
+    """
+    stat = os.stat(filename)
+    return '{}:{!r}:{}'.format(stat.st_size, stat.st_mtime,
+                               sample_digest(filename, stat.st_size))
+
+
+class ResultCache(object):
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES, timeout=60.):
+        """
+        On-disk cache of the values parsed from files, held in an SQLite
+        database. Values are pickled. Once the pickles exceed `max_bytes`,
+        the least recently used are evicted.
+
+        Several processes may share a cache: SQLite locks the database
+        file around each write, and a process waits up to `timeout`
+        seconds for another to finish. A cache that cannot be read or
+        written, e.g. because it is locked for too long, behaves as a
+        cache miss, so parsing never fails because of the cache.
+
+        Parameters
+        ----------
+        :path, str: name of the database file.
+
+        Keywords
+        --------
+        :max_bytes, int: size limit of the cached values.
+                (Default: 1 GiB)
+        :timeout, float: seconds to wait for a lock. (Default: 60)
+        """
+        self.path = path
+        self.max_bytes = int(max_bytes)
+        self.timeout = float(timeout)
+        self._connection = None
+        self._pid = None
+
+    def _connect(self):
+        """
+        Returns the connection of this process to the database, creating
+        the database if needed. A connection is not shared across a fork.
+        """
+        if (self._connection is None) or (self._pid != os.getpid()):
+            dirname = os.path.dirname(os.path.abspath(self.path))
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            db = sqlite3.connect(self.path, timeout=self.timeout)
+            # readers do not block the writer, or each other
+            db.execute('PRAGMA journal_mode=WAL')
+            with db:
+                db.execute('CREATE TABLE IF NOT EXISTS results ('
+                           'key TEXT PRIMARY KEY, '
+                           'value BLOB NOT NULL, '
+                           'size INTEGER NOT NULL, '
+                           'accessed REAL NOT NULL)')
+                db.execute('CREATE INDEX IF NOT EXISTS lru '
+                           'ON results (accessed)')
+            self._connection = db
+            self._pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def key(name, filename, arguments):
+        """
+        Returns the key of the value returned by the function `name` for
+        the file `filename`, called with `arguments` (a dict). The key
+        changes if the file or the version of this library changes.
+        """
+        text = repr((name,
+                     sorted(arguments.items()),
+                     content_fingerprint(filename),
+                     __version__))
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Returns
+        -------
+        (True, value) if `key` is cached; otherwise, (False, None). A
+        value that can no longer be unpickled is discarded, as a miss.
+        """
+        try:
+            db = self._connect()
+            row = db.execute('SELECT value FROM results WHERE key = ?',
+                             (key,)).fetchone()
+            if row is None:
+                return (False, None)
+            with db:
+                db.execute('UPDATE results SET accessed = ? WHERE key = ?',
+                           (time.time(), key))
+        except (sqlite3.Error, EnvironmentError):
+            return (False, None)
+        try:
+            return (True, pickle.loads(bytes(row[0])))
+        except _STALE:
+            # a miss: the value is parsed again, and replaced
+            self.discard(key)
+            return (False, None)
+
+    def discard(self, key):
+        """
+        Removes the value cached under `key`, if any.
+        """
+        try:
+            db = self._connect()
+            with db:
+                db.execute('DELETE FROM results WHERE key = ?', (key,))
+        except (sqlite3.Error, EnvironmentError):
+            pass
+
+    def put(self, key, value):
+        """
+        Caches `value` under `key`, then evicts the least recently used
+        values until the cache is within its size limit.
+        """
+        blob = pickle.dumps(value, 2)
+        try:
+            db = self._connect()
+            with db:
+                db.execute('INSERT OR REPLACE INTO results '
+                           '(key, value, size, accessed) VALUES (?, ?, ?, ?)',
+                           (key, sqlite3.Binary(blob), len(blob),
+                            time.time()))
+                total = db.execute('SELECT TOTAL(size) '
+                                   'FROM results').fetchone()[0]
+                if total > self.max_bytes:
+                    stale = []
+                    for old, size in db.execute('SELECT key, size '
+                                                'FROM results '
+                                                'ORDER BY accessed'):
+                        if total <= self.max_bytes:
+                            break
+                        stale.append((old,))
+                        total -= size
+                    db.executemany('DELETE FROM results WHERE key = ?',
+                                   stale)
+        except (sqlite3.Error, EnvironmentError):
+            pass
+
+    def clear(self):
+        """Removes every cached value."""
+        db = self._connect()
+        with db:
+            db.execute('DELETE FROM results')
+
+
+# the cache used by `cached` functions, if enabled
+_cache = None
+
+def enable(path=None, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Caches the values returned by every `cached` function, e.g. the
+    `get_*` functions of `parse.gaussian.log`, when they are passed the
+    name of a file. Caching is also enabled on import if the PARSE_CACHE
+    environment variable names the database file.
+
+    Keywords
+    --------
+    :path, str: name of the database file.
+            (Default: $PARSE_CACHE, or ~/.cache/parse/results.sqlite)
+    :max_bytes, int: size limit of the cached values. (Default: 1 GiB)
+
+    Returns
+    -------
+    ResultCache object.
+    """
+    global _cache
+    if path is None:
+        path = os.environ.get('PARSE_CACHE') or \
+               os.path.join(os.path.expanduser('~'),
+                            '.cache', 'parse', 'results.sqlite')
+    _cache = ResultCache(path, max_bytes=max_bytes)
+    return _cache
+
+
+def disable():
+    """Stops caching the values returned by `cached` functions."""
+    global _cache
+    _cache = None
+
+
+def cached(getter):
+    """
+    Decorates a function, whose first argument is a file (name or
+    stream), so that its values are cached when caching is enabled (see
+    `enable`) and it is called with the name of a file. The value is
+    keyed by the function, its other arguments, and a fingerprint of the
+    file (see `content_fingerprint`). A call that writes its value to a
+    file, through an `out` argument, is not cached.
+    """
+    name = '{}.{}'.format(getter.__module__, getter.__name__)
+    @wraps(getter)
+    def wrapper(filename, *args, **kwds):
+        cache = _cache
+        if (cache is None) or not isinstance(filename, str):
+            return getter(filename, *args, **kwds)
+        arguments = inspect.getcallargs(getter, filename, *args, **kwds)
+        del arguments['filename']
+        if arguments.get('out') is not None:
+            # the value is a map of the file written
+            return getter(filename, *args, **kwds)
+        try:
+            key = cache.key(name, filename, arguments)
+        except EnvironmentError:
+            # e.g. a missing file: let the getter report it
+            return getter(filename, *args, **kwds)
+        found, value = cache.get(key)
+        if not found:
+            value = getter(filename, *args, **kwds)
+            cache.put(key, value)
+        return value
+    return wrapper
+
+
+if os.environ.get('PARSE_CACHE'):
+    enable()
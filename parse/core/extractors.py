@@ -1,7 +1,149 @@
 from __future__ import print_function
+import heapq
+import itertools
 import re
 import sys
 
+from .buffers import Searched, searchable, span_text
+from .index import lookup
+from .parallel import mapped_name, parallel_spans
+
+# escapes that stand for a class of characters, rather than a literal one
+_ESCAPED_CLASSES = set('AbBdDsSwWZ0123456789afnrtvx')
+
+def required_literal(pattern):
+    r"""
+    Finds the longest run of literal text that every match of a regular
+    expression must contain, e.g. 'SCF Done:' for r'^\s*SCF Done:'.
+    A buffer can then be searched for the literal with `find`, which
+    is far faster than applying the regular expression to every line.
+
+    The analysis is conservative: patterns with alternation or
+    without any required literal text return None.
+
+    Parameters
+    ----------
+    :pattern, str: regular expression.
+
+    Returns
+    -------
+    str, or None.
+    """
+    # --------------- helper functions --------------- #
+    def skip_quantifier(i):
+        """Index after any quantifier that starts at `i`."""
+        if i < len(pattern) and pattern[i] == '{':
+            i = pattern.find('}', i) + 1 or len(pattern)
+        elif i < len(pattern) and pattern[i] in '*+?':
+            i += 1
+        # lazy/possessive modifiers
+        if i < len(pattern) and pattern[i] in '?+':
+            i += 1
+        return i
+
+    def skip_group(i, opening, closing):
+        """Index after the group/class that opens at `i`."""
+        depth = 0
+        while i < len(pattern):
+            if pattern[i] == '\\':
+                i += 2
+                continue
+            if pattern[i] == opening:
+                depth += 1
+            elif pattern[i] == closing:
+                depth -= 1
+                if depth == 0:
+                    return i + 1
+            i += 1
+        return i
+    # ------------- end helper functions ------------- #
+    if '|' in pattern:
+        return None
+    runs = [[]]
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\' and (i + 1 < len(pattern)) and \
+           (pattern[i+1] not in _ESCAPED_CLASSES):
+            char = pattern[i+1]
+            i += 2
+        elif c in '\\.^$([':
+            # anything but a plain character ends the current run
+            if c == '\\':
+                i += 2
+            elif c == '(':
+                i = skip_group(i, '(', ')')
+            elif c == '[':
+                # a ']' right after the '[' (or '[^') is part of the class
+                j = i + 2 if pattern[i+1:i+2] == '^' else i + 1
+                j = pattern.find(']', j + 1) + 1 or len(pattern)
+                i = j
+            else:
+                i += 1
+            i = skip_quantifier(i)
+            runs.append([])
+            continue
+        else:
+            char = c
+            i += 1
+        # is the character required?
+        quantifier = pattern[i] if i < len(pattern) else ''
+        if quantifier in ('*', '?', '{'):
+            i = skip_quantifier(i)
+            runs.append([])
+        elif quantifier == '+':
+            runs[-1].append(char)
+            i = skip_quantifier(i)
+            runs.append([])
+        else:
+            runs[-1].append(char)
+    literal = max([''.join(run) for run in runs], key=len)
+    return literal or None
+
+def _alternation(pattern):
+    """
+    Does a regular expression have a top-level alternation, i.e. a '|'
+    outside of every group and character class?
+    """
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '[':
+            # a ']' right after the '[' (or '[^') is part of the class
+            j = i + 2 if pattern[i+1:i+2] == '^' else i + 1
+            i = pattern.find(']', j + 1) + 1 or len(pattern)
+            continue
+        if c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        elif (c == '|') and (depth == 0):
+            return True
+        i += 1
+    return False
+
+
+# assertions whose truth may depend on where the searched text ends
+_END_ASSERTIONS = ('$', r'\Z', r'\b', r'\B', '(?=', '(?!')
+
+def _line_bound(regex):
+    """
+    Could a match of `regex` within a single line be missed by a search
+    of the whole buffer, e.g. '^$', which matches at the end of every
+    line searched on its own? True if the pattern matches an empty
+    string, or asserts something about the text after the match.
+    """
+    pattern = regex.pattern
+    if isinstance(pattern, bytes):
+        pattern = pattern.decode('latin1')
+    return (regex.match(regex.pattern[:0]) is not None) or \
+        any(a in pattern for a in _END_ASSERTIONS)
+
+
 class Extractor(object):
     def __init__(self, *args, **kwds):
         """Base class for all extractors. Defines the extractor API."""
@@ -67,10 +209,370 @@ class RegexRangeExtractor(Extractor):
             self.skip = int(kwds['skip'])
         else:
             self.skip = 0
+        # state used when lines are pushed in one at a time (see `feed`)
+        self.reset()
+        # start/stop patterns compiled for searching buffers (see `spans`)
+        self._buffer_patterns = {}
+
+    def reset(self):
+        """
+        Clears the block-matching state used by `feed`.
+        """
+        self._inblock = False
+        self._skip = self.skip
+        self._lines = []
+
+    @property
+    def signature(self):
+        """
+        Tuple that identifies the blocks this extractor matches. Two
+        extractors with the same signature extract identical blocks.
+        """
+        return (self.start.pattern, self.stop.pattern,
+                self.include_start, self.include_stop,
+                self.reverse_start, self.reverse_stop,
+                self.skip)
+
+    @property
+    def inblock(self):
+        """Has `feed` seen the start, but not yet the stop, of a block?"""
+        return self._inblock
+
+    def feed(self, line):
+        """
+        Advances the extractor by a single line. This is the push
+        counterpart to `__call__`: the caller owns the loop over the
+        stream, so that several extractors may share one pass through
+        a file.
+
+        Parameters
+        ----------
+        :line, str: next line of the stream.
+
+        Returns
+        -------
+        The block, if `line` completes one; otherwise, None.
+        """
+        # if not currently reading the block...
+        if not self._inblock:
+            # ... is this the start of the block?
+            is_start = bool(self.start.search(line))
+            if is_start != self.reverse_start:
+                self._inblock = True
+                self._skip = self.skip
+                self._lines = [line] if self.include_start else []
+            return None
+        # include skipped lines after initial match
+        if self._skip > 0:
+            self._lines.append(line)
+            self._skip -= 1
+            return None
+        # check if we've reached the end
+        is_stop = bool(self.stop.search(line))
+        if is_stop != self.reverse_stop:
+            if self.include_stop:
+                self._lines.append(line)
+            block = ''.join(self._lines)
+            self.reset()
+            return block
+        self._lines.append(line)
+        return None
+
+    def flush(self):
+        """
+        Ends a stream that was pushed through `feed`.
+
+        Returns
+        -------
+        The block that was still open when the stream ended, or None.
+        """
+        block = ''.join(self._lines) if self._inblock else None
+        self.reset()
+        return block
+
+    def spans(self, buf, pos=0, endpos=None):
+        """
+        Finds the blocks in an in-memory buffer, e.g. a memory-mapped file
+        (see `parse.core.buffers.mapped`), without copying them out of the
+        buffer.
+
+        Parameters
+        ----------
+        :buf, {mmap|bytes|str}: buffer to be searched.
+
+        Keywords
+        --------
+        :pos, int: offset of the line at which to start. (Default: 0)
+        :endpos, int: offset at which to end. (Default: len(buf))
+
+        Returns
+        -------
+        list of (begin, end) offsets, one per block, where `buf[begin:end]`
+        holds the text `__call__` returns for that block.
+        """
+        return list(self.iter_spans(buf, pos, endpos))
+
+    def iter_spans(self, buf, pos=0, endpos=None):
+        """
+        Generates the (begin, end) offsets of each block in `buf` as soon
+        as the block is closed. See `spans`.
+        """
+        endpos = len(buf) if endpos is None else endpos
+        carry = []
+        for first, begin, end, last in self._walk(buf, pos, endpos, carry):
+            yield (begin, end)
+        # was the end reached in the middle of a block?
+        if carry:
+            yield (carry[1], endpos)
+
+    def _walk(self, buf, pos, endpos, carry, until_closed=False):
+        """
+        Generates (start line, begin, end, end of stop line) offsets of
+        each block closed in `buf` between `pos` and `endpos`, which must
+        both be the offsets of line starts (or the end of `buf`).
+
+        A block may be carried into and out of the range (see
+        `parse.core.parallel`): `carry` is a list, either empty, or the
+        (start line, begin, skip left) of a block open at `pos`. Once the
+        generator is exhausted, it holds that of the block left open at
+        `endpos`, if any.
+
+        Keywords
+        --------
+        :until_closed, bool: stop once no block is open, e.g. as soon as
+                the carried block is closed. (Default: False)
+        """
+        start, stop, newline, anchor = self._buffer_search(buf)[:4]
+        if carry:
+            first, begin, skip = carry
+            inblock = True
+        else:
+            skip = self.skip
+            inblock = False
+        while pos < endpos:
+            if not inblock:
+                if until_closed:
+                    break
+                if anchor is not None:
+                    # jump to the next line that could start a block
+                    hit = buf.find(anchor, pos, endpos)
+                    if hit < 0:
+                        break
+                    bol = buf.rfind(newline, pos, hit)
+                    pos = pos if bol < 0 else bol + 1
+            elif (skip == 0) and not self.reverse_stop:
+                # jump to the stop line
+                found = self._find_stop(buf, pos, endpos)
+                if found is None:
+                    break
+                bol, eol = found
+                yield (first, begin, eol if self.include_stop else bol, eol)
+                inblock = False
+                skip = self.skip
+                pos = eol
+                continue
+            eol = buf.find(newline, pos, endpos)
+            eol = endpos if eol < 0 else eol + 1
+            # if not currently reading the block...
+            if not inblock:
+                # ... is this the start of the block?
+                is_start = start(buf, pos, eol) is not None
+                if is_start != self.reverse_start:
+                    # include the first (start) line?
+                    first = pos
+                    begin = pos if self.include_start else eol
+                    inblock = True
+            # include skipped lines after initial match
+            elif skip > 0:
+                skip -= 1
+            else:
+                # check if we've reached the end
+                is_stop = stop(buf, pos, eol) is not None
+                if is_stop != self.reverse_stop:
+                    # include the last (stop) line?
+                    yield (first, begin,
+                           eol if self.include_stop else pos, eol)
+                    inblock = False
+                    skip = self.skip
+            pos = eol
+        carry[:] = [first, begin, skip] if inblock else []
+
+    def iter_spans_from_end(self, buf, pos=0, endpos=None):
+        """
+        Generates the (begin, end) offsets of the blocks in `buf` from the
+        last to the first, by searching backwards from `endpos` for lines
+        that start a block. Only the lines from each start line to its
+        stop line are read, so the last block of a long file is found
+        without reading what precedes it. The blocks are those of
+        `spans`, in reverse order, other than a block left open at
+        `endpos` (e.g. by a running job), which is incomplete: the first
+        block generated is the last complete one.
+
+        Blocks are assumed not to overlap, i.e. a start line does not
+        appear inside another block, as is true of Gaussian output, other
+        than in a run of consecutive start lines, e.g. the "Alpha occ."
+        rows of a block of eigenvalues: the blocks of such a run are read
+        forward from its first line.
+
+        Parameters
+        ----------
+        :buf, {mmap|bytes|str}: buffer to be searched.
+
+        Keywords
+        --------
+        :pos, int: offset of the line at which to stop. (Default: 0)
+        :endpos, int: offset from which to search. (Default: len(buf))
+        """
+        start, stop, newline, anchor = self._buffer_search(buf)[:4]
+        endpos = len(buf) if endpos is None else endpos
+        hi = endpos
+        while hi > pos:
+            if anchor is not None:
+                # jump to the previous line that could start a block
+                hit = buf.rfind(anchor, pos, hi)
+                if hit < 0:
+                    break
+            else:
+                hit = hi - 1
+            bol = buf.rfind(newline, pos, hit)
+            bol = pos if bol < 0 else bol + 1
+            eol = buf.find(newline, bol, endpos)
+            eol = endpos if eol < 0 else eol + 1
+            is_start = start(buf, bol, eol) is not None
+            if is_start != self.reverse_start:
+                # back up to the first of a run of start lines
+                first = bol
+                while first > pos:
+                    prev = buf.rfind(newline, pos, first - 1)
+                    prev = pos if prev < 0 else prev + 1
+                    is_start = start(buf, prev, first) is not None
+                    if is_start == self.reverse_start:
+                        break
+                    first = prev
+                # read forward, from the first start line to the stop
+                # line of the block that holds this one
+                blocks = []
+                carry = []
+                for block in self._walk(buf, first, endpos, carry):
+                    blocks.append(block)
+                    if block[3] > bol:
+                        break
+                else:
+                    # the end was reached in the middle of a block, e.g.
+                    # one still being written by a running job: it is
+                    # left out, unless the end itself stops it, as it
+                    # does the single-line block of a RegexExtractor
+                    if carry and (carry[2] == 0) and \
+                       ((stop(buf, endpos, endpos) is not None) != \
+                        self.reverse_stop):
+                        blocks.append((carry[0], carry[1], endpos, endpos))
+                for block in reversed(blocks):
+                    yield (block[1], block[2])
+                bol = first
+            hi = bol
+
+    def __getstate__(self):
+        # compiled search methods are rebuilt on demand, e.g. by a worker
+        # of `parse.core.parallel`
+        state = self.__dict__.copy()
+        state['_buffer_patterns'] = {}
+        return state
+
+    def _indexed_spans(self, ifs, buf, pos):
+        """
+        Returns the spans of this extractor recorded in the sidecar index
+        of the file behind `ifs` (see `parse.core.index`), or already
+        found in `buf`, if `ifs` is a `Searched` stream; or None if the
+        file is not indexed, or if `buf` is not the whole, mapped file.
+        """
+        if isinstance(ifs, Searched):
+            return ifs.spans.get(self.signature)
+        if (pos != 0) or isinstance(buf, str):
+            return None
+        return lookup(ifs, self.signature)
+
+    def _buffer_search(self, buf):
+        """
+        Returns the search methods of the start/stop patterns, compiled to
+        match a single line of `buf` given its (pos, endpos), the newline
+        of `buf`, and the literal text every start line contains (or None),
+        which is used to jump from one possible start to the next, and
+        that every stop line contains (or None), and whether the stop
+        pattern can be searched for across lines, which are used to jump
+        to the stop line (see `_find_stop`).
+        """
+        kind = str if isinstance(buf, str) else bytes
+        if kind not in self._buffer_patterns:
+            def search(regex):
+                pattern = regex.pattern
+                # '^' should match at the start of every line
+                flags = regex.flags | re.MULTILINE
+                if (kind is bytes) and not isinstance(pattern, bytes):
+                    pattern = pattern.encode('utf-8')
+                    flags &= ~re.UNICODE
+                return re.compile(pattern, flags).search
+            def literal(regex):
+                if regex.flags & re.IGNORECASE:
+                    return None
+                rval = required_literal(regex.pattern)
+                if (rval is not None) and (kind is bytes) and \
+                   not isinstance(rval, bytes):
+                    rval = rval.encode('utf-8')
+                return rval
+            newline = b'\n' if kind is bytes else '\n'
+            # a reversed start matches lines *without* the literal
+            anchor = None if self.reverse_start else literal(self.start)
+            self._buffer_patterns[kind] = (search(self.start),
+                                           search(self.stop),
+                                           newline,
+                                           anchor,
+                                           literal(self.stop),
+                                           not _line_bound(self.stop))
+        return self._buffer_patterns[kind]
+
+    def _find_stop(self, buf, pos, endpos):
+        """
+        Returns the (start, end) offsets of the first line of `buf` between
+        `pos` and `endpos`, which must both be the offsets of line starts
+        (or the end of `buf`), that matches the stop pattern, or None if
+        there is none. Rather than test every line, the scan jumps to each
+        occurrence of the literal text of the stop pattern, or else of the
+        pattern itself, and only tests the line it lies on. The stop is
+        not reversed.
+        """
+        start, stop, newline, anchor, literal, seekable = \
+            self._buffer_search(buf)
+        while pos < endpos:
+            if literal is not None:
+                hit = buf.find(literal, pos, endpos)
+                if hit < 0:
+                    return None
+            elif seekable:
+                # a match may begin on an earlier line than the one it
+                # is found on, line by line, e.g. '^\s*' across a blank
+                # line, so the line is tested on its own
+                match = stop(buf, pos, endpos)
+                if match is None:
+                    return None
+                hit = match.start()
+            else:
+                # every line must be tested
+                hit = pos
+            bol = buf.rfind(newline, pos, hit)
+            bol = pos if bol < 0 else bol + 1
+            eol = buf.find(newline, hit, endpos)
+            eol = endpos if eol < 0 else eol + 1
+            if stop(buf, bol, eol) is not None:
+                return bol, eol
+            pos = eol
+        return None
 
     def __call__(self, ifs,
                  debug=False,
                  error=True,
+                 max_matches=None,
+                 from_end=False,
+                 workers=None,
                  **kwds):
         """
         Finds those blocks bounded by the start/stop regex expressions
@@ -88,12 +590,85 @@ class RegexRangeExtractor(Extractor):
         :error, bool: raise an IOError if the end-of-file is reached in the
                 middle of a matching block, i.e. after start, but before stop.
                 (Default: True)
+        :max_matches, int: stop reading once this many blocks have been
+                found, e.g. 1 if only the first block is needed.
+                (Default: None, read to the end-of-file)
+        :from_end, bool: search backwards from the end-of-file, so that
+                the blocks are returned last first, e.g. with
+                `max_matches=1`, only the last block is read. A block
+                left open at the end-of-file is left out.
+                (Default: False)
+        :workers, int: split a large regular file into chunks, searched
+                by this many processes (see `parse.core.parallel`). The
+                blocks are the same, and in the same order, as those of
+                a serial search. (Default: None, search in this process)
+
+        Unless debugging, a StringIO or a regular file read from its start
+        is searched in place with `spans`, which jumps between the lines
+        holding the literal text of the start pattern. A file with a
+        sidecar index (see `parse.core.index`) is not searched at all:
+        the blocks are sliced straight from the offsets in the index.
+        """
+        blocks = self.iter_blocks(ifs, debug=debug, from_end=from_end,
+                                  workers=workers)
+        try:
+            return list(itertools.islice(blocks, max_matches))
+        finally:
+            # release the stream, even if stopped short of its end
+            blocks.close()
+
+    def iter_blocks(self, ifs, debug=False, from_end=False, workers=None,
+                    **kwds):
+        """
+        Generates the blocks of `ifs` (see `__call__`) one at a time, as
+        each is closed, so that a caller can process and discard each
+        block before the next is read.
+
+        Parameters
+        ----------
+        :ifs, file-like object: stream from which matching blocks are to be
+                extracted.
+
+        Keywords
+        --------
+        :debug, bool: shall the start/stop matching lines be printed to the
+                stderr? (Default: False)
+        :from_end, bool: generate the blocks last first (see `__call__`).
+                (Default: False)
+        :workers, int: search in parallel (see `__call__`). The blocks
+                are generated once the whole file has been searched.
+                (Default: None)
         """
+        if from_end:
+            with searchable(ifs) as (buf, pos):
+                if buf is None:
+                    # a stream that can only be read forwards, e.g. a pipe
+                    buf, pos = ifs.read(), 0
+                spans = self._indexed_spans(ifs, buf, pos)
+                if spans is None:
+                    spans = self.iter_spans_from_end(buf, pos)
+                else:
+                    spans = reversed(spans)
+                for begin, end in spans:
+                    yield span_text(buf, begin, end)
+            return
+        # search the contents of the stream in place, if possible
+        if not debug:
+            with searchable(ifs) as (buf, pos):
+                if buf is not None:
+                    spans = self._indexed_spans(ifs, buf, pos)
+                    filename = mapped_name(ifs, buf, pos)
+                    if (spans is None) and workers and filename:
+                        spans = parallel_spans(filename, [self], workers)[0]
+                    if spans is None:
+                        spans = self.iter_spans(buf, pos)
+                    for begin, end in spans:
+                        yield span_text(buf, begin, end)
+                    return
         skip = self.skip
         include_start = self.include_start
         include_stop = self.include_stop
         inblock = False
-        matches = []
         for line in ifs:
             # if not currently reading the block...
             if not inblock:
@@ -104,12 +679,12 @@ class RegexRangeExtractor(Extractor):
                     if debug:
                         print("start:", line, file=sys.stderr)
                     # include the first (start) line?
-                    s = line if include_start else ''
+                    s = [line] if include_start else []
                     inblock = True
             else:
                 # include skipped lines after initial match
                 if skip > 0:
-                    s += line
+                    s.append(line)
                     skip -= 1
                     continue
                 # check if we've reached the end
@@ -120,21 +695,16 @@ class RegexRangeExtractor(Extractor):
                         print("stop:", line, file=sys.stderr)
                     # include the last (stop) line?
                     if include_stop:
-                        s += line
-                    matches.append(s)
+                        s.append(line)
+                    yield ''.join(s)
                     inblock = False
                     # reset skip
                     skip = self.skip
                 else:
-                    s += line
+                    s.append(line)
         # was the EOF reached in the middle of a block?
         if inblock:
-            matches.append(s)
-        try:
-            if inblock and error:
-                raise IOError("The input ended in the middle of a data block.")
-        finally:
-            return matches
+            yield ''.join(s)
 
 
 class RegexExtractor(RegexRangeExtractor):
@@ -169,6 +739,317 @@ class RegexExtractor(RegexRangeExtractor):
         :error, bool: raise an IOError if the end-of-file is reached in the
                 middle of a matching block, i.e. after start, but before stop.
                 (Default: True)
+        :max_matches, int: stop reading once this many lines have been
+                found. (Default: None, read to the end-of-file)
+        :from_end, bool: search backwards from the end-of-file, returning
+                the lines last first. (Default: False)
         """
         kwds['error'] = False
         return super(RegexExtractor, self).__call__(ifs, **kwds)
+
+
+class MultiRegexRangeExtractor(Extractor):
+    def __init__(self, extractors, *args, **kwds):
+        """
+        Runs several range extractors in a single pass through a file.
+
+        The start patterns are compiled into one alternation of named
+        groups, so a line outside of every block costs one regex search
+        regardless of the number of extractors. Only when that search
+        hits are the individual start patterns consulted, and a line
+        inside a block is only handed to the extractor(s) whose block
+        is open. Each extractor keeps its own `skip`, `reverse_start`,
+        `reverse_stop`, and `include_*` semantics, so the blocks are
+        identical to those found by running the extractors one at a time.
+
+        Parameters
+        ----------
+        :extractors, list: RegexRangeExtractor objects, or (start, stop)
+                or (start, stop, dict) tuples, where the dict holds the
+                RegexRangeExtractor keywords, e.g. {'skip': 2}.
+        """
+        super(MultiRegexRangeExtractor, self).__init__(*args, **kwds)
+        self.extractors = []
+        for spec in extractors:
+            if not isinstance(spec, RegexRangeExtractor):
+                start, stop = spec[:2]
+                options = spec[2] if len(spec) > 2 else {}
+                spec = RegexRangeExtractor(start, stop, **options)
+            self.extractors.append(spec)
+        # start patterns that can join the alternation; the others
+        # (reversed starts or patterns with their own flags) must be
+        # tested on every line
+        default_flags = re.compile('').flags
+        fused = []
+        self.loose = []
+        for i, rre in enumerate(self.extractors):
+            if rre.reverse_start or (rre.start.flags != default_flags):
+                self.loose.append(i)
+            else:
+                fused.append(i)
+        # the regex engine cannot see that every alternative begins with
+        # the same anchor, so factor the common line-start prefixes out;
+        # a pattern with a top-level '|' keeps its prefix, which only
+        # binds to its first alternative
+        prefixes = (r'^\s*', '^', '')
+        groups = dict((prefix, []) for prefix in prefixes)
+        for i in fused:
+            pattern = self.extractors[i].start.pattern
+            if _alternation(pattern):
+                prefix = ''
+            else:
+                prefix = [p for p in prefixes if pattern.startswith(p)][0]
+            groups[prefix].append('(?P<start{}>{})'.format(i, \
+                                  pattern[len(prefix):]))
+        pattern = '|'.join(['{}(?:{})'.format(prefix, '|'.join(groups[prefix])) \
+                            for prefix in prefixes if groups[prefix]])
+        try:
+            self.starts = re.compile(pattern) if fused else None
+        except re.error:
+            # e.g. patterns that define their own named groups
+            self.starts = None
+            self.loose = list(range(len(self.extractors)))
+        self._start_searches = [(i, rre.start.search) \
+                                for i, rre in enumerate(self.extractors) \
+                                if i not in self.loose]
+        # state used when lines are pushed in one at a time (see `feed`)
+        self.reset()
+
+    def reset(self):
+        """
+        Clears the block-matching state used by `feed`.
+        """
+        for rre in self.extractors:
+            rre.reset()
+        self._opened = []
+
+    @property
+    def inblock(self):
+        """Has `feed` seen the start, but not yet the stop, of any block?"""
+        return bool(self._opened)
+
+    def feed(self, line):
+        """
+        Advances every extractor by a single line (see
+        `RegexRangeExtractor.feed`).
+
+        Parameters
+        ----------
+        :line, str: next line of the stream.
+
+        Returns
+        -------
+        list of (extractor index, block), for the blocks `line` completes.
+        """
+        extractors = self.extractors
+        # can any (closed) extractor start on this line?
+        if (self.starts is not None) and self.starts.search(line):
+            candidates = [i for i, start in self._start_searches \
+                          if start(line)] + self.loose
+        else:
+            candidates = self.loose
+        completed = []
+        opened = self._opened
+        # feed the line to the extractors in the middle of a block
+        if opened:
+            was_open = opened
+            opened = []
+            for i in was_open:
+                block = extractors[i].feed(line)
+                if block is None:
+                    opened.append(i)
+                else:
+                    completed.append((i, block))
+            candidates = [i for i in candidates if i not in was_open]
+        # ...and then to those that might start a new block
+        for i in candidates:
+            rre = extractors[i]
+            rre.feed(line)
+            if rre.inblock:
+                opened.append(i)
+        self._opened = opened
+        return completed
+
+    def flush(self):
+        """
+        Ends a stream that was pushed through `feed`.
+
+        Returns
+        -------
+        list of (extractor index, block), for the blocks that were still
+        open when the stream ended.
+        """
+        completed = [(i, self.extractors[i].flush()) for i in self._opened]
+        self._opened = []
+        return completed
+
+    def spans(self, buf, pos=0, endpos=None):
+        """
+        Finds the blocks of every extractor in an in-memory buffer (see
+        `RegexRangeExtractor.spans`).
+
+        While no block is open, the scan jumps straight to the nearest
+        line holding the literal text of any start pattern; the next
+        occurrence of each literal is kept in a heap, so each is only
+        searched for again once the scan has passed it. While a single
+        block is open, the scan jumps to its stop line, as
+        `RegexRangeExtractor.spans` does, or to the line of the next
+        literal, if that comes first. Only while several blocks are open
+        at once, or if a start pattern has no literal, is every line
+        tested.
+
+        Parameters
+        ----------
+        :buf, {mmap|bytes|str}: buffer to be searched.
+
+        Keywords
+        --------
+        :pos, int: offset of the line at which to start. (Default: 0)
+        :endpos, int: offset at which to end. (Default: len(buf))
+
+        Returns
+        -------
+        List with one entry per extractor, each a list of (begin, end)
+        offsets of its blocks.
+        """
+        extractors = self.extractors
+        searches = [rre._buffer_search(buf) for rre in extractors]
+        endpos = len(buf) if endpos is None else endpos
+        spans = [[] for rre in extractors]
+        if not extractors:
+            return spans
+        newline = searches[0][2]
+        # extractors without a literal must test every line
+        unanchored = [i for i, search in enumerate(searches) \
+                      if search[3] is None]
+        # heap of (offset of next literal, extractor index)
+        pending = []
+        for i, search in enumerate(searches):
+            if search[3] is not None:
+                hit = buf.find(search[3], pos, endpos)
+                if hit >= 0:
+                    pending.append((hit, i))
+        heapq.heapify(pending)
+        skip = [rre.skip for rre in extractors]
+        begin = [0 for rre in extractors]
+        opened = []
+        while pos < endpos:
+            if not (opened or unanchored):
+                # jump to the next line that could start a block
+                if not pending:
+                    break
+                bol = buf.rfind(newline, pos, pending[0][0])
+                pos = pos if bol < 0 else bol + 1
+            elif (len(opened) == 1) and not unanchored:
+                i = opened[0]
+                rre = extractors[i]
+                if (skip[i] == 0) and not rre.reverse_stop:
+                    # jump to the stop line of the only open block, unless
+                    # the line of the next literal comes first
+                    limit = endpos
+                    if pending:
+                        limit = buf.rfind(newline, pos, pending[0][0])
+                        limit = pos if limit < 0 else limit + 1
+                    found = rre._find_stop(buf, pos, limit)
+                    if found is not None:
+                        bol, eol = found
+                        spans[i].append((begin[i], \
+                                         eol if rre.include_stop else bol))
+                        skip[i] = rre.skip
+                        opened = []
+                        pos = eol
+                        continue
+                    pos = limit
+                    if pos >= endpos:
+                        break
+            eol = buf.find(newline, pos, endpos)
+            eol = endpos if eol < 0 else eol + 1
+            # first, the extractors in the middle of a block
+            was_open = opened
+            opened = []
+            for i in was_open:
+                rre = extractors[i]
+                if skip[i] > 0:
+                    skip[i] -= 1
+                    opened.append(i)
+                    continue
+                is_stop = searches[i][1](buf, pos, eol) is not None
+                if is_stop != rre.reverse_stop:
+                    spans[i].append((begin[i], \
+                                     eol if rre.include_stop else pos))
+                    skip[i] = rre.skip
+                else:
+                    opened.append(i)
+            # ...then those whose literal lies on this line
+            candidates = [i for i in unanchored if i not in was_open]
+            while pending and (pending[0][0] < eol):
+                hit, i = heapq.heappop(pending)
+                if i not in was_open:
+                    candidates.append(i)
+                hit = buf.find(searches[i][3], eol, endpos)
+                if hit >= 0:
+                    heapq.heappush(pending, (hit, i))
+            for i in candidates:
+                rre = extractors[i]
+                is_start = searches[i][0](buf, pos, eol) is not None
+                if is_start != rre.reverse_start:
+                    begin[i] = pos if rre.include_start else eol
+                    opened.append(i)
+            pos = eol
+        # was the end reached in the middle of a block?
+        for i in opened:
+            spans[i].append((begin[i], endpos))
+        return spans
+
+    def _search(self, ifs, buf, pos, workers=None):
+        """
+        Returns the spans of every extractor (see `spans`) in `buf`, the
+        contents of `ifs` (see `parse.core.buffers.searchable`): from the
+        sidecar index of the file, if it is indexed, or else by searching
+        `buf`, in parallel if `workers` is given (see `__call__`).
+        """
+        found = [rre._indexed_spans(ifs, buf, pos) for rre in self.extractors]
+        if any(spans is None for spans in found):
+            filename = mapped_name(ifs, buf, pos)
+            if workers and filename:
+                found = parallel_spans(filename, self.extractors, workers)
+            else:
+                found = self.spans(buf, pos)
+        return found
+
+    def __call__(self, ifs, workers=None, **kwds):
+        """
+        Finds the blocks of every extractor.
+
+        Parameters
+        ----------
+        :ifs, file-like object: stream from which matching blocks are to be
+                extracted.
+
+        Keywords
+        --------
+        :workers, int: split a large regular file into chunks, searched
+                by this many processes (see `parse.core.parallel`).
+                (Default: None, search in this process)
+
+        Returns
+        -------
+        List with one entry per extractor, each the list of blocks that
+        extractor would have returned. As with RegexRangeExtractor, a block
+        left open at the end-of-file is included.
+        """
+        # search the contents of the stream in place, if possible
+        with searchable(ifs) as (buf, pos):
+            if buf is not None:
+                found = self._search(ifs, buf, pos, workers)
+                return [[span_text(buf, begin, end) for begin, end in spans] \
+                        for spans in found]
+        self.reset()
+        matches = [[] for rre in self.extractors]
+        for line in ifs:
+            for i, block in self.feed(line):
+                matches[i].append(block)
+        # was the EOF reached in the middle of a block?
+        for i, block in self.flush():
+            matches[i].append(block)
+        return matches
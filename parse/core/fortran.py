@@ -0,0 +1,68 @@
+"""
+Conversion of the numbers Gaussian writes with Fortran edit descriptors,
+e.g. F10.5 or D15.8, by the width of their fields rather than by
+whitespace: fields may run together, e.g. "-100.23456-100.23400", and
+their exponents may be marked with a D, e.g. "0.91423256D+00". A whole
+block is cut into fields, and converted, at once by numpy.
+"""
+import numpy as np
+
+from .tables import _skip_lines
+
+def read_fixed(text, width, kind=float, label=None, skip=0):
+    """
+    Converts the fixed-width fields of a block into a flat array.
+
+    Example, for the eigenvalues of lines such as
+    "Alpha  occ. eigenvalues -- -100.23456-100.23400 -10.23456", written
+    as F10.5 after the label, "... eigenvalues -- ":
+
+    ```
+    eigenvalues = read_fixed(block, 10, label='-- ')
+    ```
+
+    Parameters
+    ----------
+    :text, str: the block.
+    :width, int: width of each field, e.g. 10 for F10.5 or 15 for D15.8.
+
+    Keywords
+    --------
+    :kind, type: type of the values. (Default: float)
+    :label, str: text that ends the label of a line, e.g. '-- ' or '='.
+            The fields start right after its first occurrence; on a line
+            without the label, e.g. the continuation of a line, they start
+            at the same column as on the line before. (Default: None, the
+            fields start at the first column)
+    :skip, int: number of header lines to skip. (Default: 0)
+
+    Returns
+    -------
+    np.ndarray. Blank fields are skipped; a field of asterisks, the
+    overflow of a Fortran format, is NaN.
+
+    Raises
+    ------
+    ValueError, if a field cannot be converted.
+    """
+    column = 0
+    lines = []
+    for line in _skip_lines(text, skip).splitlines():
+        if label is not None:
+            found = line.find(label)
+            if found >= 0:
+                column = found + len(label)
+        line = line[column:].rstrip()
+        # pad the last field of the line to the width
+        lines.append(line.ljust(-(-len(line) // width) * width))
+    # D (or d) exponents are read as E
+    data = ''.join(lines).replace('D', 'E').replace('d', 'e')
+    if not data:
+        return np.zeros(0, kind)
+    fields = np.frombuffer(data.encode('latin1'), 'S{}'.format(width))
+    fields = fields[fields != b' ' * width]
+    overflow = (fields == b'*' * width)
+    if overflow.any():
+        fields = fields.copy()
+        fields[overflow] = b'nan'
+    return fields.astype(kind)
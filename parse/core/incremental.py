@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+
+from .buffers import span_text
+from .extractors import MultiRegexRangeExtractor
+
+# bytes read at a time
+_CHUNK = 1 << 24
+# bytes, before the offset, whose checksum confirms the file's prefix
+_TAIL = 1 << 12
+
+def _tail_checksum(ifs, offset):
+    """
+    Returns the checksum of the (up to) `_TAIL` bytes of binary file
+    `ifs` that precede `offset`.
+    """
+    begin = max(0, offset - _TAIL)
+    ifs.seek(begin)
+    return hashlib.sha1(ifs.read(offset - begin)).hexdigest()
+
+
+class IncrementalScan(object):
+    def __init__(self, extractors, keep=False):
+        """
+        Scans a file that grows, e.g. the log of a running job, a little
+        at a time: each `update` reads only the bytes appended since the
+        last, and the blocks that were open at the old end of the file,
+        along with any `skip` still left, carry over to the next.
+
+        Only complete lines are consumed. A line still being written at
+        the end of the file is left for the next update, so a block cut
+        off at the end of the file is never returned early.
+
+        The state of the scan can be saved (see `save`), and restored
+        by a later process (see `load`), so that a file that has grown
+        in the meantime, e.g. a restarted job, is not read again from
+        the beginning.
+
+        Parameters
+        ----------
+        :extractors, list: RegexRangeExtractor objects (see
+                MultiRegexRangeExtractor).
+
+        Keywords
+        --------
+        :keep, bool: accumulate the blocks of every update in `blocks`,
+                and in the saved state. (Default: False)
+        """
+        self.multi = MultiRegexRangeExtractor(extractors)
+        self.keep = keep
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets what has been read, so that the next update starts from
+        the beginning of the file.
+        """
+        self.multi.reset()
+        # bytes consumed, i.e. the offset of the first unread line, and
+        # the checksum of the bytes just before it
+        self.offset = 0
+        self.checksum = None
+        # blocks found so far, one list per extractor, if kept
+        self.blocks = [[] for rre in self.extractors] if self.keep else None
+
+    @property
+    def extractors(self):
+        return self.multi.extractors
+
+    def update(self, filename):
+        """
+        Reads the complete lines appended to `filename` since the last
+        update. If the bytes read last no longer end where they did,
+        e.g. the file was overwritten by a new job, the file is read
+        again from the beginning.
+
+        Parameters
+        ----------
+        :filename, str: name of the file.
+
+        Returns
+        -------
+        List with one entry per extractor, each the list of blocks
+        completed by the new lines.
+        """
+        blocks = [[] for rre in self.extractors]
+        size = os.path.getsize(filename)
+        with open(filename, 'rb') as ifs:
+            if self.offset and ((size < self.offset) or \
+               (_tail_checksum(ifs, self.offset) != self.checksum)):
+                self.reset()
+            ifs.seek(self.offset)
+            partial = b''
+            while True:
+                chunk = ifs.read(min(_CHUNK, size - self.offset - \
+                                     len(partial)))
+                if not chunk:
+                    break
+                data = partial + chunk
+                # consume whole lines only
+                end = data.rfind(b'\n') + 1
+                partial = data[end:]
+                if not end:
+                    continue
+                # split as a file iterates, i.e. on newlines only
+                text = span_text(data, 0, end)
+                for line in text[:-1].split('\n'):
+                    for i, block in self.multi.feed(line + '\n'):
+                        blocks[i].append(block)
+                self.offset += end
+            if self.offset:
+                self.checksum = _tail_checksum(ifs, self.offset)
+        if self.keep:
+            for kept, new in zip(self.blocks, blocks):
+                kept.extend(new)
+        return blocks
+
+    def state(self):
+        """
+        Returns the state of the scan, as a dict that can be serialized
+        as JSON: the extractor signatures, the offset and checksum (see
+        `update`), the open block and any `skip` left of each extractor,
+        and the blocks kept so far.
+        """
+        return {'signatures' : [list(rre.signature) \
+                                for rre in self.extractors],
+                'offset' : self.offset,
+                'checksum' : self.checksum,
+                'opened' : list(self.multi._opened),
+                'open_blocks' : [{'inblock' : rre._inblock,
+                                  'skip' : rre._skip,
+                                  'lines' : list(rre._lines)} \
+                                 for rre in self.extractors],
+                'blocks' : self.blocks}
+
+    def restore(self, state):
+        """
+        Restores a state returned by `state`. The next update checks
+        that the file still holds the bytes that were read before
+        carrying on from where the state left off.
+
+        Raises
+        ------
+        ValueError, if the state is of a scan by other extractors.
+        """
+        signatures = [list(rre.signature) for rre in self.extractors]
+        if state['signatures'] != signatures:
+            raise ValueError('The state is of a scan by other extractors.')
+        self.reset()
+        self.offset = state['offset']
+        self.checksum = state['checksum']
+        self.multi._opened = list(state['opened'])
+        for rre, saved in zip(self.extractors, state['open_blocks']):
+            rre._inblock = saved['inblock']
+            rre._skip = saved['skip']
+            rre._lines = list(saved['lines'])
+        if self.keep:
+            if state['blocks'] is None:
+                # nothing was kept, so start again
+                self.reset()
+            else:
+                self.blocks = [list(b) for b in state['blocks']]
+
+    def save(self, filename):
+        """
+        Saves the state of the scan (see `state`) as JSON in `filename`.
+        """
+        tmp = '{}.{}.tmp'.format(filename, os.getpid())
+        with open(tmp, 'w') as ofs:
+            json.dump(self.state(), ofs)
+        # a reader never sees a partial state
+        os.rename(tmp, filename)
+
+    def load(self, filename):
+        """
+        Restores the state saved in `filename` (see `save`).
+
+        Returns
+        -------
+        bool, True if the state was restored; False if it could not be,
+        e.g. the file does not exist, in which case the scan starts from
+        the beginning.
+        """
+        try:
+            with open(filename, 'r') as ifs:
+                self.restore(json.load(ifs))
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            self.reset()
+            return False
+        return True
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import numpy as np
+
+from .buffers import mapped
+from .streams import compression
+
+# the sidecar of "job.log" is "job.log.sections.npz"
+SUFFIX = 'sections.npz'
+# sidecars already read by this process: abspath --> (fingerprint, spans)
+_loaded = {}
+_MAX_LOADED = 128
+
+def sidecar(filename):
+    """
+    Returns the name of the sidecar file that indexes `filename`.
+    """
+    return '{}.{}'.format(filename, SUFFIX)
+
+
+def fingerprint(filename):
+    """
+    Returns the (size, modification time) of `filename`. An index is only
+    used while the fingerprint of the file it indexes is unchanged.
+    """
+    stat = os.stat(filename)
+    return (stat.st_size, stat.st_mtime)
+
+
+def signature_key(signature):
+    """
+    Returns the name under which the spans of the extractor with the
+    given `signature` (see `RegexRangeExtractor.signature`) are stored.
+    """
+    text = repr(tuple(signature)).encode('utf-8')
+    return 'spans_' + hashlib.sha1(text).hexdigest()[:16]
+
+
+def write_index(filename, extractors):
+    """
+    Records the (begin, end) byte offsets of the blocks of every extractor
+    in a sidecar file (see `sidecar`), so that later searches of the same
+    file can go straight to the blocks. The file is read once, however
+    many extractors there are.
+
+    Parameters
+    ----------
+    :filename, str: name of the file to index.
+    :extractors, list: RegexRangeExtractor objects whose blocks are to
+            be indexed.
+
+    Returns
+    -------
+    str, name of the sidecar file.
+    """
+    from .extractors import MultiRegexRangeExtractor
+    if compression(filename) is not None:
+        # the blocks are sliced from the mapped file, so its offsets
+        # must be those of the text
+        raise IOError('{} is compressed and cannot be ' \
+                      'indexed.'.format(filename))
+    size, mtime = fingerprint(filename)
+    unique = {}
+    for rre in extractors:
+        unique.setdefault(rre.signature, rre)
+    signatures = list(unique.keys())
+    multi = MultiRegexRangeExtractor([unique[k] for k in signatures])
+    with mapped(filename) as buf:
+        found = multi.spans(buf)
+    arrays = {'size' : np.array(size, dtype=np.int64),
+              'mtime' : np.array(mtime, dtype=np.float64)}
+    for signature, spans in zip(signatures, found):
+        arrays[signature_key(signature)] = \
+            np.array(spans, dtype=np.int64).reshape(-1, 2)
+    # write, then rename, so that a reader never sees a partial index
+    path = sidecar(filename)
+    tmp = '{}.{}.tmp'.format(path, os.getpid())
+    with open(tmp, 'wb') as ofs:
+        np.savez_compressed(ofs, **arrays)
+    os.rename(tmp, path)
+    _loaded.pop(os.path.abspath(filename), None)
+    return path
+
+
+def read_index(filename):
+    """
+    Reads the sidecar index of `filename`.
+
+    Returns
+    -------
+    dict, signature key (see `signature_key`) --> N x 2 array of spans,
+    or None if there is no index, or if the file has changed since it
+    was indexed.
+    """
+    try:
+        current = fingerprint(filename)
+    except (IOError, OSError):
+        return None
+    key = os.path.abspath(filename)
+    if key in _loaded and _loaded[key][0] == current:
+        return _loaded[key][1]
+    path = sidecar(filename)
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path) as npz:
+            indexed = (int(npz['size']), float(npz['mtime']))
+            sections = dict((k, npz[k]) for k in npz.files \
+                            if k.startswith('spans_'))
+    except (IOError, OSError, KeyError, ValueError):
+        # unreadable, e.g. truncated: fall back to searching the file
+        return None
+    if indexed != current:
+        return None
+    if len(_loaded) >= _MAX_LOADED:
+        _loaded.clear()
+    _loaded[key] = (current, sections)
+    return sections
+
+
+def lookup(ifs, signature):
+    """
+    Looks up the spans of an extractor in the sidecar index of a file.
+
+    Parameters
+    ----------
+    :ifs, {str|file}: filename, or a file object opened from one.
+    :signature, tuple: signature of the extractor.
+
+    Returns
+    -------
+    list of (begin, end) byte offsets, as `RegexRangeExtractor.spans`
+    would find in the memory-mapped file, or None if the file is not
+    indexed for this extractor.
+    """
+    filename = ifs if isinstance(ifs, str) else getattr(ifs, 'name', None)
+    if not isinstance(filename, str):
+        return None
+    sections = read_index(filename)
+    if sections is None:
+        return None
+    spans = sections.get(signature_key(signature))
+    if spans is None:
+        return None
+    return [tuple(span) for span in spans.tolist()]
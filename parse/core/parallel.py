@@ -0,0 +1,150 @@
+"""
+Parallel scan of a single large file, e.g. a multi-GB BOMD log: the file
+is split into line-aligned byte ranges (chunks), each chunk is searched
+by a worker process, and the blocks are stitched together in order.
+
+A worker cannot know whether its chunk begins in the middle of a block,
+so it scans as if it did not. Stitching then walks the chunks in order,
+carrying the block (and any `skip` left) open at the end of one chunk
+into the next, and finishes it there. The worker's blocks are kept from
+the first line at which its scan agrees with the serial scan, i.e. at
+which neither is in a block; should they not agree (blocks overlapping a
+finished block), the rest of the chunk is searched again serially. The
+spans are identical to those of `RegexRangeExtractor.spans`.
+"""
+import mmap
+import multiprocessing
+
+from .buffers import mapped
+
+# smallest chunk worth handing to a worker, in bytes
+MIN_CHUNK = 1 << 22
+
+def chunks(buf, n):
+    """
+    Splits `buf` into (at most) `n` ranges of about equal size, each of
+    which begins at the start of a line.
+
+    Returns
+    -------
+    List of (begin, end) offsets, which cover `buf`.
+    """
+    size = len(buf)
+    bounds = [0]
+    for k in range(1, n):
+        eol = buf.find(b'\n', max(bounds[-1], size * k // n))
+        if eol < 0:
+            break
+        if eol + 1 < size:
+            bounds.append(eol + 1)
+    bounds.append(size)
+    return [(begin, end) for begin, end in zip(bounds[:-1], bounds[1:]) \
+            if begin < end]
+
+
+def mapped_name(ifs, buf, pos):
+    """
+    Returns the name of the file behind `ifs`, if `buf` is the whole file,
+    mapped (see `parse.core.buffers.searchable`), so that workers can map
+    it for themselves; otherwise None.
+    """
+    name = getattr(ifs, 'name', None)
+    if (pos != 0) or not isinstance(buf, mmap.mmap) or \
+       not isinstance(name, str):
+        return None
+    return name
+
+
+def _scan_chunk(args):
+    """
+    Searches a chunk of a file for the blocks of each extractor, as if no
+    block were open at its start, in a worker.
+
+    Returns
+    -------
+    List with one entry per extractor, each (blocks, carry) (see
+    `RegexRangeExtractor._walk`).
+    """
+    filename, extractors, begin, end = args
+    rval = []
+    with mapped(filename) as buf:
+        for rre in extractors:
+            carry = []
+            blocks = list(rre._walk(buf, begin, end, carry))
+            rval.append((blocks, carry))
+    return rval
+
+
+def _stitch(rre, buf, bounds, results):
+    """
+    Joins the blocks found in each chunk by `_scan_chunk` into the spans
+    a serial scan of `buf` would find.
+    """
+    spans = []
+    # block open at the start of the chunk, as of the serial scan
+    carry = []
+    for (begin, end), (blocks, chunk_carry) in zip(bounds, results):
+        pos = begin
+        if carry:
+            # finish the block carried over from the last chunk
+            for first, b, e, last in rre._walk(buf, begin, end, carry,
+                                               until_closed=True):
+                spans.append((b, e))
+                pos = last
+            if carry:
+                # the block runs past the end of this chunk, too
+                continue
+        # is the worker's scan also between blocks at `pos`?
+        if any(first < pos < last for first, b, e, last in blocks) or \
+           (chunk_carry and chunk_carry[0] < pos):
+            chunk_carry = []
+            blocks = list(rre._walk(buf, pos, end, chunk_carry))
+        spans.extend((b, e) for first, b, e, last in blocks if first >= pos)
+        carry = list(chunk_carry)
+    # was the end reached in the middle of a block?
+    if carry:
+        spans.append((carry[1], len(buf)))
+    return spans
+
+
+def parallel_spans(filename, extractors, workers=None, chunksize=None):
+    """
+    Finds the blocks of several extractors in a file, with the file split
+    into chunks searched by a pool of processes (see the module).
+
+    Parameters
+    ----------
+    :filename, str: name of an uncompressed file.
+    :extractors, list: RegexRangeExtractor objects.
+
+    Keywords
+    --------
+    :workers, int: number of processes. (Default: the number of CPUs)
+    :chunksize, int: bytes per chunk. A file smaller than two chunks is
+            searched in this process. (Default: enough for about four
+            chunks per process, but at least `MIN_CHUNK`)
+
+    Returns
+    -------
+    List with one entry per extractor, each a list of (begin, end)
+    offsets of its blocks, as by `RegexRangeExtractor.spans`.
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    workers = max(1, int(workers))
+    with mapped(filename) as buf:
+        size = len(buf)
+        if chunksize is None:
+            chunksize = max(MIN_CHUNK, size // (4 * workers))
+        bounds = chunks(buf, max(1, size // max(1, int(chunksize))))
+        if (workers == 1) or (len(bounds) < 2):
+            return [rre.spans(buf) for rre in extractors]
+        tasks = [(filename, extractors, begin, end) for begin, end in bounds]
+        pool = multiprocessing.Pool(min(workers, len(tasks)))
+        try:
+            results = pool.map(_scan_chunk, tasks, 1)
+        finally:
+            pool.close()
+            pool.join()
+        return [_stitch(rre, buf, bounds, [r[i] for r in results]) \
+                for i, rre in enumerate(extractors)]
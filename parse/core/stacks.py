@@ -0,0 +1,113 @@
+"""
+Stacks a sequence of equally shaped arrays, e.g. the positions at every
+step of a trajectory, into a single contiguous array as they are
+generated, without first holding them in a list: the array is allocated
+ahead of the arrays and grown geometrically, in memory or in a `.npy`
+file mapped into memory.
+"""
+import numpy as np
+
+# initial number of arrays allocated for
+_CAPACITY = 16
+# bytes reserved for the header of a `.npy` file (version 1.0), which is
+# written once the final shape is known; a multiple of 64, so that the
+# data is aligned
+_HEADER = 128
+_MAGIC = b'\x93NUMPY\x01\x00'
+
+def _npy_header(dtype, shape):
+    """
+    Returns the `.npy` (version 1.0) header of an array, padded to
+    `_HEADER` bytes.
+    """
+    header = "{{'descr': {!r}, 'fortran_order': False, 'shape': {!r}, }}" \
+             .format(np.lib.format.dtype_to_descr(dtype), tuple(shape))
+    length = _HEADER - len(_MAGIC) - 2
+    if len(header) + 1 > length:
+        raise ValueError('The shape {} does not fit in the .npy ' \
+                         'header.'.format(shape))
+    header = header.ljust(length - 1) + '\n'
+    return _MAGIC + np.array(length, '<u2').tobytes() + header.encode('latin1')
+
+
+def stack(arrays, dtype=float, out=None, capacity=None):
+    """
+    Stacks equally shaped arrays into an array of shape (n, ...) as they
+    are generated, e.g. by `iter_atom_positions`.
+
+    Parameters
+    ----------
+    :arrays, iterable: arrays of the same shape.
+
+    Keywords
+    --------
+    :dtype, type: type of the stacked array, e.g. np.float32 to halve
+            its size. (Default: float)
+    :out, str: name of a `.npy` file into which the arrays are written,
+            through a memory map, rather than held in memory. The file
+            is overwritten. (Default: None)
+    :capacity, int: number of arrays to allocate for at first, e.g. if
+            known; the allocation doubles whenever it is full.
+            (Default: 16)
+
+    Returns
+    -------
+    np.ndarray, or np.memmap of `out`, of shape (n, ...). If there are no
+    arrays, the shape is (0,).
+
+    Raises
+    ------
+    ValueError, if the arrays do not all have the same shape.
+    """
+    dtype = np.dtype(dtype)
+    capacity = _CAPACITY if capacity is None else max(1, int(capacity))
+    ofs = None if out is None else open(out, 'wb+')
+    buf = None
+    n = 0
+    try:
+        for a in arrays:
+            a = np.asarray(a)
+            if buf is None:
+                shape = a.shape
+            elif a.shape != shape:
+                raise ValueError('Expected arrays of shape {}, but found ' \
+                                 'one of shape {}.'.format(shape, a.shape))
+            if (buf is None) or (n == len(buf)):
+                if buf is not None:
+                    capacity = 2 * len(buf)
+                if ofs is None:
+                    if buf is None:
+                        buf = np.empty((capacity,) + shape, dtype)
+                    else:
+                        buf.resize((capacity,) + shape, refcheck=False)
+                else:
+                    if buf is not None:
+                        buf.flush()
+                        del buf
+                    ofs.truncate(_HEADER + capacity * dtype.itemsize * \
+                                 int(np.prod(shape)))
+                    buf = np.memmap(ofs, dtype, 'r+', _HEADER,
+                                    (capacity,) + shape)
+            buf[n] = a
+            n += 1
+        if buf is None:
+            shape = ()
+            buf = np.empty((0,), dtype)
+        elif ofs is None:
+            # trim the allocation in place
+            buf.resize((n,) + shape, refcheck=False)
+        if ofs is None:
+            return buf
+        # trim the file, then write the header of the final shape
+        shape = (n,) + shape if n else (0,)
+        if n:
+            buf.flush()
+        del buf
+        ofs.truncate(_HEADER + dtype.itemsize * int(np.prod(shape)))
+        ofs.seek(0)
+        ofs.write(_npy_header(dtype, shape))
+    finally:
+        if ofs is not None:
+            ofs.close()
+    # an empty array cannot be mapped
+    return np.load(out, mmap_mode='r+' if n else None)
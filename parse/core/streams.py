@@ -0,0 +1,208 @@
+import bz2
+import gzip
+import io
+import subprocess
+import threading
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+try:
+    import lzma
+except ImportError:
+    lzma = None
+try:
+    from shutil import which
+except ImportError:
+    from distutils.spawn import find_executable as which
+
+# magic bytes --> compression
+MAGIC = ((b'\x1f\x8b', 'gzip'),
+         (b'BZh', 'bz2'),
+         (b'\xfd7zXZ\x00', 'xz'))
+# command lines that decompress to stdout, fastest (i.e. parallel) first
+COMMANDS = {'gzip' : (['pigz', '-dc'], ['gzip', '-dc']),
+            'bz2' : (['pbzip2', '-dc'], ['bzip2', '-dc']),
+            'xz' : (['xz', '-T0', '-dc'],)}
+# bytes decompressed at a time, and chunks queued ahead of the reader
+_CHUNK = 1 << 18
+_QUEUED = 16
+
+def compression(filename):
+    """
+    Returns the compression of `filename`, as identified by its leading
+    magic bytes: 'gzip', 'bz2', 'xz', or None if it is not compressed.
+    """
+    with open(filename, 'rb') as ifs:
+        head = ifs.read(6)
+    for magic, name in MAGIC:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def _open_compressed(filename, name):
+    """
+    Opens `filename` (or a binary file object) with the decompressing
+    file class of the compression `name`.
+    """
+    if name == 'gzip':
+        return gzip.open(filename, 'rb')
+    if name == 'bz2':
+        return bz2.BZ2File(filename, 'rb')
+    if lzma is None:
+        raise IOError('{} is xz compressed, but the lzma module is not ' \
+                      'available.'.format(filename))
+    return lzma.open(filename, 'rb')
+
+
+def decompress_bytes(data):
+    """
+    Returns `data` (bytes) decompressed, if its magic bytes identify it
+    as compressed; otherwise, `data` unchanged.
+    """
+    for magic, name in MAGIC:
+        if data.startswith(magic):
+            with _open_compressed(io.BytesIO(data), name) as ifs:
+                return ifs.read()
+    return data
+
+
+class _ThreadReader(io.RawIOBase):
+    def __init__(self, filename, name):
+        """
+        Raw stream of the contents of a compressed file, decompressed by
+        a background thread, which runs up to `_QUEUED` chunks ahead of
+        the reader. zlib, bz2 and lzma release the GIL, so decompression
+        overlaps with the regex scan of the decompressed text.
+        """
+        super(_ThreadReader, self).__init__()
+        self._queue = queue.Queue(maxsize=_QUEUED)
+        self._stop = threading.Event()
+        self._pending = memoryview(b'')
+        self._done = False
+        self._thread = threading.Thread(target=self._produce,
+                                        args=(filename, name))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _produce(self, filename, name):
+        try:
+            with _open_compressed(filename, name) as ifs:
+                while not self._stop.is_set():
+                    chunk = ifs.read(_CHUNK)
+                    if not chunk:
+                        break
+                    self._put(chunk)
+        except Exception as e:
+            # raised to the reader
+            self._put(e)
+        finally:
+            self._put(None)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if not len(self._pending):
+            if self._done:
+                return 0
+            item = self._queue.get()
+            if item is None:
+                self._done = True
+                return 0
+            if isinstance(item, Exception):
+                self._done = True
+                raise item
+            self._pending = memoryview(item)
+        n = min(len(b), len(self._pending))
+        b[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+        super(_ThreadReader, self).close()
+
+
+class _ProcessReader(io.RawIOBase):
+    def __init__(self, filename, command):
+        """
+        Raw stream of the output of a decompression command, e.g.
+        `pigz -dc`, which runs in its own process (or processes).
+        """
+        super(_ProcessReader, self).__init__()
+        self._command = command
+        self._process = subprocess.Popen(command + [filename],
+                                         stdout=subprocess.PIPE)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        n = self._process.stdout.readinto(b)
+        if not n and self._process.wait() != 0:
+            raise IOError('{} exited with status {}'.format(
+                ' '.join(self._command), self._process.returncode))
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._process.stdout.close()
+            if self._process.poll() is None:
+                self._process.terminate()
+            self._process.wait()
+        super(_ProcessReader, self).close()
+
+
+def open_text(filename, decompress='auto'):
+    """
+    Opens a file for reading as text, decompressing it on the fly if it
+    is compressed with gzip, bzip2 or xz (see `compression`). An
+    uncompressed file is opened as by `open(filename, 'r')`, so that it
+    can still be searched in place (see `parse.core.buffers`).
+
+    Parameters
+    ----------
+    :filename, str: name of the file.
+
+    Keywords
+    --------
+    :decompress, str: where a compressed file is decompressed:
+            'process', in a command such as pigz, which runs beside this
+            process; 'thread', in a background thread of this process;
+            or 'auto', a process if a command is found on the PATH,
+            otherwise a thread. (Default: 'auto')
+
+    Returns
+    -------
+    text file-like object.
+    """
+    name = compression(filename)
+    if name is None:
+        return open(filename, 'r')
+    raw = None
+    if decompress in ('auto', 'process'):
+        for command in COMMANDS[name]:
+            if which(command[0]):
+                raw = _ProcessReader(filename, command)
+                break
+        else:
+            if decompress == 'process':
+                raise IOError('No command to decompress {} was found: ' \
+                              '{}'.format(filename, ', '.join( \
+                              c[0] for c in COMMANDS[name])))
+    if raw is None:
+        raw = _ThreadReader(filename, name)
+    return io.TextIOWrapper(io.BufferedReader(raw, _CHUNK),
+                            encoding='utf-8', errors='replace')
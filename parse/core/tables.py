@@ -0,0 +1,100 @@
+"""
+Vectorized conversion of the whitespace-delimited tables of a log, e.g.
+charges, coordinates or eigenvalues: the words of a whole block are split
+in a single step, rather than line by line, reshaped into rows, then
+converted a column at a time by numpy.
+"""
+import re
+
+import numpy as np
+
+def _skip_lines(text, skip):
+    """Returns `text` without its first `skip` lines."""
+    if not skip:
+        return text
+    parts = text.split('\n', skip)
+    return parts[skip] if len(parts) > skip else ''
+
+
+def read_table(text, spec, skip=0):
+    """
+    Converts a table with the same number of words on every line into
+    numpy arrays, one per column (or group of columns).
+
+    Example, for the rows of a table of Mulliken charges, e.g.
+    "1  C  -0.406082":
+
+    ```
+    indices, symbols, charges = read_table(block, (int, str, float))
+    ```
+
+    Parameters
+    ----------
+    :text, str: the table.
+    :spec, sequence: one entry per word of a line: the type of the
+            column, e.g. int, float or str, or None to drop the column.
+            An entry may also be a (type, n) tuple, which reads the next
+            n words of each line as a single 2D array, e.g. (float, 3)
+            for the X, Y and Z of each atom.
+
+    Keywords
+    --------
+    :skip, int: number of header lines to skip. (Default: 0)
+
+    Returns
+    -------
+    tuple of arrays, one per entry of `spec` that is not None.
+
+    Raises
+    ------
+    ValueError, if the number of words is not a whole number of rows, or
+    a word cannot be converted.
+    """
+    widths = [entry[1] if isinstance(entry, tuple) else 1 for entry in spec]
+    width = sum(widths)
+    words = _skip_lines(text, skip).split()
+    if len(words) % width:
+        raise ValueError('Expected a table of {} words per line, but ' \
+                         'found {} words.'.format(width, len(words)))
+    # an object array only references the words; each column is then
+    # converted by a single loop in numpy (a str column is sized to its
+    # longest word)
+    rows = np.array(words, dtype=object).reshape(-1, width)
+    rval = []
+    column = 0
+    for entry, n in zip(spec, widths):
+        kind = entry[0] if isinstance(entry, tuple) else entry
+        if kind is not None:
+            if isinstance(entry, tuple):
+                rval.append(rows[:, column:column + n].astype(kind))
+            else:
+                rval.append(rows[:, column].astype(kind))
+        column += n
+    return tuple(rval)
+
+
+def read_values(text, kind=float, label=None, skip=0):
+    """
+    Converts every word of a block into a flat array, e.g. the
+    eigenvalues of lines such as "Alpha  occ. eigenvalues --  -10.2 ...".
+
+    Parameters
+    ----------
+    :text, str: the block.
+
+    Keywords
+    --------
+    :kind, type: type of the values. (Default: float)
+    :label, str: text that ends the label of each line, e.g. '--'. The
+            label, up to and including its first occurrence, is dropped.
+            (Default: None, every line holds values only)
+    :skip, int: number of header lines to skip. (Default: 0)
+
+    Returns
+    -------
+    np.ndarray
+    """
+    text = _skip_lines(text, skip)
+    if label is not None:
+        text = re.sub(r'(?m)^.*?' + re.escape(label), ' ', text)
+    return np.array(text.split(), dtype=object).astype(kind)
@@ -0,0 +1,194 @@
+"""
+Moves the arrays of a worker's results to the parent process through
+shared memory, rather than through the pipe of a multiprocessing pool:
+the worker copies its large arrays into a single shared memory segment
+and returns only the rest of its result, with a small descriptor of
+each array. The parent maps the segment and reads the arrays in place,
+e.g. stacking them straight into a column, then frees the segment.
+
+Segments are made by `multiprocessing.shared_memory` (Python 3.8+) or,
+on older interpreters, are files in `DIRECTORY`, preallocated and
+mapped with `np.memmap`.
+"""
+import os
+import tempfile
+import numpy as np
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    shared_memory = None
+
+# arrays smaller than this, in bytes, are pickled with the rest
+MIN_BYTES = 1 << 12
+# directory of the segments, if files: memory backed, where there is one
+DIRECTORY = '/dev/shm' if os.access('/dev/shm', os.W_OK) \
+            else tempfile.gettempdir()
+# alignment of each array in a segment, in bytes
+_ALIGN = 64
+
+class _Shared(object):
+    """Stands in for an array moved to shared memory (see `share`)."""
+    def __init__(self, index):
+        self.index = index
+
+
+class _Mapped(object):
+    """
+    A segment that is a file (see `DIRECTORY`), mapped by `attach`, with
+    the `buf`, `close` and `unlink` of a SharedMemory.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.buf = np.memmap(name, np.uint8, 'r')
+
+    def close(self):
+        # the mapping is closed along with its last view
+        self.buf = None
+
+    def unlink(self):
+        os.remove(self.name)
+
+
+def available():
+    """Can results be moved through shared memory?"""
+    return True
+
+
+def prepare():
+    """
+    Readies the parent to receive shared results; call before starting
+    the workers. The workers then share the parent's tracker of shared
+    memory segments, rather than each starting its own, which would free
+    their segments as soon as they exit.
+    """
+    if shared_memory is not None:
+        resource_tracker.ensure_running()
+
+
+def _walk(obj, visit):
+    """
+    Returns a copy of the dicts, lists and tuples of `obj`, with each
+    other item replaced by `visit(item)`.
+    """
+    if isinstance(obj, dict):
+        return dict((key, _walk(value, visit)) for key, value in obj.items())
+    if isinstance(obj, list):
+        return [_walk(value, visit) for value in obj]
+    if isinstance(obj, tuple):
+        return tuple(_walk(value, visit) for value in obj)
+    return visit(obj)
+
+
+def share(obj):
+    """
+    Moves the large numeric arrays in `obj`, e.g. a dict of values, to a
+    new shared memory segment (or file, see `DIRECTORY`), in a worker.
+
+    Returns
+    -------
+    (`obj` with each array moved replaced by a placeholder, descriptor of
+    the segment or None if nothing was moved), to be passed to `attach`
+    (or `receive`) in the parent.
+    """
+    arrays = []
+    # --------------- helper functions --------------- #
+    def collect(item):
+        if isinstance(item, np.ndarray) and (item.dtype.kind in 'biufc') \
+           and (item.nbytes >= MIN_BYTES):
+            arrays.append(item)
+            return _Shared(len(arrays) - 1)
+        return item
+    # ------------- end helper functions ------------- #
+    obj = _walk(obj, collect)
+    if not arrays:
+        return (obj, None)
+    layout = []
+    size = 0
+    for a in arrays:
+        layout.append((a.dtype.str, a.shape, size))
+        size += -(-a.nbytes // _ALIGN) * _ALIGN
+    if shared_memory is None:
+        fd, name = tempfile.mkstemp(prefix='parse-', dir=DIRECTORY)
+        os.close(fd)
+        buf = np.memmap(name, np.uint8, 'w+', shape=(size,))
+        for a, (dtype, shape, offset) in zip(arrays, layout):
+            np.ndarray(shape, dtype, buf, offset)[...] = a
+        # the parent removes the file (see `release`)
+        buf.flush()
+        del buf
+        return (obj, (name, layout))
+    segment = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        for a, (dtype, shape, offset) in zip(arrays, layout):
+            np.ndarray(shape, dtype, segment.buf, offset)[...] = a
+    finally:
+        # the parent frees the segment (see `release`)
+        segment.close()
+    return (obj, (segment.name, layout))
+
+
+def attach(shared):
+    """
+    Maps the segment of a result returned by `share`, in the parent.
+
+    Returns
+    -------
+    (result, with each array a read-only view of the segment, segment or
+    None). The views are only valid until the segment is released (see
+    `release`); copy any array that is kept (see `copy_arrays`).
+    """
+    obj, descriptor = shared
+    if descriptor is None:
+        return (obj, None)
+    name, layout = descriptor
+    if shared_memory is None:
+        segment = _Mapped(name)
+    else:
+        segment = shared_memory.SharedMemory(name=name)
+    views = []
+    for dtype, shape, offset in layout:
+        view = np.ndarray(shape, dtype, segment.buf, offset)
+        view.flags.writeable = False
+        views.append(view)
+    # --------------- helper functions --------------- #
+    def restore(item):
+        return views[item.index] if isinstance(item, _Shared) else item
+    # ------------- end helper functions ------------- #
+    return (_walk(obj, restore), segment)
+
+
+def copy_arrays(obj):
+    """
+    Returns a copy of the dicts, lists and tuples of `obj`, with each
+    array copied, e.g. out of a segment before it is released.
+    """
+    return _walk(obj, lambda item: np.array(item) \
+                 if isinstance(item, np.ndarray) else item)
+
+
+def release(segment):
+    """
+    Frees a segment mapped by `attach`. Every view of it must have been
+    dropped.
+    """
+    if segment is None:
+        return
+    try:
+        segment.close()
+    except BufferError:
+        # a view is still alive; the memory is freed along with it
+        pass
+    segment.unlink()
+
+
+def receive(shared):
+    """
+    Returns the result returned by `share`, with its arrays copied out of
+    the segment, which is then freed.
+    """
+    obj, segment = attach(shared)
+    try:
+        return copy_arrays(obj)
+    finally:
+        obj = None
+        release(segment)
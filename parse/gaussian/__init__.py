@@ -1,26 +1,39 @@
 # log
 from log import get_apt_charges
 from log import get_atom_count
-from log import get_atom_positions
 from log import get_atomic_numbers
+from log import iter_atom_positions
+from log import get_atom_positions
+from log import parse_many
+from log import parse_jobs
+from log import Campaign
 from log import get_cavity_surface_area
 from log import get_cavity_volume
+from log import Corpus
 from log import get_dipole
 from log import get_dipole_moment
+from log import iter_distance_matrix
 from log import get_distance_matrix
 from log import get_electron_count
 from log import get_electronic_spatial_extent
 from log import get_entropy
+from log import follow
+from log import index_log
+from log import parse_all
 from log import get_heat_capacity
 from log import get_HOMO
 from log import get_internal_energy
 from log import get_isotropic_polarizability
+from log import index_jobs
+from log import read_job
+from log import GaussianLog
 from log import get_LUMO
 from log import get_molecular_mass
 from log import get_mulliken_charges
 from log import get_pcm_nonelectrostatic_energy
 from log import get_polarizability
 from log import get_rotational_constants
+from log import iter_scf_energy
 from log import get_scf_energy
 from log import get_SMD_CDS_energy
 from log import get_spectroscopic_data
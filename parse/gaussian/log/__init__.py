@@ -1,25 +1,38 @@
 from .apt_charges import get_apt_charges
 from .atom_count import get_atom_count
 from .atomic_numbers import get_atomic_numbers
+from .atom_positions import iter_atom_positions
 from .atom_positions import get_atom_positions
+from .batch import parse_many
+from .batch import parse_jobs
+from .campaign import Campaign
 from .cavity_surface_area import get_cavity_surface_area
 from .cavity_volume import get_cavity_volume
+from .corpus import Corpus
 from .dipole import get_dipole
 from .dipole_moment import get_dipole_moment
+from .distance_matrix import iter_distance_matrix
 from .distance_matrix import get_distance_matrix
 from .electron_count import get_electron_count
 from .electronic_spatial_extent import get_electronic_spatial_extent
 from .entropy import get_entropy
+from .follow import follow
+from .fused import index_log
+from .fused import parse_all
 from .heat_capacity import get_heat_capacity
 from .homo import get_HOMO
 from .internal_energy import get_internal_energy
 from .isotropic_polarizability import get_isotropic_polarizability
+from .jobs import index_jobs
+from .jobs import read_job
+from .logfile import GaussianLog
 from .lumo import get_LUMO
 from .molecular_mass import get_molecular_mass
 from .mulliken_charges import get_mulliken_charges
 from .pcm_nonelectrostatic_energy import get_pcm_nonelectrostatic_energy
 from .polarizability import get_polarizability
 from .rotational_constants import get_rotational_constants
+from .scf_energy import iter_scf_energy
 from .scf_energy import get_scf_energy
 from .smd_cds_energy import get_SMD_CDS_energy
 from .spectroscopy import get_spectroscopic_data
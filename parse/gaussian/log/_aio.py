@@ -0,0 +1,106 @@
+"""
+asyncio half of `aio`: `aparse` and `aparse_many`. Requires Python 3.6+;
+import them from `aio`, which leaves them out on older interpreters.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from .aio import _message, _parse_data, read_file
+
+async def aparse(path, fields=None, reader=None, executor=None,
+                 threads=None):
+    """
+    Extracts several fields from a Gaussian log file (see `parse_all`),
+    without blocking the event loop.
+
+    Parameters
+    ----------
+    :path, str: name of the log file.
+
+    Keywords
+    --------
+    :fields, list: fields to extract. See `parse_all`.
+            (Default: every field in `FIELDS`)
+    :reader, function: see `aio.iter_parse_many`. It is called in a
+            thread. (Default: `read_file`)
+    :executor, concurrent.futures.Executor: executor that parses the
+            text, e.g. a ProcessPoolExecutor, so that parsing runs on
+            other cores. (Default: the event loop's default executor)
+    :threads, concurrent.futures.ThreadPoolExecutor: threads in which
+            to read. (Default: the event loop's default executor)
+
+    Returns
+    -------
+    dict, field name --> value returned by the field's getter.
+    """
+    reader = read_file if reader is None else reader
+    loop = asyncio.get_event_loop()
+    data = await loop.run_in_executor(threads, reader, path)
+    return await loop.run_in_executor(executor, _parse_data, data, fields)
+
+
+async def aparse_many(paths, fields=None, concurrency=64,
+                      reader=None, executor=None):
+    """
+    Extracts several fields from many Gaussian log files, with up to
+    `concurrency` files being read or parsed at once. Results are
+    generated as each file is finished, which need not be in the order
+    of `paths`.
+
+    Parameters
+    ----------
+    :paths, iterable: names of the log files. Paths are drawn from the
+            iterable only as there is room for them.
+
+    Keywords
+    --------
+    :fields, list: fields to extract. See `parse_all`.
+            (Default: every field in `FIELDS`)
+    :concurrency, int: most files in flight at once. (Default: 64)
+    :reader, function: see `aparse`. (Default: `read_file`)
+    :executor, concurrent.futures.Executor: see `aparse`.
+
+    Returns
+    -------
+    Asynchronous generator of (path, dict of values, error), where error
+    is None, or the message of the error that stopped the file from
+    being parsed, in which case the dict is None.
+    """
+    # --------------- helper functions --------------- #
+    async def parse_one(path):
+        try:
+            values = await aparse(path, fields,
+                                  reader=reader,
+                                  executor=executor,
+                                  threads=threads)
+        except Exception as e:
+            return (path, None, _message(e))
+        return (path, values, None)
+    # ------------- end helper functions ------------- #
+    # the default executor has too few threads to keep `concurrency`
+    # reads waiting at once
+    threads = ThreadPoolExecutor(max_workers=concurrency)
+    paths = iter(paths)
+    pending = set()
+    exhausted = False
+    try:
+        while True:
+            # top up the files in flight
+            while (not exhausted) and (len(pending) < concurrency):
+                try:
+                    path = next(paths)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.ensure_future(parse_one(path)))
+            if not pending:
+                break
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        # e.g. the caller stopped iterating early
+        for future in pending:
+            future.cancel()
+        threads.shutdown(wait=False)
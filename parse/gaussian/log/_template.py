@@ -1,7 +1,10 @@
 from __future__ import print_function
 from ...core.extractors import RegexExtractor
+from ...core.cache import cached
+from ...core.streams import open_text
 import numpy as np
 
+@cached
 def get_data(filename):
 #def get_data(filename, aslist=True):
     """
@@ -18,7 +21,7 @@ def get_data(filename):
     # ------------- end helper functions ------------- #
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the relevent lines
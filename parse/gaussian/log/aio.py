@@ -0,0 +1,158 @@
+"""
+Front-ends to `parse_all` for logs on filesystems where each open and
+read waits on the network, e.g. NFS or Lustre. Reads are overlapped, up
+to a limit, with the parsing of the files already read.
+
+`iter_parse_many` runs the reads in threads and works on any Python.
+On Python 3.6+, `aparse` and `aparse_many` do the same from asyncio, and
+may hand the parsing to an executor, e.g. a ProcessPoolExecutor. Unlike
+the rest of `parse.gaussian.log`, this module is not imported by the
+package.
+
+Example:
+
+```
+from parse.gaussian.log.aio import iter_parse_many
+
+for path, values, error in iter_parse_many(paths, concurrency=256):
+    ...
+
+# python 3.6+
+from parse.gaussian.log.aio import aparse, aparse_many
+
+values = await aparse('job.log', ['scf_energy', 'HOMO'])
+async for path, values, error in aparse_many(paths, concurrency=256):
+    ...
+```
+"""
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from io import StringIO
+from multiprocessing.pool import ThreadPool
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+import time
+
+from ...core.buffers import span_text
+from ...core.streams import decompress_bytes
+from .fused import parse_all
+
+def read_file(path):
+    """
+    Default reader: returns the contents of `path`, as bytes.
+    """
+    with open(path, 'rb') as ifs:
+        return ifs.read()
+
+
+def slow_reader(latency, reader=read_file):
+    """
+    Returns a reader that waits `latency` seconds before each read, a
+    stand-in for a high-latency filesystem when testing locally.
+
+    Parameters
+    ----------
+    :latency, float: seconds to wait before each read.
+
+    Keywords
+    --------
+    :reader, function: reader to delay. (Default: `read_file`)
+    """
+    def delayed(path):
+        time.sleep(latency)
+        return reader(path)
+    return delayed
+
+
+def _parse_data(data, fields):
+    """
+    Parses the contents of a log (see `parse_all`), as returned by a
+    reader.
+    """
+    if isinstance(data, bytes):
+        # e.g. a gzip-compressed log
+        data = decompress_bytes(data)
+    return parse_all(StringIO(span_text(data, 0, len(data))), fields)
+
+
+def _message(e):
+    return '{}: {}'.format(type(e).__name__, e)
+
+
+def iter_parse_many(paths, fields=None, concurrency=64, reader=None):
+    """
+    Extracts several fields from many Gaussian log files, with up to
+    `concurrency` files being read at once, each in its own thread.
+    Files are parsed in the calling thread as their reads finish, while
+    the other reads wait, so results need not be in the order of
+    `paths`.
+
+    Parameters
+    ----------
+    :paths, iterable: names of the log files. Paths are drawn from the
+            iterable only as there is room for them.
+
+    Keywords
+    --------
+    :fields, list: fields to extract. See `parse_all`.
+            (Default: every field in `FIELDS`)
+    :concurrency, int: most files in flight, i.e. read but not yet
+            parsed, at once. (Default: 64)
+    :reader, function: reads a path, returning its contents as bytes,
+            which may be compressed (see `parse.core.streams`), or str.
+            (Default: `read_file`)
+
+    Returns
+    -------
+    Generator of (path, dict of values, error), where error is None, or
+    the message of the error that stopped the file from being parsed,
+    in which case the dict is None.
+    """
+    # --------------- helper functions --------------- #
+    def read_one(path):
+        try:
+            finished.put((path, reader(path), None))
+        except Exception as e:
+            finished.put((path, None, _message(e)))
+    # ------------- end helper functions ------------- #
+    reader = read_file if reader is None else reader
+    finished = queue.Queue()
+    threads = ThreadPool(concurrency)
+    paths = iter(paths)
+    pending = 0
+    exhausted = False
+    try:
+        while True:
+            # top up the files in flight
+            while (not exhausted) and (pending < concurrency):
+                try:
+                    path = next(paths)
+                except StopIteration:
+                    exhausted = True
+                    break
+                threads.apply_async(read_one, (path,))
+                pending += 1
+            if not pending:
+                break
+            path, data, error = finished.get()
+            pending -= 1
+            values = None
+            if error is None:
+                try:
+                    values = _parse_data(data, fields)
+                except Exception as e:
+                    error = _message(e)
+            yield (path, values, error)
+    finally:
+        # e.g. the caller stopped iterating early
+        threads.terminate()
+
+
+try:
+    # python 3.6+
+    from ._aio import aparse, aparse_many
+except SyntaxError:
+    pass
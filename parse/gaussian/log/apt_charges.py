@@ -1,6 +1,24 @@
 from ...core.extractors import RegexRangeExtractor
-import numpy as np
+from ...core.cache import cached
+from ...core.streams import open_text
+from ...core.tables import read_table
 
+def extractor(hydrogen_summed_into_heavy_atoms=False, **kwds):
+    """
+    Returns the extractor that isolates the table of APT charges.
+    """
+    if hydrogen_summed_into_heavy_atoms:
+        start = r'^\s*APT charges with hydrogens summed into heavy atoms:'
+        stop  = r'^\s*Electronic spatial extent'
+    else:
+        start = r'^\s*APT charges:'
+        stop  = r'^\s*Sum of APT charges'
+    return RegexRangeExtractor(start, stop,
+                               include_start=False,
+                               include_stop=False)
+
+
+@cached
 def get_apt_charges(filename,
                     hydrogen_summed_into_heavy_atoms=False):
     """
@@ -27,33 +45,17 @@ def get_apt_charges(filename,
              ...
              N sym  \d+'
         """
-        lines = block.strip().split('\n')
-        indices = []
-        symbols = []
-        charges = []
-        for line in lines[1:]:
-            words = line.split()
-            indices.append(int(words[0]))
-            symbols.append(words[1])
-            charges.append(float(words[2]))
-        return (np.array(indices), np.array(symbols), np.array(charges))
+        # skip the column header
+        return read_table(block.strip(), (int, str, float), skip=1)
     # ------------- end helper functions ------------- #
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the relevent lines
-    if hydrogen_summed_into_heavy_atoms:
-        start = r'^\s*APT charges with hydrogens summed into heavy atoms:'
-        stop  = r'^\s*Electronic spatial extent'
-    else:
-        start = r'^\s*APT charges:'
-        stop  = r'^\s*Sum of APT charges'
-    rre = RegexRangeExtractor(start, stop,
-                              include_start=False,
-                              include_stop=False)
-    block = rre(ifs)[0]
+    rre = extractor(hydrogen_summed_into_heavy_atoms)
+    block = rre(ifs, max_matches=1)[0]
     # close file
     if ifs is not filename:
         ifs.close()
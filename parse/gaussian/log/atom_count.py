@@ -1,5 +1,17 @@
 from ...core.extractors import RegexExtractor
+from ...core.cache import cached
+from ...core.streams import open_text
 
+def extractor(**kwds):
+    """
+    Returns the extractor that isolates the lines reporting the number
+    of atoms.
+    """
+    regex = r'^\s*NAtoms='
+    return RegexExtractor(regex)
+
+
+@cached
 def get_atom_count(filename, each_step=False, aslist=True):
     """
     Extracts the number of atoms from the Gaussian log file.
@@ -36,12 +48,11 @@ def get_atom_count(filename, each_step=False, aslist=True):
     # ------------- end helper functions ------------- #
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the lines containing atom count
-    regex = r'^\s*NAtoms='
-    rre = RegexExtractor(regex)
+    rre = extractor()
     lines = rre(ifs)
     # close file
     if ifs is not filename:
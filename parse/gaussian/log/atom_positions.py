@@ -1,27 +1,41 @@
 from __future__ import print_function
 from ...core.extractors import RegexRangeExtractor
-import numpy as np
+from ...core.cache import cached
+from ...core.stacks import stack
+from ...core.streams import open_text
+from ...core.tables import read_table
 
-def get_atom_positions(filename, aslist=True):
+def extractor(**kwds):
     """
-    Extracts the atom positions from a Gaussian log file.
+    Returns the extractor that isolates the atom coordinate tables.
+    """
+    start = r'Coordinates \(Angstroms\)'
+    stop = r'^\s*-{5,}'
+    return RegexRangeExtractor(start, stop,
+                               skip=2,
+                               include_start=True,
+                               include_stop=False)
+
+
+def iter_atom_positions(filename, from_end=False):
+    """
+    Generates the atom positions from a Gaussian log file, one step
+    at a time, as each coordinate table is read. Unlike
+    `get_atom_positions`, only one table is held in memory at a time.
 
     Parameters
     ----------
     :filename, {str|file-like}: filename/filestream from which to
-            extract the distance matrix/matrices.
+            extract the atom positions.
 
     Keywords
     --------
-    :aslist, bool: If True, a list of matrices is returned, even if
-            only one is found. If False and if only one matrix is
-            found, then the matrix is returned as an np.array object.
-            If more than one matrix is found, this keyword has no
-            affect. (Default: True)
+    :from_end, bool: generate the positions from the last step to the
+            first, reading back from the end of the file. (Default: False)
 
     Returns
     -------
-    N x N distance matrix OR list of matrices. See `aslist` keyword.
+    Generator of N x 3 positions, as np.ndarray objects.
     """
     # ---------- helper functions ----------- #
     def parse_coordinates(table):
@@ -33,39 +47,76 @@ def get_atom_positions(filename, aslist=True):
         -------
         distance matrix as np.ndarray
         """
-        positions = []
         # skip the first 3 lines
-        lines = table.splitlines()
-        for line in lines[3:]:
-            words = line.split()
-            try:
-                positions.append([float(x) for x in words[3:]])
-            except ValueError:
-                import sys
-                print(sys.stderr, table)
-                raise
-        positions = np.array(positions)
-        return positions
+        return read_table(table, (None, None, None, (float, 3)),
+                          skip=3)[0]
     # --------- end helper functions --------- #
 
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
-    # extract distance matrices
-    start = r'Coordinates \(Angstroms\)'
-    stop = r'^\s*-{5,}'
-    rre = RegexRangeExtractor(start, stop,
-                              skip=2,
-                              include_start=True,
-                              include_stop=False)
-    blocks = rre(ifs)
-    # close file
-    if ifs is not filename:
-        ifs.close()
-    # convert the matrices
-    positions = [parse_coordinates(b) for b in blocks]
+    try:
+        # the file is mapped, rather than read, and each table is
+        # converted straight from the mapping (or from its sidecar index)
+        rre = extractor()
+        for block in rre.iter_blocks(ifs, from_end=from_end):
+            yield parse_coordinates(block)
+    finally:
+        # close file
+        if ifs is not filename:
+            ifs.close()
+
+
+@cached
+def get_atom_positions(filename, aslist=True, last=False, trajectory=False,
+                       dtype=float, out=None):
+    """
+    Extracts the atom positions from a Gaussian log file.
+
+    Parameters
+    ----------
+    :filename, {str|file-like}: filename/filestream from which to
+            extract the distance matrix/matrices.
+
+    Keywords
+    --------
+    :aslist, bool: If True, a list of matrices is returned, even if
+            only one is found. If False and if only one matrix is
+            found, then the matrix is returned as an np.array object.
+            If more than one matrix is found, this keyword has no
+            affect. (Default: True)
+    :last, bool: If True, only the positions of the final step are
+            read, searching back from the end of the file, and returned
+            as an np.array object (None, if there are none). This
+            overrides `aslist`. (Default: False)
+    :trajectory, bool: If True, the positions of every step are returned
+            as a single n_steps x N x 3 array, filled as each table is
+            read, rather than as a list. This overrides `aslist`.
+            (Default: False)
+    :dtype, type: type of the trajectory, e.g. np.float32 to halve its
+            size. Only used with `trajectory`. (Default: float)
+    :out, str: name of a `.npy` file into which the trajectory is
+            written, and which is returned mapped into memory, e.g. for a
+            long BOMD or IRC run. Only used with `trajectory`.
+            (Default: None)
+
+    Returns
+    -------
+    N x N distance matrix OR list of matrices. See `aslist` keyword.
+    With `trajectory`, an n_steps x N x 3 np.ndarray (np.memmap, with
+    `out`).
+    """
+    if last:
+        positions = iter_atom_positions(filename, from_end=True)
+        try:
+            return next(positions, None)
+        finally:
+            positions.close()
+    if trajectory:
+        return stack(iter_atom_positions(filename), dtype=dtype, out=out)
+    positions = list(iter_atom_positions(filename))
     # return as list or single ndarray?
     if (not aslist) and (len(positions) == 1):
         positions = positions[0]
@@ -1,6 +1,23 @@
 from ...core.extractors import RegexRangeExtractor
+from ...core.cache import cached
+from ...core.streams import open_text
+from ...core.tables import read_table
 import numpy as np
 
+def extractor(**kwds):
+    """
+    Returns the extractor that isolates the atom coordinate tables,
+    which list the atomic numbers.
+    """
+    start = r'Coordinates \(Angstroms\)'
+    stop  = r'^\s*-{5,}'
+    return RegexRangeExtractor(start, stop,
+                               skip=2,
+                               include_start=True,
+                               include_stop=False)
+
+
+@cached
 def get_atomic_numbers(filename, each_step=False):
     """
     Extracts the atomic numbers of the atoms in the simulation.
@@ -31,25 +48,17 @@ def get_atomic_numbers(filename, each_step=False):
         """
         Parse the line(s) to get the data.
         """
-        lines = block.strip().splitlines()
-        anum = []
-        for line in lines[3:]:
-            words = line.split()
-            anum.append(int(words[1]))
-        return np.array(anum)
+        # skip the 3 header lines
+        return read_table(block.strip(), (None, int, None, None, None, None),
+                          skip=3)[0]
     # ------------- end helper functions ------------- #
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the relevent lines
-    start = r'Coordinates \(Angstroms\)'
-    stop  = r'^\s*-{5,}'
-    rre = RegexRangeExtractor(start, stop,
-                              skip=2,
-                              include_start=True,
-                              include_stop=False)
+    rre = extractor()
     blocks = rre(ifs)
     # close file
     if ifs is not filename:
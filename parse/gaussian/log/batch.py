@@ -0,0 +1,348 @@
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from io import StringIO
+import multiprocessing
+import numbers
+import numpy as np
+
+from ...core import transport
+from ...core.buffers import mapped, searchable, span_text
+from ...core.parallel import mapped_name
+from ...core.streams import open_text
+from .fused import FIELDS, _fields, scan
+from .jobs import _job_spans
+
+def _final(value):
+    """
+    Reduces the value of a field reported at every step, i.e. a list,
+    to the value at the final step. An empty list or tuple, i.e. no
+    value, becomes None.
+    """
+    if isinstance(value, (list, tuple)) and not value:
+        return None
+    if isinstance(value, list):
+        return value[-1]
+    return value
+
+
+def _convert(sections, fields, final=False):
+    """
+    Converts each field from the text of its section(s) (see `scan`) on
+    its own, so that a field that cannot be converted does not cost the
+    others.
+
+    Keywords
+    --------
+    :final, bool: reduce each value to that at the final step (see
+            `_final`). (Default: False)
+
+    Returns
+    -------
+    (dict, field name --> value, error message(s) or None)
+    """
+    values = {}
+    errors = []
+    for name, kwds in fields:
+        getter = FIELDS[name][1]
+        try:
+            value = getter(StringIO(sections[name]), **kwds)
+            values[name] = _final(value) if final else value
+        except Exception as e:
+            errors.append('{}: {}: {}'.format(name, type(e).__name__, e))
+    return (values, '; '.join(errors) or None)
+
+
+def _parse_one(args):
+    """
+    Parses the fields of a single file (see `parse_many`), in a worker.
+    The sections of every field are read in a single pass (see `scan`),
+    then each field is converted on its own (see `_convert`).
+
+    Returns
+    -------
+    (dict, field name --> value, error message(s) or None)
+    """
+    path, fields = args
+    try:
+        sections = scan(path, fields)
+    except Exception as e:
+        return ({}, '{}: {}'.format(type(e).__name__, e))
+    return _convert(sections, fields, final=True)
+
+
+def _parse_file(args):
+    """
+    Parses the fields of a single file, in a worker, as `parse_all`, but
+    converting each field on its own (see `_convert`), and recording,
+    rather than raising, an error that stops the file from being read,
+    e.g. a missing or malformed log.
+
+    Returns
+    -------
+    (dict, field name --> value, error message(s) or None)
+    """
+    path, fields = args
+    try:
+        return _convert(scan(path, fields), fields)
+    except Exception as e:
+        return ({}, '{}: {}'.format(type(e).__name__, e))
+
+
+def _parse_job(args):
+    """
+    Parses the fields of a single job (see `parse_jobs`), in a worker.
+    The job is either its text, or the (filename, (begin, end)) of its
+    bytes, which the worker reads for itself.
+
+    Returns
+    -------
+    (dict, field name --> value, error message(s) or None)
+    """
+    job, fields = args
+    if isinstance(job, tuple):
+        filename, (begin, end) = job
+        with mapped(filename) as buf:
+            job = span_text(buf, begin, end)
+    try:
+        sections = scan(StringIO(job), fields)
+    except Exception as e:
+        return ({}, '{}: {}'.format(type(e).__name__, e))
+    return _convert(sections, fields)
+
+
+def _call(args):
+    """
+    Applies a function to a task, in a worker, and moves the large arrays
+    of the result to shared memory if asked (see `parse.core.transport`).
+    """
+    function, task, shared = args
+    result = function(task)
+    return transport.share(result) if shared else result
+
+
+def _map(function, tasks, workers, chunksize=1, shared=False):
+    """
+    Applies `function` to each task, spread across a pool of `workers`
+    processes, or in this process if `workers` is 1. With `shared`, the
+    large arrays of the results come back through shared memory, as
+    read-only views of one segment per task.
+
+    Returns
+    -------
+    (list of results, list of the segments to release, once every view
+    has been dropped or copied, see `parse.core.transport.release`)
+    """
+    if workers == 1:
+        return ([function(task) for task in tasks], [])
+    shared = shared and transport.available()
+    if shared:
+        transport.prepare()
+    pool = multiprocessing.Pool(workers)
+    try:
+        results = pool.map(_call, [(function, task, shared) \
+                                   for task in tasks], chunksize)
+    finally:
+        pool.close()
+        pool.join()
+    segments = []
+    if shared:
+        attached = [transport.attach(result) for result in results]
+        results = [result for result, segment in attached]
+        segments = [segment for result, segment in attached \
+                    if segment is not None]
+    return (results, segments)
+
+
+def _column(values):
+    """
+    Assembles the values of a field, one per file, into a column: an
+    array of shape (n_files, ...) if every value is numeric with the same
+    shape, e.g. floats or 1 x 3 vectors, where missing values are NaN;
+    otherwise an object array.
+    """
+    present = [v for v in values if v is not None]
+    arrays = []
+    for v in present:
+        if isinstance(v, (numbers.Number, tuple, np.ndarray)) and \
+           not isinstance(v, bool):
+            try:
+                v = np.asarray(v)
+            except ValueError:
+                break
+            if v.dtype.kind in 'iuf':
+                arrays.append(v)
+                continue
+        break
+    else:
+        shapes = set(a.shape for a in arrays)
+        if len(shapes) == 1:
+            shape = shapes.pop()
+            if len(present) == len(values) and \
+               all(a.dtype.kind in 'iu' for a in arrays):
+                return np.array(arrays)
+            column = np.full((len(values),) + shape, np.nan)
+            rows = [i for i, v in enumerate(values) if v is not None]
+            if rows:
+                column[rows] = arrays
+            return column
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+def parse_many(paths, fields=None, workers=None, chunksize=None,
+               shared=None):
+    """
+    Extracts several fields from many Gaussian log files, spread across
+    a pool of processes, and assembles the results as columns, one row
+    per file.
+
+    Each file is read in a single pass, as by `parse_all`. A field
+    reported at every step, e.g. the SCF energy, contributes the value
+    at the final step, so that every field has one value per file:
+    energies form a float array, dipoles and rotational constants
+    (n_files, 3) arrays, and so on (see `_column`). Fields that are not
+    numeric, or whose shape varies from file to file, e.g. the atom
+    positions of different molecules, form object arrays. A file that
+    cannot be parsed does not stop the batch, nor does a field that
+    cannot be converted: the values are missing (NaN or None) and the
+    error is recorded.
+
+    Parameters
+    ----------
+    :paths, list: names of the log files.
+
+    Keywords
+    --------
+    :fields, list: fields to extract. See `parse_all`.
+            (Default: every field in `FIELDS`)
+    :workers, int: number of processes. If 1, the files are parsed in
+            this process. (Default: the number of CPUs)
+    :chunksize, int: number of files sent to a process at a time.
+            (Default: enough for about four chunks per process)
+    :shared, bool: return the arrays of each file, e.g. positions and
+            charges, through shared memory, rather than pickled through
+            a pipe, and stack them into the columns straight from it
+            (see `parse.core.transport`). (Default: if more than one
+            process is used)
+
+    Returns
+    -------
+    dict of columns: 'path' --> list of paths, 'error' --> list of error
+    messages (None if the file was parsed), and field name --> column.
+    """
+    paths = list(paths)
+    fields = _fields(fields)
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    workers = max(1, min(int(workers), len(paths)))
+    if chunksize is None:
+        chunksize = max(1, len(paths) // (4 * workers))
+    if shared is None:
+        shared = transport.available()
+    tasks = [(path, fields) for path in paths]
+    results, segments = _map(_parse_one, tasks, workers, chunksize,
+                             shared=shared)
+    try:
+        rval = {'path' : paths,
+                'error' : [error for values, error in results]}
+        for name, kwds in fields:
+            column = _column([values.get(name) for values, error in results])
+            if segments and (column.dtype == object):
+                # keep copies, not views of the segments
+                for i in range(len(column)):
+                    column[i] = transport.copy_arrays(column[i])
+            rval[name] = column
+    finally:
+        results = None
+        for segment in segments:
+            transport.release(segment)
+    return rval
+
+
+def parse_jobs(filename, fields=None, jobs=None, workers=None, shared=None):
+    """
+    Extracts several fields from each job of a Gaussian log file that
+    holds several, e.g. an opt+freq calculation (see `index_jobs`), with
+    the jobs parsed in parallel. Unlike `parse_all`, whose values run
+    the jobs together, each job's values are its own, e.g. the entropy of
+    the frequency job, rather than that of the first job to report one.
+
+    Only the selected jobs are read: the rest of the log is searched for
+    the starts of the jobs alone, or not at all if the log is indexed (see
+    `index_log`).
+
+    Parameters
+    ----------
+    :filename, {str|file-like}: filename/filestream to parse.
+
+    Keywords
+    --------
+    :fields, list: fields to extract. See `parse_all`.
+            (Default: every field in `FIELDS`)
+    :jobs, {int|list}: index, or indices, of the jobs to parse, e.g. 1
+            for the second job only, or -1 for the last.
+            (Default: None, every job)
+    :workers, int: number of processes. If 1, the jobs are parsed in
+            this process. (Default: the number of CPUs)
+    :shared, bool: return the arrays of each job, e.g. the positions at
+            every step, through shared memory (see `parse_many`).
+            (Default: if more than one process is used)
+
+    Returns
+    -------
+    list of dicts, one per job, in the order of `jobs`: 'job' --> index
+    of the job, 'span' --> (begin, end) offsets of the job (see
+    `index_jobs`), 'error' --> error message(s) of the fields that could
+    not be extracted, e.g. those the job does not report, or None, and
+    field name --> value returned by the field's getter (None if it
+    could not be extracted).
+    """
+    fields = _fields(fields)
+    # open the file, if a string
+    if isinstance(filename, str):
+        ifs = open_text(filename)
+    else:
+        ifs = filename
+    with searchable(ifs) as (buf, pos):
+        if buf is None:
+            # a stream that can only be read forwards
+            buf, pos = ifs.read(), 0
+        spans = _job_spans(ifs, buf, pos)
+        if jobs is None:
+            jobs = range(len(spans))
+        elif isinstance(jobs, int):
+            jobs = [jobs]
+        jobs = [range(len(spans))[i] for i in jobs]
+        # workers read the jobs of a regular file for themselves
+        name = mapped_name(ifs, buf, pos)
+        if name is None:
+            tasks = [(span_text(buf, *spans[i]), fields) for i in jobs]
+        else:
+            tasks = [((name, spans[i]), fields) for i in jobs]
+    # close file
+    if ifs is not filename:
+        ifs.close()
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    workers = max(1, min(int(workers), len(tasks)))
+    if shared is None:
+        shared = transport.available()
+    results, segments = _map(_parse_job, tasks, workers, shared=shared)
+    rval = []
+    try:
+        for i, (values, error) in zip(jobs, results):
+            if segments:
+                values = transport.copy_arrays(values)
+            record = {'job' : i,
+                      'span' : spans[i],
+                      'error' : error}
+            for name, kwds in fields:
+                record[name] = values.get(name)
+            rval.append(record)
+    finally:
+        results = values = None
+        for segment in segments:
+            transport.release(segment)
+    return rval
@@ -0,0 +1,344 @@
+import multiprocessing
+import os
+import pickle
+import socket
+import sqlite3
+import time
+import uuid
+
+from .batch import _parse_file
+from .fused import _fields
+
+# item states
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+class Campaign(object):
+    def __init__(self, directory, fields=None, lease=600., max_attempts=3,
+                 timeout=600.):
+        """
+        Queue of log files to be parsed, shared by any number of worker
+        processes, on one node or many, through a campaign directory that
+        holds an SQLite database of the queue and the shards of results.
+
+        A worker leases a batch of files at a time, parses them, writes
+        their results to a new shard (atomically, by renaming a finished
+        temporary file), then marks them done. A file that cannot be
+        parsed is recorded with its error, and the run carries on. If a
+        worker dies, its lease expires and the files are leased again, so
+        a campaign that crashed is resumed simply by running it again:
+        files already done are skipped. A file whose lease expires
+        `max_attempts` times, e.g. one that kills its worker, is marked
+        failed.
+
+        Example:
+
+        ```
+        campaign = Campaign('/scratch/campaign', ['scf_energy', 'HOMO'])
+        campaign.add(glob.glob('/data/**/*.log', recursive=True))
+        campaign.run(workers=16)      # on each node
+        for record in campaign.results():
+            ...
+        ```
+
+        Several nodes may share a campaign directory on a shared
+        filesystem, provided it supports the file locks SQLite relies on
+        (e.g. NFSv4 or Lustre mounted with flock).
+
+        Parameters
+        ----------
+        :directory, str: campaign directory. It is created if need be.
+
+        Keywords
+        --------
+        :fields, list: fields to extract. See `parse_all`.
+                (Default: every field in `FIELDS`)
+        :lease, float: seconds a worker holds its files before they may
+                be leased to another. The lease is renewed after each
+                file. (Default: 600)
+        :max_attempts, int: leases of a file before it is given up.
+                (Default: 3)
+        :timeout, float: seconds to wait for a lock on the database.
+                (Default: 600)
+        """
+        self.directory = directory
+        self.fields = _fields(fields)
+        self.lease = float(lease)
+        self.max_attempts = int(max_attempts)
+        self.timeout = float(timeout)
+        self._connection = None
+        self._pid = None
+
+    def __getstate__(self):
+        # e.g. sent to a spawned worker, which connects for itself
+        state = self.__dict__.copy()
+        state['_connection'] = None
+        state['_pid'] = None
+        return state
+
+    @property
+    def path(self):
+        """Name of the database file of the queue."""
+        return os.path.join(self.directory, 'queue.sqlite')
+
+    @property
+    def shards(self):
+        """Name of the directory of the shards of results."""
+        return os.path.join(self.directory, 'shards')
+
+    def _connect(self):
+        """
+        Returns the connection of this process to the database, creating
+        the database if needed. A connection is not shared across a fork.
+        """
+        if (self._connection is None) or (self._pid != os.getpid()):
+            if not os.path.isdir(self.shards):
+                try:
+                    os.makedirs(self.shards)
+                except OSError:
+                    # e.g. created by another worker in the meantime
+                    if not os.path.isdir(self.shards):
+                        raise
+            # transactions are begun explicitly (see `_transaction`)
+            db = sqlite3.connect(self.path, timeout=self.timeout,
+                                 isolation_level=None)
+            # paths are read back as str, rather than unicode (Python 2),
+            # so that the getters take them for file names, not streams
+            db.text_factory = str
+            db.execute('CREATE TABLE IF NOT EXISTS items ('
+                       'path TEXT PRIMARY KEY, '
+                       'state TEXT NOT NULL, '
+                       'worker TEXT, '
+                       'expires REAL, '
+                       'attempts INTEGER NOT NULL DEFAULT 0, '
+                       'error TEXT, '
+                       'shard TEXT)')
+            db.execute('CREATE INDEX IF NOT EXISTS states '
+                       'ON items (state, expires)')
+            self._connection = db
+            self._pid = os.getpid()
+        return self._connection
+
+    def _transaction(self, statements):
+        """
+        Runs `statements(db)` in a transaction that holds the write lock
+        from its start, so that no two workers lease the same file.
+        """
+        db = self._connect()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            rval = statements(db)
+        except:
+            db.execute('ROLLBACK')
+            raise
+        db.execute('COMMIT')
+        return rval
+
+    def add(self, paths):
+        """
+        Queues log files. Files already queued, or done, are left as they
+        are, so the same list can be added again, e.g. when resuming.
+
+        Returns
+        -------
+        int, number of files newly queued.
+        """
+        # --------------- helper functions --------------- #
+        def insert(db):
+            before = db.total_changes
+            db.executemany('INSERT OR IGNORE INTO items (path, state) '
+                           'VALUES (?, ?)',
+                           ((path, PENDING) for path in paths))
+            return db.total_changes - before
+        # ------------- end helper functions ------------- #
+        return self._transaction(insert)
+
+    def _lease(self, worker, n):
+        """
+        Leases up to `n` files, pending or of expired leases, to `worker`.
+
+        Returns
+        -------
+        list of the names of the files leased.
+        """
+        # --------------- helper functions --------------- #
+        def lease(db):
+            now = time.time()
+            # files that have exhausted their attempts
+            db.execute('UPDATE items SET state = ?, worker = NULL, '
+                       'expires = NULL, error = ? '
+                       'WHERE state = ? AND expires < ? AND attempts >= ?',
+                       (FAILED,
+                        'abandoned after {} attempts'.format(
+                            self.max_attempts),
+                        LEASED, now, self.max_attempts))
+            paths = [row[0] for row in db.execute(
+                'SELECT path FROM items '
+                'WHERE state = ? OR (state = ? AND expires < ?) LIMIT ?',
+                (PENDING, LEASED, now, n))]
+            db.executemany('UPDATE items SET state = ?, worker = ?, '
+                           'expires = ?, attempts = attempts + 1 '
+                           'WHERE path = ?',
+                           ((LEASED, worker, now + self.lease, path) \
+                            for path in paths))
+            return paths
+        # ------------- end helper functions ------------- #
+        return self._transaction(lease)
+
+    def _renew(self, worker):
+        """Extends the lease of every file held by `worker`."""
+        self._transaction(lambda db: db.execute(
+            'UPDATE items SET expires = ? WHERE state = ? AND worker = ?',
+            (time.time() + self.lease, LEASED, worker)))
+
+    def _write_shard(self, worker, records):
+        """
+        Writes the records of a batch to a new shard, which appears under
+        its final name only once it is complete.
+
+        Returns
+        -------
+        str, name of the shard, relative to `shards`.
+        """
+        name = '{}-{}.pkl'.format(worker, uuid.uuid4().hex[:8])
+        filename = os.path.join(self.shards, name)
+        tmp = '{}.tmp'.format(filename)
+        with open(tmp, 'wb') as ofs:
+            pickle.dump(records, ofs, 2)
+            ofs.flush()
+            os.fsync(ofs.fileno())
+        os.rename(tmp, filename)
+        return name
+
+    def _complete(self, worker, records, shard):
+        """
+        Marks the files of a batch done (or failed, if not parsed at all),
+        unless their lease was lost, e.g. it expired and was taken by
+        another worker.
+        """
+        self._transaction(lambda db: db.executemany(
+            'UPDATE items SET state = ?, worker = NULL, expires = NULL, '
+            'error = ?, shard = ? '
+            'WHERE path = ? AND state = ? AND worker = ?',
+            ((FAILED if r['values'] is None else DONE, r['error'], shard,
+              r['path'], LEASED, worker) for r in records)))
+
+    def work(self, batch=16, max_files=None):
+        """
+        Leases, parses and records files in this process until the queue
+        is empty (or `max_files` have been parsed).
+
+        Keywords
+        --------
+        :batch, int: files leased, and written to a shard, at a time.
+                (Default: 16)
+        :max_files, int: stop after this many files. (Default: None)
+
+        Returns
+        -------
+        int, number of files parsed.
+        """
+        worker = '{}-{}-{}'.format(socket.gethostname(), os.getpid(),
+                                   uuid.uuid4().hex[:8])
+        count = 0
+        while (max_files is None) or (count < max_files):
+            n = batch if max_files is None else min(batch, max_files - count)
+            paths = self._lease(worker, n)
+            if not paths:
+                break
+            records = []
+            for path in paths:
+                # an error, e.g. of a malformed log, is recorded
+                values, error = _parse_file((path, self.fields))
+                # a file of which nothing could be read has failed
+                if error and not values:
+                    values = None
+                records.append({'path' : path,
+                                'error' : error,
+                                'values' : values})
+                self._renew(worker)
+            shard = self._write_shard(worker, records)
+            self._complete(worker, records, shard)
+            count += len(paths)
+        return count
+
+    def run(self, workers=None, batch=16):
+        """
+        Works through the queue with a number of processes on this node
+        (see `work`).
+
+        Keywords
+        --------
+        :workers, int: number of processes. If 1, the queue is worked in
+                this process. (Default: the number of CPUs)
+        :batch, int: see `work`. (Default: 16)
+
+        Returns
+        -------
+        dict of the number of files in each state (see `status`).
+        """
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+        if workers == 1:
+            self.work(batch)
+        else:
+            processes = [multiprocessing.Process(target=self.work,
+                                                 args=(batch,)) \
+                         for i in range(int(workers))]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+        return self.status()
+
+    def status(self):
+        """
+        Returns
+        -------
+        dict, state ('pending', 'leased', 'done' or 'failed') --> number
+        of files.
+        """
+        db = self._connect()
+        rval = dict((state, 0) for state in (PENDING, LEASED, DONE, FAILED))
+        for state, count in db.execute('SELECT state, COUNT(*) FROM items '
+                                       'GROUP BY state'):
+            rval[state] = count
+        return rval
+
+    def errors(self):
+        """
+        Returns
+        -------
+        dict, name of each file recorded with an error --> error message.
+        """
+        db = self._connect()
+        return dict(db.execute('SELECT path, error FROM items '
+                               'WHERE error IS NOT NULL'))
+
+    def results(self):
+        """
+        Generates the record of each file done or failed, one shard at a
+        time: a dict with 'path', 'error' (message or None) and 'values'
+        (dict, field name --> value returned by the field's getter, with
+        only those fields that could be extracted; None if the file could
+        not be parsed at all). A file parsed more than once, e.g. by a
+        worker whose lease expired, is generated once.
+        """
+        db = self._connect()
+        rows = db.execute('SELECT path, error, shard FROM items '
+                          'WHERE state IN (?, ?)', (DONE, FAILED)).fetchall()
+        shards = {}
+        for path, error, shard in rows:
+            if shard is None:
+                # abandoned (see `_lease`)
+                yield {'path' : path, 'error' : error, 'values' : None}
+            else:
+                shards.setdefault(shard, set()).add(path)
+        for shard in sorted(shards):
+            with open(os.path.join(self.shards, shard), 'rb') as ifs:
+                records = pickle.load(ifs)
+            for record in records:
+                if record['path'] in shards[shard]:
+                    yield record
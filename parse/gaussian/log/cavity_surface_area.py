@@ -1,5 +1,17 @@
 from ...core.extractors import RegexExtractor
+from ...core.cache import cached
+from ...core.streams import open_text
 
+def extractor(**kwds):
+    """
+    Returns the extractor that isolates the lines reporting the GePol
+    cavity surface area.
+    """
+    regex = r'^\s*GePol: Cavity surface area'
+    return RegexExtractor(regex)
+
+
+@cached
 def get_cavity_surface_area(filename, aslist=True):
     """
     Returns the GePol cavity surface area.
@@ -29,12 +41,11 @@ def get_cavity_surface_area(filename, aslist=True):
     # ------------- end helper functions ------------- #
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the relevent lines
-    regex = r'^\s*GePol: Cavity surface area'
-    rre = RegexExtractor(regex)
+    rre = extractor()
     lines = rre(ifs)
     # close file
     if ifs is not filename:
@@ -0,0 +1,283 @@
+import fnmatch
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+import os
+import pickle
+import sqlite3
+
+from ... import __version__
+from ...core.cache import sample_digest
+from .batch import _parse_file
+from .fused import _fields
+
+# files whose rows are written to the database per transaction
+_COMMIT_EVERY = 256
+
+def _stat(path):
+    """Returns the (size, mtime) of `path`, or None if it is gone."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime)
+
+
+def _digest(args):
+    """Returns the sample digest of a file, or None if it is gone."""
+    path, size = args
+    try:
+        return sample_digest(path, size)
+    except (IOError, OSError):
+        return None
+
+
+class Corpus(object):
+    def __init__(self, directory, fields=None, database=None,
+                 patterns=('*.log', '*.log.gz', '*.log.bz2', '*.log.xz')):
+        """
+        Index of the values extracted from every Gaussian log under a
+        directory, kept up to date by reparsing only the logs that were
+        added or modified since the last `update`.
+
+        The index holds a manifest entry for each log, its size,
+        modification time and a hash of its first and last 64 KiB (see
+        `parse.core.cache.sample_digest`), along with the values parsed
+        from it. A log is reparsed only if its size or modification time
+        changed and, if only its modification time changed, its hash
+        changed, too; e.g. a log that was merely touched or copied with
+        its contents intact is not reparsed.
+
+        Example:
+
+        ```
+        corpus = Corpus('/data/nightly', ['scf_energy', 'HOMO'])
+        changes = corpus.update(workers=32)
+        for path, values, error in corpus.results():
+            ...
+        ```
+
+        Parameters
+        ----------
+        :directory, str: directory searched, recursively, for logs.
+
+        Keywords
+        --------
+        :fields, list: fields to extract. See `parse_all`. Changing the
+                fields, or the version of this library, reparses every
+                log. (Default: every field in `FIELDS`)
+        :database, str: name of the SQLite database of the index.
+                (Default: .parse-corpus.sqlite in `directory`)
+        :patterns, tuple: file name patterns of the logs.
+                (Default: '*.log', and compressed logs)
+        """
+        self.directory = directory
+        self.fields = _fields(fields)
+        if database is None:
+            database = os.path.join(directory, '.parse-corpus.sqlite')
+        self.database = database
+        self.patterns = tuple(patterns)
+        self._connection = None
+
+    def _connect(self):
+        """
+        Returns the connection to the database, creating the database if
+        needed. If the index was built for other fields, or by another
+        version of this library, it is cleared.
+        """
+        if self._connection is None:
+            db = sqlite3.connect(self.database)
+            with db:
+                db.execute('CREATE TABLE IF NOT EXISTS files ('
+                           'path TEXT PRIMARY KEY, '
+                           'size INTEGER NOT NULL, '
+                           'mtime REAL NOT NULL, '
+                           'fingerprint TEXT, '
+                           'error TEXT, '
+                           'value BLOB)')
+                db.execute('CREATE TABLE IF NOT EXISTS settings ('
+                           'key TEXT PRIMARY KEY, '
+                           'value TEXT NOT NULL)')
+                settings = repr((self.fields, __version__))
+                row = db.execute('SELECT value FROM settings '
+                                 'WHERE key = ?', ('fields',)).fetchone()
+                if (row is None) or (row[0] != settings):
+                    db.execute('DELETE FROM files')
+                    db.execute('INSERT OR REPLACE INTO settings '
+                               '(key, value) VALUES (?, ?)',
+                               ('fields', settings))
+            self._connection = db
+        return self._connection
+
+    def find(self):
+        """
+        Returns
+        -------
+        list, names of the logs under `directory`, relative to it.
+        """
+        rval = []
+        database = os.path.abspath(self.database)
+        for root, dirnames, filenames in os.walk(self.directory):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if any(fnmatch.fnmatch(filename, pattern) \
+                       for pattern in self.patterns):
+                    path = os.path.join(root, filename)
+                    if os.path.abspath(path) != database:
+                        rval.append(os.path.relpath(path, self.directory))
+        return rval
+
+    def update(self, workers=None, stat_workers=32):
+        """
+        Brings the index up to date with the logs under `directory`:
+        logs added or modified since the last update are parsed, and the
+        entries of deleted logs are removed.
+
+        Keywords
+        --------
+        :workers, int: number of processes that parse the logs. If 1,
+                the logs are parsed in this process.
+                (Default: the number of CPUs)
+        :stat_workers, int: number of threads that stat, and hash, the
+                logs, which overlaps the latency of a network filesystem.
+                (Default: 32)
+
+        Returns
+        -------
+        dict, 'added', 'modified' and 'deleted' --> list of the names of
+        the logs, relative to `directory`, and 'unchanged' --> number of
+        logs that were not reparsed.
+        """
+        db = self._connect()
+        known = dict((path, (size, mtime, fingerprint)) \
+                     for path, size, mtime, fingerprint in db.execute(
+                         'SELECT path, size, mtime, fingerprint FROM files'))
+        paths = self.find()
+        threads = ThreadPool(max(1, int(stat_workers)))
+        try:
+            stats = threads.map(_stat, [os.path.join(self.directory, p) \
+                                        for p in paths])
+            # only files whose size or mtime changed are hashed
+            changed = [(path, stat) for path, stat in zip(paths, stats) \
+                       if (stat is not None) and \
+                          (known.get(path, (None, None))[:2] != stat)]
+            digests = threads.map(_digest,
+                                  [(os.path.join(self.directory, path),
+                                    stat[0]) for path, stat in changed])
+        finally:
+            threads.close()
+            threads.join()
+        added = []
+        modified = []
+        touched = []
+        for (path, stat), digest in zip(changed, digests):
+            if path not in known:
+                added.append((path, stat, digest))
+            elif (known[path][0] == stat[0]) and (known[path][2] == digest) \
+                 and (digest is not None):
+                # same contents, e.g. touched
+                touched.append((path, stat))
+            else:
+                modified.append((path, stat, digest))
+        found = set(path for path, stat in zip(paths, stats) \
+                    if stat is not None)
+        deleted = sorted(set(known) - found)
+        with db:
+            db.executemany('UPDATE files SET mtime = ? WHERE path = ?',
+                           ((stat[1], path) for path, stat in touched))
+            db.executemany('DELETE FROM files WHERE path = ?',
+                           ((path,) for path in deleted))
+        self._parse(added + modified, workers)
+        return {'added' : [path for path, stat, digest in added],
+                'modified' : [path for path, stat, digest in modified],
+                'deleted' : deleted,
+                'unchanged' : len(found) - len(added) - len(modified)}
+
+    def _parse(self, entries, workers):
+        """
+        Parses the logs of `entries`, each (path, (size, mtime), digest),
+        and records their manifest entries and values, a batch of rows at
+        a time, so that an update that is interrupted keeps its progress.
+        """
+        if not entries:
+            return
+        db = self._connect()
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+        workers = max(1, min(int(workers), len(entries)))
+        tasks = [(os.path.join(self.directory, path), self.fields) \
+                 for path, stat, digest in entries]
+        pool = None
+        if workers == 1:
+            results = (_parse_file(task) for task in tasks)
+        else:
+            pool = multiprocessing.Pool(workers)
+            chunksize = max(1, min(64, len(tasks) // (4 * workers)))
+            results = pool.imap(_parse_file, tasks, chunksize)
+        try:
+            rows = []
+            for (path, stat, digest), (values, error) in zip(entries,
+                                                             results):
+                rows.append((path, stat[0], stat[1], digest, error,
+                             sqlite3.Binary(pickle.dumps(values, 2))))
+                if len(rows) >= _COMMIT_EVERY:
+                    self._write(rows)
+                    rows = []
+            self._write(rows)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    def _write(self, rows):
+        """Records the manifest entries and values of parsed logs."""
+        db = self._connect()
+        with db:
+            db.executemany('INSERT OR REPLACE INTO files '
+                           '(path, size, mtime, fingerprint, error, value) '
+                           'VALUES (?, ?, ?, ?, ?, ?)', rows)
+
+    def __len__(self):
+        db = self._connect()
+        return db.execute('SELECT COUNT(*) FROM files').fetchone()[0]
+
+    def manifest(self):
+        """
+        Returns
+        -------
+        dict, name of each log, relative to `directory` --> (size, mtime,
+        fingerprint), as of the last update.
+        """
+        db = self._connect()
+        return dict((path, (size, mtime, fingerprint)) \
+                    for path, size, mtime, fingerprint in db.execute(
+                        'SELECT path, size, mtime, fingerprint FROM files'))
+
+    def values(self, path):
+        """
+        Returns
+        -------
+        dict, field name --> value of the log `path` (relative to
+        `directory`), as of the last update, with only those fields that
+        could be extracted.
+
+        Raises
+        ------
+        KeyError, if the log is not in the index.
+        """
+        db = self._connect()
+        row = db.execute('SELECT value FROM files WHERE path = ?',
+                         (path,)).fetchone()
+        if row is None:
+            raise KeyError(path)
+        return pickle.loads(bytes(row[0]))
+
+    def results(self):
+        """
+        Generates (name of the log, relative to `directory`, dict of
+        values, error message or None) of every log in the index, in the
+        order of their names.
+        """
+        db = self._connect()
+        for path, value, error in db.execute('SELECT path, value, error '
+                                             'FROM files ORDER BY path'):
+            yield (path, pickle.loads(bytes(value)), error)
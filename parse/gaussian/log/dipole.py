@@ -1,8 +1,19 @@
 from ...core.extractors import RegexExtractor
-import numpy as np
-import re
+from ...core.cache import cached
+from ...core.fortran import read_fixed
+from ...core.streams import open_text
 
-def get_dipole(filename, aslist=True):
+def extractor(**kwds):
+    """
+    Returns the extractor that isolates the lines reporting the dipole
+    vector.
+    """
+    regex = r'^\s*Dipole\s+='
+    return RegexExtractor(regex)
+
+
+@cached
+def get_dipole(filename, aslist=True, last=False):
     """
     Extracts the dipoles (output for each step)
     from a Gaussian log file.
@@ -14,6 +25,10 @@ def get_dipole(filename, aslist=True):
             found, then the matrix is returned as an np.array object.
             If more than one matrix is found, this keyword has no
             affect. (Default: True)
+    :last, bool: If True, only the dipole of the final step is read,
+            searching back from the end of the file, and returned on its
+            own (None, if there is none). This overrides `aslist`.
+            (Default: False)
 
     Returns
     -------
@@ -27,34 +42,32 @@ def get_dipole(filename, aslist=True):
         """
         # Expected format:
         # Dipole         =% 10.8D+2% 10.8D+2% 10.8D+2"
-        # grab vector
-        line = line.split('=')[1]
         # the Gaussian file is not careful to separate
-        # the numbers, so we must assume that the number
-        # format is fixed, i.e.
-        # x.x{1,}D+yy
-        dipole = re.split('([^D]+D\+..)', line)
-        # cast these as floats -- must first replace
-        # D with E.
-        dipole = [float(v.replace('D', 'E')) for v in dipole if v]
-        return np.array(dipole)
+        # the numbers, so they are read by their fixed
+        # width (D15.8) after the "="
+        return read_fixed(line, 15, label='=')
     # ------------- end helper functions ------------- #
 
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the dipole
-    regex = r'^\s*Dipole\s+='
-    rre = RegexExtractor(regex)
-    lines = rre(ifs)
+    rre = extractor()
+    if last:
+        # search back from the end of the file for the final step
+        lines = rre(ifs, from_end=True, max_matches=1)
+    else:
+        lines = rre(ifs)
     # close file
     if ifs is not filename:
         ifs.close()
     # convert the dipoles
     dipoles = [parse_dipole(l) for l in lines]
     # return as list or single ndarray?
+    if last:
+        return dipoles[0] if dipoles else None
     if (not aslist) and (len(dipoles) == 1):
         dipoles = dipoles[0]
     return dipoles
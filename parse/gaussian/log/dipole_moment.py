@@ -1,5 +1,20 @@
 from ...core.extractors import RegexRangeExtractor
+from ...core.cache import cached
+from ...core.streams import open_text
 
+def extractor(**kwds):
+    """
+    Returns the extractor that isolates the line that follows each
+    dipole moment header.
+    """
+    start = '^\s*Dipole moment'
+    stop  = '.*'
+    return RegexRangeExtractor(start, stop,
+                               include_start=False,
+                               include_stop=True)
+
+
+@cached
 def get_dipole_moment(filename, aslist=True):
     """
     Returns the magnitude of the field-independent dipole moment.
@@ -29,15 +44,11 @@ def get_dipole_moment(filename, aslist=True):
     # ------------- end helper functions ------------- #
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the relevent lines
-    start = '^\s*Dipole moment'
-    stop  = '.*'
-    rre = RegexRangeExtractor(start, stop,
-                              include_start=False,
-                              include_stop=True)
+    rre = extractor()
     lines = rre(ifs)
     # close file
     if ifs is not filename:
@@ -1,95 +1,317 @@
 from ...core.extractors import RegexRangeExtractor
+from ...core.cache import cached
+from ...core.streams import open_text
+from ...core.tables import read_table
 import numpy as np
+import re
 
-def get_distance_matrix(filename, aslist=True):
+# sections the distances are read from (see `get_distance_matrix`)
+SOURCES = ('matrix', 'coordinates')
+# bytes of the temporary arrays of a chunk of steps whose distances are
+# computed from coordinates at once
+_CHUNK_BYTES = 1 << 26
+# the column labels, and the row labels (index and symbol), of a matrix
+_LABELS = re.compile(r'(?m)^(?:[ \t\d]*$|\s*\d+\s+[A-Za-z]\S*)')
+# layouts of the matrices seen, keyed by (atoms, columns per block)
+_layouts = {}
+
+def extractor(source='matrix', **kwds):
     """
-    Extracts the distance matrix/matrices from a Gaussian log file.
+    Returns the extractor that isolates the distance matrix tables, or,
+    if `source` is 'coordinates', the orientation tables.
+    """
+    if source == 'coordinates':
+        # the input, Z-matrix or standard orientation (the indent rules
+        # out e.g. the dipole orientation); the pattern has no alternation,
+        # so that the search jumps from one " orientation:" to the next
+        start = r'^\s{5,}\S+ orientation:'
+        stop = r'^\s*-{5,}'
+        # the closing rule is kept, to tell a complete table from one
+        # cut off at the end of the log
+        return RegexRangeExtractor(start, stop,
+                                   skip=4,
+                                   include_start=True,
+                                   include_stop=True)
+    start = r'^\s*Distance'
+    stop = r'^\s*[a-zA-Z]'
+    # the line after the matrix is kept, as for the orientation tables
+    return RegexRangeExtractor(start, stop,
+                               include_start=False,
+                               include_stop=True)
+
+
+def _layout(N, width):
+    """
+    Returns the row and column of each distance of an N-atom matrix, in
+    the order it is printed: the lower triangle, diagonal included, in
+    blocks of `width` columns. Also returns the positions, in that order,
+    of the distances off the diagonal, and their indices in the condensed
+    (upper triangle, row by row) vector.
+    """
+    key = (N, width)
+    if key not in _layouts:
+        if len(_layouts) > 16:
+            _layouts.clear()
+        rows, cols = np.tril_indices(N)
+        # block by block, then row by row, then column by column
+        order = np.lexsort((cols, rows, cols // width))
+        rows = rows[order]
+        cols = cols[order]
+        # position of (col, row), col < row, in the upper triangle
+        index = N*cols - cols*(cols + 1)//2 + rows - cols - 1
+        offdiagonal = np.flatnonzero(rows != cols)
+        _layouts[key] = (rows, cols, offdiagonal, index[offdiagonal])
+    return _layouts[key]
+
+
+def _geometries(tables):
+    """
+    Generates one orientation table per step. A step prints its input
+    (or Z-matrix) orientation, then, unless symmetry is turned off, its
+    standard orientation: the same geometry, rotated, so a standard
+    orientation that follows an input orientation is skipped.
+    """
+    after_input = False
+    for table in tables:
+        standard = table.lstrip().startswith('Standard')
+        if not (standard and after_input):
+            yield table
+        after_input = not standard
+
+
+def _positions(table):
+    """
+    Returns the N x 3 positions of an orientation table.
+
+    Raises
+    ------
+    ValueError, if the table is incomplete, i.e. has no closing rule.
+    """
+    lines = table.rstrip().rsplit('\n', 1)
+    if (len(lines) < 2) or not lines[1].strip().startswith('-----'):
+        raise ValueError('The orientation table is incomplete.')
+    # skip the orientation and the column headers
+    return read_table(lines[0], (None, None, None, (float, 3)), skip=5)[0]
+
+
+def _complete(blocks, convert):
+    """
+    Generates `convert(block)` for each of `blocks`, except for the last
+    block if it cannot be converted, e.g. because it was cut off at the
+    end of the log of a running job.
+    """
+    block = next(blocks, None)
+    while block is not None:
+        following = next(blocks, None)
+        try:
+            value = convert(block)
+        except ValueError:
+            if following is not None:
+                raise
+            break
+        yield value
+        block = following
+
+
+def _distances(positions, dtype, condensed):
+    """
+    Returns the distance matrices (or condensed vectors) of a k x N x 3
+    array of positions, as a single k x N x N (or k x N(N-1)/2) array.
+    """
+    N = positions.shape[1]
+    if condensed:
+        i, j = np.triu_indices(N, 1)
+    total = None
+    # a coordinate at a time, to bound the temporary arrays
+    for c in range(positions.shape[2]):
+        x = positions[:, :, c]
+        if condensed:
+            d = x[:, i] - x[:, j]
+        else:
+            d = x[:, :, np.newaxis] - x[:, np.newaxis, :]
+        d *= d
+        if total is None:
+            total = d
+        else:
+            total += d
+    return np.sqrt(total, out=total).astype(dtype, copy=False)
+
+
+def _pairwise(geometries, dtype, condensed):
+    """
+    Generates the distance matrices (or condensed vectors) of a sequence
+    of N x 3 positions, computed for a chunk of steps at a time, whose
+    temporary arrays take about `_CHUNK_BYTES`.
+    """
+    chunk = []
+    size = 1
+    for positions in geometries:
+        if chunk and ((len(chunk) == size) or \
+                      (positions.shape != chunk[0].shape)):
+            for distances in _distances(np.array(chunk), dtype, condensed):
+                yield distances
+            chunk = []
+        if not chunk:
+            N = len(positions)
+            pairs = N*(N - 1)//2 if condensed else N*N
+            # a float64 total and difference per pair
+            size = max(1, _CHUNK_BYTES // (16*max(1, pairs)))
+        chunk.append(positions)
+    if chunk:
+        for distances in _distances(np.array(chunk), dtype, condensed):
+            yield distances
+
+
+def iter_distance_matrix(filename, dtype=float, condensed=False,
+                         source='matrix'):
+    """
+    Generates the distance matrices from a Gaussian log file, one step
+    at a time, as each matrix is read. Unlike `get_distance_matrix`,
+    only one matrix is held in memory at a time.
 
     Parameters
     ----------
     :filename, {str|file-like}: filename/filestream from which to
-            extract the distance matrix/matrices.
+            extract the distance matrices.
 
     Keywords
     --------
-    :aslist, bool: If True, a list of matrices is returned, even if
-            only one is found. If False and if only one matrix is
-            found, then the matrix is returned as an np.array object.
-            If more than one matrix is found, this keyword has no
-            affect. (Default: True)
+    :dtype, type: type of the distances, e.g. np.float32 to halve their
+            size. (Default: float)
+    :condensed, bool: If True, each matrix is generated as the condensed
+            vector of its N(N-1)/2 distinct distances, the upper triangle
+            row by row (as `scipy.spatial.distance.squareform`), rather
+            than as an N x N matrix. (Default: False)
+    :source, str: section the distances are read from: 'matrix', the
+            distance matrix tables, or 'coordinates', the orientation
+            tables, from whose positions the distances are computed. See
+            `get_distance_matrix`. (Default: 'matrix')
 
     Returns
     -------
-    tuple, (N x N distance matrix OR list of matrices, N element symbols).
-    See `aslist` keyword.
+    Generator of N x N distance matrices (or condensed vectors), as
+    np.ndarray objects.
     """
     # ---------- helper functions ----------- #
     def parse_matrix(matrix):
         """
         Converts a split lower-triangular matrix, as found in
-        Gaussian 09 output, into a fully dense np.ndarray.
+        Gaussian 09 output, into a fully dense np.ndarray, or its
+        condensed vector.
 
         Returns
         -------
         distance matrix as np.ndarray
+
+        Raises
+        ------
+        ValueError, if the matrix is incomplete, i.e. is not followed by
+        the line that ends it.
         """
-        def not_header(field):
-            # At a minimum, data rows have fields
-            #   (element index) (symbol) (distance_ii)
-            if len(field) < 3:
-                return False
-            # (symbol) is a character/string
-            try:
-                _ = int(field[1])
-            except ValueError:
-                return True
-            else:
-                return False
-        distances = []
-        for line in matrix.strip().split('\n'):
-            words = line.split()
-            # get index information from row/column labels
-            if not_header(words):
-                # row index: 1 indexed --> 0 indexed
-                row = int(words[0])-1
-                # distances
-                dist = map(float, words[2:])
-            else:
-                # col index: 1 indexed --> 0 indexed
-                col = [int(w)-1 for w in words]
-                continue
-            # read values into lower triangular matrix
-            if len(distances) <= row:
-                distances.append(dist)
-            else:
-                distances[row].extend(dist)
-        # populate matrix upper triangle
-        N = len(distances)
-        for i in xrange(N):
-            m = len(distances[i])
-            distances[i].extend((N-m)*[0.0])
-        distances = np.array(distances)
-        distances = distances + distances.transpose()
+        matrix, _, last = matrix.rstrip().rpartition('\n')
+        if not last.strip()[:1].isalpha():
+            raise ValueError('The distance matrix is incomplete.')
+        matrix = matrix.strip()
+        if not matrix:
+            return np.zeros((0,) if condensed else (0, 0), dtype)
+        # the first line labels the columns of the first block; the first
+        # word of the last line is the index of the last atom
+        labels, _, table = matrix.partition('\n')
+        width = len(labels.split())
+        if not (width and table):
+            raise ValueError('The distance matrix has no rows.')
+        N = int(matrix[matrix.rfind('\n') + 1:].split(None, 1)[0])
+        rows, cols, offdiagonal, index = _layout(N, width)
+        # every distance, in the order printed, converted at once by
+        # numpy, without a str per distance
+        values = np.fromstring(_LABELS.sub(' ', matrix), dtype, sep=' ')
+        if len(values) != len(rows):
+            raise ValueError('Expected {} distances between {} atoms, ' \
+                             'but found {}.'.format(len(rows), N,
+                                                    len(values)))
+        if condensed:
+            distances = np.empty(N*(N - 1)//2, dtype)
+            distances[index] = values[offdiagonal]
+        else:
+            distances = np.empty((N, N), dtype)
+            distances[rows, cols] = values
+            distances[cols, rows] = values
         return distances
     # --------- end helper functions --------- #
 
+    if source not in SOURCES:
+        raise ValueError('{} is not a recognized source. Choose from: ' \
+                         '{}'.format(source, ', '.join(SOURCES)))
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
-    # extract distance matrices
-    start = r'^\s*Distance'
-    stop = r'^\s*[a-zA-Z]'
-    rre = RegexRangeExtractor(start, stop,
-                              include_start=False,
-                              include_stop=False)
-    blocks = rre(ifs)
-    # close file
-    if ifs is not filename:
-        ifs.close()
-    # convert the matrices
-    distances = [parse_matrix(b) for b in blocks]
+    found = None
+    try:
+        # the file is mapped, rather than read, and each matrix is
+        # converted straight from the mapping (or from its sidecar index);
+        # a last matrix cut off, e.g. in the log of a running job, is left
+        # out
+        rre = extractor(source=source)
+        found = rre.iter_blocks(ifs)
+        if source == 'coordinates':
+            blocks = _pairwise(_complete(_geometries(found), _positions),
+                               dtype, condensed)
+        else:
+            blocks = _complete(found, parse_matrix)
+        for distances in blocks:
+            yield distances
+    finally:
+        # end the search before closing the file
+        if found is not None:
+            found.close()
+        # close file
+        if ifs is not filename:
+            ifs.close()
+
+
+@cached
+def get_distance_matrix(filename, aslist=True, dtype=float, condensed=False,
+                        source='matrix'):
+    """
+    Extracts the distance matrix/matrices from a Gaussian log file.
+
+    Parameters
+    ----------
+    :filename, {str|file-like}: filename/filestream from which to
+            extract the distance matrix/matrices.
+
+    Keywords
+    --------
+    :aslist, bool: If True, a list of matrices is returned, even if
+            only one is found. If False and if only one matrix is
+            found, then the matrix is returned as an np.array object.
+            If more than one matrix is found, this keyword has no
+            affect. (Default: True)
+    :dtype, type: type of the distances, e.g. np.float32 to halve their
+            size. (Default: float)
+    :condensed, bool: If True, each matrix is returned as the condensed
+            vector of its N(N-1)/2 distinct distances, the upper triangle
+            row by row (as `scipy.spatial.distance.squareform`), a
+            quarter of the size of a float64 matrix in float32, e.g. for
+            thousands of atoms over many steps. (Default: False)
+    :source, str: If 'coordinates', the distances are computed from the
+            positions of the orientation tables (one geometry per step),
+            rather than read from the distance matrix tables, which are
+            then not read at all. The positions take O(N) text per step,
+            rather than O(N^2); the distances agree with the printed
+            ones to their precision, about 1e-6 Angstroms. The steps are
+            computed in chunks of bounded memory. (Default: 'matrix')
+
+    Returns
+    -------
+    tuple, (N x N distance matrix OR list of matrices, N element symbols).
+    See `aslist` keyword.
+    """
+    distances = list(iter_distance_matrix(filename, dtype=dtype,
+                                          condensed=condensed,
+                                          source=source))
     # return as list or single ndarray?
     if (not aslist) and (len(distances) == 1):
         distances = distances[0]
@@ -1,5 +1,17 @@
 from ...core.extractors import RegexExtractor
+from ...core.cache import cached
+from ...core.streams import open_text
 
+def extractor(**kwds):
+    """
+    Returns the extractor that isolates the lines reporting the
+    alpha/beta electron counts.
+    """
+    regex = r'alpha electrons'
+    return RegexExtractor(regex)
+
+
+@cached
 def get_electron_count(filename, each_step=False):
     """
     Extracts the number of electrons from the Gaussian log
@@ -50,12 +62,11 @@ def get_electron_count(filename, each_step=False):
     # ------------- end helper functions ------------- #
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the relevent lines
-    regex = r'alpha electrons'
-    rre = RegexExtractor(regex)
+    rre = extractor()
     lines = rre(ifs)
     # close file
     if ifs is not filename:
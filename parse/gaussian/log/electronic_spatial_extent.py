@@ -1,5 +1,17 @@
 from ...core.extractors import RegexExtractor
+from ...core.cache import cached
+from ...core.streams import open_text
 
+def extractor(**kwds):
+    """
+    Returns the extractor that isolates the lines reporting the
+    electronic spatial extent.
+    """
+    regex = r'^\s*Electronic spatial extent'
+    return RegexExtractor(regex)
+
+
+@cached
 def get_electronic_spatial_extent(filename, aslist=True):
     """
     Extracts the electronic spatial extent.
@@ -25,12 +37,11 @@ def get_electronic_spatial_extent(filename, aslist=True):
     # ------------- end helper functions ------------- #
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the relevent lines
-    regex = r'^\s*Electronic spatial extent'
-    rre = RegexExtractor(regex)
+    rre = extractor()
     lines = rre(ifs)
     # close file
     if ifs is not filename:
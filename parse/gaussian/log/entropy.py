@@ -1,6 +1,20 @@
 from ...core.extractors import RegexRangeExtractor
+from ...core.cache import cached
+from ...core.streams import open_text
 import re
 
+def extractor(**kwds):
+    """
+    Returns the extractor that isolates the thermochemistry table.
+    """
+    start = r'^\s*E\s+\(Thermal\)'
+    stop  = r'^\s*Vibrational'
+    return RegexRangeExtractor(start, stop,
+                               include_start=True,
+                               include_stop=True)
+
+
+@cached
 def get_entropy(filename):
     """
     Extracts the entropy, in cal/mol-K.
@@ -50,16 +64,12 @@ def get_entropy(filename):
     # ------------- end helper functions ------------- #
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the relevent lines
-    start = r'^\s*E\s+\(Thermal\)'
-    stop  = r'^\s*Vibrational'
-    rre = RegexRangeExtractor(start, stop,
-                              include_start=True,
-                              include_stop=True)
-    block = rre(ifs)[0]
+    rre = extractor()
+    block = rre(ifs, max_matches=1)[0]
     # close file
     if ifs is not filename:
         ifs.close()
@@ -0,0 +1,78 @@
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from io import StringIO
+import time
+
+from ...core.incremental import IncrementalScan
+from .fused import FIELDS, _fields, _region
+
+def follow(filename, fields=None, interval=1., idle=None):
+    """
+    Follows a Gaussian log file as it is written, e.g. by a running
+    optimization, and generates the values of the fields found in each
+    section as soon as the section is complete on disk.
+
+    The file is polled every `interval` seconds, and each poll reads
+    only what was appended since the last (see `IncrementalScan`). A
+    section cut off at the end of the file is held over until it is
+    complete. If the file shrinks, e.g. a job is restarted over it, it
+    is followed again from the beginning.
+
+    Example:
+
+    ```
+    for values in follow('job.log', ['scf_energy', 'atom_positions']):
+        print(values.get('scf_energy'))
+    ```
+
+    Parameters
+    ----------
+    :filename, str: name of the log file. It need not exist yet.
+
+    Keywords
+    --------
+    :fields, list: fields to follow. See `parse_all`.
+            (Default: every field in `FIELDS`)
+    :interval, float: seconds between polls. (Default: 1)
+    :idle, float: stop once the file has not grown for this many
+            seconds, e.g. after the job has ended. (Default: None,
+            follow forever)
+
+    Returns
+    -------
+    Generator of dicts, field name --> value returned by the field's
+    getter for the sections completed since the last dict, e.g. the
+    list of new SCF energies. Only fields with new sections are present.
+    """
+    # one region extractor per distinct section (see `scan`)
+    extractors = []
+    sections = {}
+    requests = []
+    for name, kwds in _fields(fields):
+        rre = FIELDS[name][0](**kwds)
+        if rre.signature not in sections:
+            sections[rre.signature] = len(extractors)
+            extractors.append(_region(rre))
+        requests.append((name, kwds, sections[rre.signature]))
+    scan = IncrementalScan(extractors)
+    last_growth = time.time()
+    while True:
+        offset = scan.offset
+        try:
+            blocks = scan.update(filename)
+        except (IOError, OSError):
+            # e.g. the job has not yet created the file
+            blocks = [[] for rre in extractors]
+        if scan.offset != offset:
+            last_growth = time.time()
+        values = {}
+        for name, kwds, i in requests:
+            if blocks[i]:
+                getter = FIELDS[name][1]
+                values[name] = getter(StringIO(''.join(blocks[i])), **kwds)
+        if values:
+            yield values
+        if (idle is not None) and (time.time() - last_growth >= idle):
+            return
+        time.sleep(interval)
@@ -0,0 +1,306 @@
+from __future__ import print_function
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from io import StringIO
+import copy
+
+from ...core.buffers import Searched, searchable
+from ...core.extractors import MultiRegexRangeExtractor
+from ...core.incremental import IncrementalScan
+from ...core.index import write_index
+from ...core.streams import compression, open_text
+
+from . import apt_charges
+from . import atom_count
+from . import atomic_numbers
+from . import atom_positions
+from . import cavity_surface_area
+from . import cavity_volume
+from . import dipole
+from . import dipole_moment
+from . import distance_matrix
+from . import electron_count
+from . import electronic_spatial_extent
+from . import entropy
+from . import heat_capacity
+from . import homo
+from . import internal_energy
+from . import isotropic_polarizability
+from . import jobs
+from . import lumo
+from . import molecular_mass
+from . import mulliken_charges
+from . import pcm_nonelectrostatic_energy
+from . import polarizability
+from . import rotational_constants
+from . import scf_energy
+from . import smd_cds_energy
+from . import spectroscopy
+from . import zpe
+
+# field name --> (extractor factory, getter)
+FIELDS = {
+    'apt_charges' : (apt_charges.extractor,
+                     apt_charges.get_apt_charges),
+    'atom_count' : (atom_count.extractor,
+                    atom_count.get_atom_count),
+    'atomic_numbers' : (atomic_numbers.extractor,
+                        atomic_numbers.get_atomic_numbers),
+    'atom_positions' : (atom_positions.extractor,
+                        atom_positions.get_atom_positions),
+    'cavity_surface_area' : (cavity_surface_area.extractor,
+                             cavity_surface_area.get_cavity_surface_area),
+    'cavity_volume' : (cavity_volume.extractor,
+                       cavity_volume.get_cavity_volume),
+    'dipole' : (dipole.extractor,
+                dipole.get_dipole),
+    'dipole_moment' : (dipole_moment.extractor,
+                       dipole_moment.get_dipole_moment),
+    'distance_matrix' : (distance_matrix.extractor,
+                         distance_matrix.get_distance_matrix),
+    'electron_count' : (electron_count.extractor,
+                        electron_count.get_electron_count),
+    'electronic_spatial_extent' : (
+        electronic_spatial_extent.extractor,
+        electronic_spatial_extent.get_electronic_spatial_extent),
+    'entropy' : (entropy.extractor,
+                 entropy.get_entropy),
+    'heat_capacity' : (heat_capacity.extractor,
+                       heat_capacity.get_heat_capacity),
+    'HOMO' : (homo.extractor,
+              homo.get_HOMO),
+    'internal_energy' : (internal_energy.extractor,
+                         internal_energy.get_internal_energy),
+    'isotropic_polarizability' : (
+        isotropic_polarizability.extractor,
+        isotropic_polarizability.get_isotropic_polarizability),
+    'LUMO' : (lumo.extractor,
+              lumo.get_LUMO),
+    'molecular_mass' : (molecular_mass.extractor,
+                        molecular_mass.get_molecular_mass),
+    'mulliken_charges' : (mulliken_charges.extractor,
+                          mulliken_charges.get_mulliken_charges),
+    'pcm_nonelectrostatic_energy' : (
+        pcm_nonelectrostatic_energy.extractor,
+        pcm_nonelectrostatic_energy.get_pcm_nonelectrostatic_energy),
+    'polarizability' : (polarizability.extractor,
+                        polarizability.get_polarizability),
+    'rotational_constants' : (rotational_constants.extractor,
+                              rotational_constants.get_rotational_constants),
+    'scf_energy' : (scf_energy.extractor,
+                    scf_energy.get_scf_energy),
+    'SMD_CDS_energy' : (smd_cds_energy.extractor,
+                        smd_cds_energy.get_SMD_CDS_energy),
+    'spectroscopic_data' : (spectroscopy.extractor,
+                            spectroscopy.get_spectroscopic_data),
+    'ZPE' : (zpe.extractor,
+             zpe.get_ZPE)
+}
+
+# getter keywords that select a different section of the log
+VARIANTS = {
+    'apt_charges' : [{}, {'hydrogen_summed_into_heavy_atoms' : True}],
+    'distance_matrix' : [{}, {'source' : 'coordinates'}],
+    'mulliken_charges' : [{}, {'hydrogen_summed_into_heavy_atoms' : True}]
+}
+
+
+def _region(rre):
+    """
+    Copy of `rre` that keeps the start and stop lines, so that the
+    region it captures can be passed back through `rre` unchanged.
+    """
+    rval = copy.copy(rre)
+    rval.include_start = True
+    rval.include_stop = True
+    rval.reset()
+    return rval
+
+
+def index_log(filename):
+    """
+    Indexes the sections of a Gaussian log file read by every field in
+    `FIELDS`, and the starts of its jobs (see `index_jobs`), in a single
+    pass, and saves their offsets in a sidecar file next to the log (see
+    `parse.core.index`). Until the log is modified, the `get_*` functions
+    and `parse_all` then slice their sections straight from the file,
+    rather than searching it.
+
+    Parameters
+    ----------
+    :filename, str: name of the log file.
+
+    Returns
+    -------
+    str, name of the sidecar file.
+    """
+    extractors = []
+    for name, (make_extractor, getter) in FIELDS.items():
+        for kwds in VARIANTS.get(name, [{}]):
+            rre = make_extractor(**kwds)
+            extractors.extend([rre, _region(rre)])
+    extractors.extend(jobs.extractors())
+    return write_index(filename, extractors)
+
+
+def _fields(fields):
+    """
+    Returns the (name, getter keywords) of each field in `fields` (see
+    `parse_all`), after checking that each is a recognized field.
+    """
+    if fields is None:
+        fields = sorted(FIELDS)
+    rval = []
+    for field in fields:
+        if isinstance(field, str):
+            name, kwds = field, {}
+        else:
+            name, kwds = field
+        if name not in FIELDS:
+            raise KeyError('{} is not a recognized field. Choose from: ' \
+                           '{}'.format(name, ', '.join(sorted(FIELDS))))
+        rval.append((name, kwds))
+    return rval
+
+
+def scan(filename, fields=None, state=None, workers=None):
+    """
+    Reads the sections of a Gaussian log file from which several fields
+    are extracted, in a single pass. This is the first half of
+    `parse_all`, for callers that convert the fields later, or only
+    some of them: the value of a field is its getter applied to its
+    section, e.g. `get_entropy(StringIO(sections['entropy']))`.
+
+    Parameters
+    ----------
+    :filename, {str|file-like}: filename/filestream to parse.
+
+    Keywords
+    --------
+    :fields, list: fields to read. See `parse_all`.
+            (Default: every field in `FIELDS`)
+    :state, str: file in which the state of the scan is kept between
+            calls. See `parse_all`. (Default: None)
+    :workers, int: search a large log in parallel. See `parse_all`.
+            (Default: None)
+
+    Returns
+    -------
+    dict, field name --> text of the section(s) the field is read from.
+    """
+    # one region extractor per distinct section; fields that read the
+    # same section (e.g. entropy and heat capacity) share it
+    requests = []
+    sections = {}
+    for name, kwds in _fields(fields):
+        rre = FIELDS[name][0](**kwds)
+        if rre.signature not in sections:
+            sections[rre.signature] = (_region(rre), [])
+        requests.append((name, rre.signature))
+    signatures = sorted(sections.keys())
+    regions = [sections[k][0] for k in signatures]
+    if (state is not None) and isinstance(filename, str) and \
+       (compression(filename) is None):
+        # carry on from where the last call left off
+        incremental = IncrementalScan(regions, keep=True)
+        incremental.load(state)
+        incremental.update(filename)
+        incremental.save(state)
+        found = incremental.blocks
+    else:
+        # open the file, if a string
+        if isinstance(filename, str):
+            ifs = open_text(filename)
+        else:
+            ifs = filename
+        # a single pass through the file
+        found = MultiRegexRangeExtractor(regions)(ifs, workers=workers)
+        # close file
+        if ifs is not filename:
+            ifs.close()
+    for signature, blocks in zip(signatures, found):
+        sections[signature][1].extend(blocks)
+    return dict((name, ''.join(sections[signature][1])) \
+                for name, signature in requests)
+
+
+def parse_all(filename, fields=None, state=None, workers=None):
+    """
+    Extracts several fields from a Gaussian log file in a single pass.
+
+    The extractors of the requested fields are combined into a single
+    MultiRegexRangeExtractor, which finds the blocks of every field in
+    one pass through the file. Each getter is then handed the file
+    together with the blocks already found for it (see
+    `parse.core.buffers.Searched`), which it converts without searching
+    the file again, so the values are identical to those returned by
+    calling the getters one at a time, but the file is only read once.
+
+    Parameters
+    ----------
+    :filename, {str|file-like}: filename/filestream to parse.
+
+    Keywords
+    --------
+    :fields, list: fields to extract, named as the getter without the
+            leading "get_", e.g. 'scf_energy' or 'HOMO'. An entry may
+            also be a (name, dict) tuple, where the dict holds keywords
+            for the getter, e.g.
+            ('mulliken_charges', {'hydrogen_summed_into_heavy_atoms': True})
+            (Default: every field in `FIELDS`)
+    :state, str: file in which to keep the state of the scan (see
+            `IncrementalScan`) between calls, e.g. "job.log.state". A
+            later call with the same state and fields only reads what
+            has been appended to the log since, provided the log still
+            holds what was read before; otherwise, the log is read from
+            the beginning. A section cut off at the end of the log is
+            left out until it is complete. Compressed logs are always
+            read in full. (Default: None, read the whole log)
+    :workers, int: split a large, uncompressed log, e.g. a BOMD run of
+            several GB, into chunks searched by this many processes (see
+            `parse.core.parallel`). The values are the same as those of
+            a serial search. (Default: None, search in this process)
+
+    Returns
+    -------
+    dict, field name --> value returned by the field's getter.
+    """
+    fields = _fields(fields)
+    if state is not None:
+        # carry on from where the last call left off: the sections read
+        # so far are kept as text
+        sections = scan(filename, fields, state=state, workers=workers)
+        return dict((name, FIELDS[name][1](StringIO(sections[name]), **kwds)) \
+                    for name, kwds in fields)
+    # one extractor per distinct section; fields that read the same
+    # section (e.g. entropy and heat capacity) share it
+    extractors = {}
+    for name, kwds in fields:
+        rre = FIELDS[name][0](**kwds)
+        extractors.setdefault(rre.signature, rre)
+    signatures = sorted(extractors.keys())
+    multi = MultiRegexRangeExtractor([extractors[k] for k in signatures])
+    # open the file, if a string
+    if isinstance(filename, str):
+        ifs = open_text(filename)
+    else:
+        ifs = filename
+    try:
+        with searchable(ifs) as (buf, pos):
+            if buf is None:
+                # a stream that can only be read forwards
+                buf, pos = ifs.read(), 0
+            # a single pass through the file...
+            found = dict(zip(signatures, multi._search(ifs, buf, pos,
+                                                       workers)))
+            # ...and each field converted from the blocks found for it
+            rval = {}
+            for name, kwds in fields:
+                getter = FIELDS[name][1]
+                rval[name] = getter(Searched(buf, found, pos), **kwds)
+    finally:
+        # close file
+        if ifs is not filename:
+            ifs.close()
+    return rval
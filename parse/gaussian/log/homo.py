@@ -1,5 +1,21 @@
 from ...core.extractors import RegexRangeExtractor
+from ...core.cache import cached
+from ...core.streams import open_text
+from ...core.fortran import read_fixed
 
+def extractor(**kwds):
+    """
+    Returns the extractor that isolates the occupied (alpha)
+    eigenvalues.
+    """
+    start = r'^\s*Alpha\s+occ\.\s+eigenvalues'
+    stop  = r'^\s*Alpha\s+virt\.\s+eigenvalues'
+    return RegexRangeExtractor(start, stop,
+                               include_start=True,
+                               include_stop=False)
+
+
+@cached
 def get_HOMO(filename, aslist=True):
 #def get_data(filename, aslist=True):
     """
@@ -22,24 +38,19 @@ def get_HOMO(filename, aslist=True):
         """
         Parse the lines to get the data.
         """
-        lines = lines.strip().split('\n')
-        eigenvalues = []
-        for line in lines:
-            label, values = line.split('--')
-            eigenvalues.extend([float(x) for x in values.split()])
-        return eigenvalues[-1]
+        # F10.5 after the label ("... eigenvalues -- "), so
+        # that values that run together, e.g.
+        # -100.23456-100.23400, are split
+        eigenvalues = read_fixed(lines, 10, label='-- ')
+        return float(eigenvalues[-1])
     # ------------- end helper functions ------------- #
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the relevent lines
-    start = r'^\s*Alpha\s+occ\.\s+eigenvalues'
-    stop  = r'^\s*Alpha\s+virt\.\s+eigenvalues'
-    rre = RegexRangeExtractor(start, stop,
-                              include_start=True,
-                              include_stop=False)
+    rre = extractor()
     blocks = rre(ifs)
     # close file
     if ifs is not filename:
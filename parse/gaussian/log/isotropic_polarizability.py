@@ -1,5 +1,17 @@
 from ...core.extractors import RegexExtractor
+from ...core.cache import cached
+from ...core.streams import open_text
 
+def extractor(**kwds):
+    """
+    Returns the extractor that isolates the line reporting the isotropic
+    polarizability.
+    """
+    regex = r'^\s*Isotropic polarizability for W='
+    return RegexExtractor(regex)
+
+
+@cached
 def get_isotropic_polarizability(filename):
 #def get_data(filename, aslist=True):
     """
@@ -16,13 +28,12 @@ def get_isotropic_polarizability(filename):
     # ------------- end helper functions ------------- #
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the relevent lines
-    regex = r'^\s*Isotropic polarizability for W='
-    rre = RegexExtractor(regex)
-    line = rre(ifs)[0]
+    rre = extractor()
+    line = rre(ifs, max_matches=1)[0]
     # close file
     if ifs is not filename:
         ifs.close()
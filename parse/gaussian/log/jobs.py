@@ -0,0 +1,103 @@
+from ...core.extractors import RegexExtractor
+from ...core.buffers import searchable, span_text
+from ...core.streams import open_text
+import re
+
+# the first line of each job: of each run, and of each later step of a
+# run, e.g. the frequencies of an opt+freq (--Link1--) calculation
+STARTS = (r'^\s*Entering Gaussian System',
+          r'^\s*Link1:\s+Proceeding to internal job step')
+
+def extractors(**kwds):
+    """
+    Returns the extractors that isolate the line that starts each job,
+    one per line in `STARTS`.
+    """
+    return [RegexExtractor(start) for start in STARTS]
+
+
+def _job_spans(ifs, buf, pos):
+    """
+    Returns the (begin, end) offsets of each job in `buf`, the contents of
+    `ifs` (see `parse.core.buffers.searchable`).
+    """
+    starts = []
+    for rre in extractors():
+        spans = rre._indexed_spans(ifs, buf, pos)
+        if spans is None:
+            spans = rre.spans(buf, pos)
+        starts.extend([begin for begin, end in spans])
+    nonblank = re.compile(r'\S' if isinstance(buf, str) else br'\S')
+    if not nonblank.search(buf, pos):
+        return []
+    # anything before the first start, e.g. the header of a batch
+    # script, is part of the first job
+    bounds = [pos] + sorted(starts)[1:] + [len(buf)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def index_jobs(filename):
+    """
+    Splits a Gaussian log file that holds several jobs, e.g. the
+    optimization and frequency steps of an opt+freq calculation, into one
+    segment per job. Each job starts with the banner of its run
+    ("Entering Gaussian System"), or, for a later step of the same run,
+    with its "Link1:  Proceeding to internal job step" line, and runs to
+    the start of the next; a job still running is the last segment. The
+    starts are read from the sidecar index, if the log is indexed (see
+    `index_log`).
+
+    Parameters
+    ----------
+    :filename, {str|file-like}: filename/filestream to parse.
+
+    Returns
+    -------
+    list of (begin, end) offsets of each job: bytes of a regular file, or
+    characters of the text of a compressed file or StringIO.
+    """
+    # open the file, if a string
+    if isinstance(filename, str):
+        ifs = open_text(filename)
+    else:
+        ifs = filename
+    with searchable(ifs) as (buf, pos):
+        if buf is None:
+            # a stream that can only be read forwards
+            buf, pos = ifs.read(), 0
+        rval = _job_spans(ifs, buf, pos)
+    # close file
+    if ifs is not filename:
+        ifs.close()
+    return rval
+
+
+def read_job(filename, job):
+    """
+    Reads the text of a single job of a Gaussian log file (see
+    `index_jobs`), which can be passed to any getter, e.g.
+    `get_entropy(StringIO(read_job('opt+freq.log', 1)))`.
+
+    Parameters
+    ----------
+    :filename, {str|file-like}: filename/filestream to parse.
+    :job, int: index of the job, e.g. 0 for the first, -1 for the last.
+
+    Returns
+    -------
+    str, text of the job.
+    """
+    # open the file, if a string
+    if isinstance(filename, str):
+        ifs = open_text(filename)
+    else:
+        ifs = filename
+    with searchable(ifs) as (buf, pos):
+        if buf is None:
+            buf, pos = ifs.read(), 0
+        begin, end = _job_spans(ifs, buf, pos)[job]
+        rval = span_text(buf, begin, end)
+    # close file
+    if ifs is not filename:
+        ifs.close()
+    return rval
@@ -0,0 +1,81 @@
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+from .fused import FIELDS, _fields, scan
+
+class GaussianLog(object):
+    def __init__(self, filename, fields=None):
+        """
+        A Gaussian log file whose fields are read on demand.
+
+        The first field that is accessed reads the sections of every
+        field in `fields` in a single pass (see `scan`), so the file is
+        read, or memory-mapped, only once. Each field is converted from
+        its section the first time it is accessed, and remembered, so
+        later accesses do no I/O. Fields are attributes, named as the
+        getter without the leading "get_", in lower case, e.g.
+
+        ```
+        log = GaussianLog('job.log')
+        log.scf_energy      # reads the file
+        log.homo            # converted from the sections already read
+        log.atom_positions
+        ```
+
+        or items, named as in `FIELDS`, e.g. `log['HOMO']`.
+
+        Parameters
+        ----------
+        :filename, {str|file-like}: filename/filestream to parse.
+
+        Keywords
+        --------
+        :fields, list: fields read by the first pass, optionally with
+                keywords for their getters. See `parse_all`. A field that
+                is not in this list is read, when accessed, in a pass of
+                its own. (Default: every field in `FIELDS`)
+        """
+        self.filename = filename
+        self._kwds = dict(_fields(fields))
+        self._sections = None
+        self._values = {}
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.filename)
+
+    def __getitem__(self, name):
+        if name not in self._values:
+            if self._sections is None:
+                fields = list(self._kwds.items())
+                self._sections = scan(self.filename, fields)
+            if name not in self._sections:
+                self._kwds.update(_fields([name]))
+                self._sections.update(scan(self.filename, [name]))
+            getter = FIELDS[name][1]
+            kwds = self._kwds[name]
+            self._values[name] = getter(StringIO(self._sections[name]),
+                                        **kwds)
+        return self._values[name]
+
+    def clear(self):
+        """
+        Forgets the sections and values read so far, e.g. after the file
+        has changed, so that the next access reads the file again.
+        """
+        self._sections = None
+        self._values = {}
+
+
+def _field(name):
+    """
+    Returns the property through which field `name` is accessed.
+    """
+    def fget(self):
+        return self[name]
+    getter = FIELDS[name][1]
+    return property(fget, doc=getter.__doc__)
+
+for _name in FIELDS:
+    setattr(GaussianLog, _name.lower(), _field(_name))
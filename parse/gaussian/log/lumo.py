@@ -1,5 +1,20 @@
 from ...core.extractors import RegexRangeExtractor
+from ...core.cache import cached
+from ...core.streams import open_text
+from ...core.fortran import read_fixed
 
+def extractor(**kwds):
+    """
+    Returns the extractor that isolates the virtual (alpha) eigenvalues.
+    """
+    regex = r'^\s*Alpha\s+virt\.\s+eigenvalues'
+    return RegexRangeExtractor(regex, regex,
+                               reverse_stop=True,
+                               include_start=True,
+                               include_stop=False)
+
+
+@cached
 def get_LUMO(filename, aslist=True):
 #def get_data(filename, aslist=True):
     """
@@ -22,24 +37,19 @@ def get_LUMO(filename, aslist=True):
         """
         Parse the lines to get the empty eigenvalues.
         """
-        lines = lines.strip().split('\n')
-        eigenvalues = []
-        for line in lines:
-            label, values = line.split('--')
-            eigenvalues.extend([float(x) for x in values.split()])
-        return eigenvalues[0]
+        # F10.5 after the label ("... eigenvalues -- "), so
+        # that values that run together, e.g.
+        # -100.23456-100.23400, are split
+        eigenvalues = read_fixed(lines, 10, label='-- ')
+        return float(eigenvalues[0])
     # ------------- end helper functions ------------- #
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the relevent lines
-    regex = r'^\s*Alpha\s+virt\.\s+eigenvalues'
-    rre = RegexRangeExtractor(regex, regex,
-                              reverse_stop=True,
-                              include_start=True,
-                              include_stop=False)
+    rre = extractor()
     blocks = rre(ifs)
     # close file
     if ifs is not filename:
@@ -1,5 +1,17 @@
 from ...core.extractors import RegexExtractor
+from ...core.cache import cached
+from ...core.streams import open_text
 
+def extractor(**kwds):
+    """
+    Returns the extractor that isolates the line reporting the molecular
+    mass.
+    """
+    regex = r'^\s*Molecular mass:'
+    return RegexExtractor(regex)
+
+
+@cached
 def get_molecular_mass(filename):
     """
     Extracts the dipoles (output for each step)
@@ -20,13 +32,12 @@ def get_molecular_mass(filename):
 
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the polarizability
-    regex = r'^\s*Molecular mass:'
-    rre = RegexExtractor(regex)
-    lines = rre(ifs)
+    rre = extractor()
+    lines = rre(ifs, max_matches=1)
     # close file
     if ifs is not filename:
         ifs.close()
@@ -1,9 +1,28 @@
 from ...core.extractors import RegexRangeExtractor
-import numpy as np
+from ...core.cache import cached
+from ...core.streams import open_text
+from ...core.tables import read_table
 
+def extractor(hydrogen_summed_into_heavy_atoms=False, **kwds):
+    """
+    Returns the extractor that isolates the table of Mulliken charges.
+    """
+    if hydrogen_summed_into_heavy_atoms:
+        start = r'^\s*Mulliken charges with hydrogens summed into heavy atoms:'
+        stop  = r'^\s*(Electronic spatial extent)|(APT charges:)'
+    else:
+        start = r'^\s*Mulliken charges:'
+        stop  = r'^\s*Sum of Mulliken charges'
+    return RegexRangeExtractor(start, stop,
+                               include_start=False,
+                               include_stop=False)
+
+
+@cached
 def get_mulliken_charges(filename,
                          hydrogen_summed_into_heavy_atoms=False,
-                         aslist=True):
+                         aslist=True,
+                         last=False):
     """
     Get the per-atom Mulliken charges.
 
@@ -15,6 +34,10 @@ def get_mulliken_charges(filename,
             only one is found. If False and if only one array is
             found, then the array is returned. If more than one
             value is found, this keyword has no affect. (Default: True)
+    :last, bool: If True, only the charges of the final step are read,
+            searching back from the end of the file, and returned on its
+            own (None, if there is none). This overrides `aslist`.
+            (Default: False)
 
     Returns
     -------
@@ -34,39 +57,29 @@ def get_mulliken_charges(filename,
              ...
              N sym  \d+'
         """
-        lines = block.strip().splitlines()
-        indices = []
-        symbols = []
-        charges = []
-        for line in lines[1:]:
-            words = line.split()
-            indices.append(int(words[0]))
-            symbols.append(words[1])
-            charges.append(float(words[2]))
-        return (np.array(indices), np.array(symbols), np.array(charges))
+        # skip the column header
+        return read_table(block.strip(), (int, str, float), skip=1)
     # ------------- end helper functions ------------- #
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the relevent lines
-    if hydrogen_summed_into_heavy_atoms:
-        start = r'^\s*Mulliken charges with hydrogens summed into heavy atoms:'
-        stop  = r'^\s*(Electronic spatial extent)|(APT charges:)'
+    rre = extractor(hydrogen_summed_into_heavy_atoms)
+    if last:
+        # search back from the end of the file for the final step
+        blocks = rre(ifs, from_end=True, max_matches=1)
     else:
-        start = r'^\s*Mulliken charges:'
-        stop  = r'^\s*Sum of Mulliken charges'
-    rre = RegexRangeExtractor(start, stop,
-                              include_start=False,
-                              include_stop=False)
-    blocks = rre(ifs)
+        blocks = rre(ifs)
     # close file
     if ifs is not filename:
         ifs.close()
     # parse data
     #+ multiple values/file
     rval = [parse_data(b) for b in blocks]
+    if last:
+        return rval[0] if rval else None
     if (not aslist) and (len(rval) == 1):
        rval = rval[0]
     return rval
@@ -1,6 +1,20 @@
 from ...core.extractors import RegexRangeExtractor
-import re
+from ...core.cache import cached
+from ...core.fortran import read_fixed
+from ...core.streams import open_text
 
+def extractor(**kwds):
+    """
+    Returns the extractor that isolates the polarizability lines.
+    """
+    start = r'^\s*Polarizability='
+    end   = r'.*'
+    return RegexRangeExtractor(start, end,
+                               include_start=True,
+                               include_stop=True)
+
+
+@cached
 def get_polarizability(filename):
     """
     Extracts the polarizability from a Gaussian log file.
@@ -22,35 +36,21 @@ def get_polarizability(filename):
         # Expected format:
         # "Polarizability= % 10.8D+2%10.8D+2%10.8D+2\n"
         # "                % 10.8D+2%10.8D+2%10.8D+2\n"
-        lines = lines.splitlines()
-        # drop "Polarizability="
-        lines[0] = lines[0].split('=')[1]
-        alpha = []
-        for line in lines:
-            # the Gaussian file is not careful to separate
-            # the numbers, so we must assume that the number
-            # format is fixed.
-            num = re.split('([^D]+D\+..)', line)
-            # cast these as floats -- must first replace
-            # D with E.
-            num = [float(v.replace('D', 'E')) \
-                   for v in num if v]
-            alpha.extend(num)
-        return tuple(alpha)
+        # the Gaussian file is not careful to separate
+        # the numbers, so they are read by their fixed
+        # width (D15.8) after "Polarizability=", and at
+        # the same column on the continuation line.
+        return tuple(read_fixed(lines, 15, label='=').tolist())
     # ------------- end helper functions ------------- #
 
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the polarizability
-    start = r'^\s*Polarizability='
-    end   = r'.*'
-    rre = RegexRangeExtractor(start, end,
-                              include_start=True,
-                              include_stop=True)
-    lines = rre(ifs)[0]
+    rre = extractor()
+    lines = rre(ifs, max_matches=1)[0]
     # close file
     if ifs is not filename:
         ifs.close()
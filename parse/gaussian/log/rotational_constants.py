@@ -1,7 +1,19 @@
 from ...core.extractors import RegexExtractor
+from ...core.cache import cached
+from ...core.streams import open_text
 import numpy as np
 
-def get_rotational_constants(filename, aslist=True):
+def extractor(**kwds):
+    """
+    Returns the extractor that isolates the lines reporting the
+    rotational constants.
+    """
+    regex = r'^\s*Rotational constants'
+    return RegexExtractor(regex)
+
+
+@cached
+def get_rotational_constants(filename, aslist=True, last=False):
     """
     Extracts the rotational constants from a Gaussian log file.
 
@@ -17,6 +29,10 @@ def get_rotational_constants(filename, aslist=True):
             found, then the matrix is returned as an np.array object.
             If more than one matrix is found, this keyword has no
             affect. (Default: True)
+    :last, bool: If True, only the rotational constants of the final step
+            are read, searching back from the end of the file, and
+            returned on their own (None, if there are none). This
+            overrides `aslist`. (Default: False)
 
     Returns
     -------
@@ -39,19 +55,24 @@ def get_rotational_constants(filename, aslist=True):
 
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract distance matrices
-    regex = r'^\s*Rotational constants'
-    rre = RegexExtractor(regex)
-    lines = rre(ifs)
+    rre = extractor()
+    if last:
+        # search back from the end of the file for the final step
+        lines = rre(ifs, from_end=True, max_matches=1)
+    else:
+        lines = rre(ifs)
     # close file
     if ifs is not filename:
         ifs.close()
     # convert the matrices
     rotational_constants = [parse_vector(l) for l in lines]
     # return as list or single ndarray?
+    if last:
+        return rotational_constants[0] if rotational_constants else None
     if (not aslist) and (len(rotational_constants) == 1):
         rotational_constants = rotational_constants[0]
     return rotational_constants
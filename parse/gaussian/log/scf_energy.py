@@ -1,19 +1,29 @@
 from ...core.extractors import RegexExtractor
+from ...core.cache import cached
+from ...core.streams import open_text
 
-def get_scf_energy(filename, aslist=True):
+def extractor(**kwds):
     """
-    Get the self-consistant field (SCF) energy for each step, in kcal/mol.
+    Returns the extractor that isolates the lines reporting the SCF
+    energy.
+    """
+    regex = r'^\s*SCF Done:'
+    return RegexExtractor(regex)
+
+
+def iter_scf_energy(filename, from_end=False):
+    """
+    Generates the self-consistant field (SCF) energy of each step as
+    it is read.
 
     Keywords
     --------
-    :aslist, bool: If True, a list of values is returned, even if
-            only one is found. If False and if only one value is
-            found, then the value is returned. If more than one
-            value is found, this keyword has no affect. (Default: True)
+    :from_end, bool: generate the energies from the last step to the
+            first, reading back from the end of the file. (Default: False)
 
     Returns
     -------
-    SCF energies (list of floats). See `aslist` keyword.
+    Generator of SCF energies (floats).
     """
     # --------------- helper functions --------------- #
     def parse_data(line):
@@ -31,19 +41,47 @@ def get_scf_energy(filename, aslist=True):
     # ------------- end helper functions ------------- #
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
-    # extract the relevent lines
-    regex = r'^\s*SCF Done:'
-    rre = RegexExtractor(regex)
-    lines = rre(ifs)
-    # close file
-    if ifs is not filename:
-        ifs.close()
-    # parse data
-    #+ multiple values/file
-    rval = [parse_data(l) for l in lines]
+    try:
+        # extract the relevent lines
+        rre = extractor()
+        for line in rre.iter_blocks(ifs, from_end=from_end):
+            yield parse_data(line)
+    finally:
+        # close file
+        if ifs is not filename:
+            ifs.close()
+
+
+@cached
+def get_scf_energy(filename, aslist=True, last=False):
+    """
+    Get the self-consistant field (SCF) energy for each step, in kcal/mol.
+
+    Keywords
+    --------
+    :aslist, bool: If True, a list of values is returned, even if
+            only one is found. If False and if only one value is
+            found, then the value is returned. If more than one
+            value is found, this keyword has no affect. (Default: True)
+    :last, bool: If True, only the energy of the final step is read,
+            searching back from the end of the file, and returned as a
+            float (None, if there is none). This overrides `aslist`.
+            (Default: False)
+
+    Returns
+    -------
+    SCF energies (list of floats). See `aslist` keyword.
+    """
+    if last:
+        energies = iter_scf_energy(filename, from_end=True)
+        try:
+            return next(energies, None)
+        finally:
+            energies.close()
+    rval = list(iter_scf_energy(filename))
     if (not aslist) and (len(rval) == 1):
        rval = rval[0]
     return rval
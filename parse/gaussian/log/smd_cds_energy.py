@@ -1,5 +1,17 @@
 from ...core.extractors import RegexExtractor
+from ...core.cache import cached
+from ...core.streams import open_text
 
+def extractor(**kwds):
+    """
+    Returns the extractor that isolates the lines reporting the SMD-CDS
+    energy.
+    """
+    regex = r'^\s*SMD-CDS \(non-electrostatic\) energy'
+    return RegexExtractor(regex)
+
+
+@cached
 def get_SMD_CDS_energy(filename, aslist=True):
     """
     Extracts the SMD-CDS (non-electrostatic) energy from the
@@ -22,12 +34,11 @@ def get_SMD_CDS_energy(filename, aslist=True):
     # ------------- end helper functions ------------- #
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the polarizability
-    regex = r'^\s*SMD-CDS \(non-electrostatic\) energy'
-    rre = RegexExtractor(regex)
+    rre = extractor()
     lines = rre(ifs)
     # close file
     if ifs is not filename:
@@ -1,7 +1,21 @@
 from ...core.extractors import RegexRangeExtractor
+from ...core.cache import cached
+from ...core.streams import open_text
 import numpy as np
 import re
 
+def extractor(**kwds):
+    """
+    Returns the extractor that isolates the frequency tables.
+    """
+    start = r'^\s*Frequencies'
+    stop  = r'^\s*IR Inten'
+    return RegexRangeExtractor(start, stop,
+                               include_start=True,
+                               include_stop=True)
+
+
+@cached
 def get_spectroscopic_data(filename):
     """
     Extract the spectroscopic data.
@@ -45,15 +59,11 @@ def get_spectroscopic_data(filename):
     # ------------- end helper functions ------------- #
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the relevent lines
-    start = r'^\s*Frequencies'
-    stop  = r'^\s*IR Inten'
-    rre = RegexRangeExtractor(start, stop,
-                              include_start=True,
-                              include_stop=True)
+    rre = extractor()
     blocks = rre(ifs)
     # close file
     if ifs is not filename:
@@ -1,5 +1,17 @@
 from ...core.extractors import RegexExtractor
+from ...core.cache import cached
+from ...core.streams import open_text
 
+def extractor(**kwds):
+    """
+    Returns the extractor that isolates the line reporting the zero-
+    point vibrational energy.
+    """
+    regex = r'^\s*Zero-point vibrational energy'
+    return RegexExtractor(regex)
+
+
+@cached
 def get_ZPE(filename):
     """
     Extracts the zero-point vibrational energy, in J/mol.
@@ -19,13 +31,12 @@ def get_ZPE(filename):
     # ------------- end helper functions ------------- #
     # open the file, if a string
     if isinstance(filename, str):
-        ifs = open(filename, 'r')
+        ifs = open_text(filename)
     else:
         ifs = filename
     # extract the relevent lines
-    regex = r'^\s*Zero-point vibrational energy'
-    rre = RegexExtractor(regex)
-    line = rre(ifs)[0]
+    rre = extractor()
+    line = rre(ifs, max_matches=1)[0]
     # close file
     if ifs is not filename:
         ifs.close()
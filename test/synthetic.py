@@ -0,0 +1,188 @@
+"""
+Small synthetic Gaussian logs, and a temporary directory to write them to,
+so that the tests run without the logs in data/.
+"""
+from __future__ import print_function
+import os
+import shutil
+import tempfile
+import numpy as np
+
+ELEMENTS = ('C', 'N', 'H', 'O')
+NUMBERS = {'C' : 6, 'N' : 7, 'H' : 1, 'O' : 8}
+RULE = ' ' + 69*'-' + '\n'
+
+def orientation(title, symbols, positions):
+    """
+    Writes an "Input orientation" or "Standard orientation" table.
+    """
+    lines = [26*' ' + title + ' orientation:\n', RULE,
+             ' Center     Atomic      Atomic             '
+             'Coordinates (Angstroms)\n',
+             ' Number     Number       Type             '
+             'X           Y           Z\n', RULE]
+    for i, (symbol, (x, y, z)) in enumerate(zip(symbols, positions)):
+        lines.append(' {:6d} {:10d} {:11d} {:15.6f} {:11.6f} {:11.6f}\n' \
+                     .format(i + 1, NUMBERS[symbol], 0, x, y, z))
+    lines.append(RULE)
+    return ''.join(lines)
+
+
+def distance_matrix(symbols, matrix, width=5):
+    """
+    Writes the lower triangle of a distance matrix, `width` columns at a
+    time.
+    """
+    N = len(symbols)
+    lines = [20*' ' + 'Distance matrix (angstroms):\n']
+    for first in range(0, N, width):
+        columns = range(first, min(first + width, N))
+        lines.append(14*' ' + ''.join(['{:11d}'.format(c + 1) \
+                                       for c in columns]) + '\n')
+        for i in range(first, N):
+            lines.append(' {:5d}  {:<2s}'.format(i + 1, symbols[i]) + \
+                         ''.join(['{:11.6f}'.format(matrix[i, c]) \
+                                  for c in columns if c <= i]) + '\n')
+    return ''.join(lines)
+
+
+def charges(title, symbols, values):
+    """
+    Writes a table of Mulliken charges.
+    """
+    lines = [' {}:\n'.format(title), 15*' ' + '1\n']
+    for i, (symbol, value) in enumerate(zip(symbols, values)):
+        lines.append(' {:5d}  {:<2s} {:10.6f}\n'.format(i + 1, symbol, value))
+    return ''.join(lines)
+
+
+def gaussian_log(steps=3, atoms=7, seed=0):
+    """
+    Writes a small Gaussian log: `steps` optimization steps of a molecule
+    of `atoms` atoms, followed by its thermochemistry.
+
+    Returns
+    -------
+    (text, values): the log, and a dict of the values written to it (a
+    list of one value per step, for most), keyed by field.
+    """
+    rng = np.random.RandomState(seed)
+    symbols = [ELEMENTS[i % len(ELEMENTS)] for i in range(atoms)]
+    heavy = [i for i, s in enumerate(symbols) if s != 'H']
+    values = {'atom_positions' : [],
+              'distance_matrix' : [],
+              'rotational_constants' : [],
+              'scf_energy' : [],
+              'HOMO' : []}
+    lines = [' Entering Gaussian System, Link 0=g09\n',
+             ' %chk=job.chk\n',
+             ' #p opt freq b3lyp/6-31g(d)\n',
+             '\n']
+    for step in range(steps):
+        positions = np.round(rng.uniform(-3, 3, (atoms, 3)), 6)
+        matrix = np.sqrt(((positions[:, None] - positions[None])**2) \
+                         .sum(axis=-1))
+        matrix = np.round(np.tril(matrix), 6)
+        constants = np.round(rng.uniform(0.1, 9, 3), 7)
+        energy = np.round(rng.uniform(-500, -400), 10)
+        occupied = np.round(rng.uniform(-20, -0.1, 8), 5)
+        virtual = np.round(rng.uniform(0.01, 3, 7), 5)
+        lines.append(' NAtoms={:7d} NActive={:7d} NUniq={:7d} '
+                     'SFac= 1.00D+00\n'.format(atoms, atoms, atoms))
+        lines.append(orientation('Input', symbols, positions))
+        lines.append(orientation('Standard', symbols, positions))
+        lines.append(' Rotational constants (GHZ):' + \
+                     ''.join(['{:15.7f}'.format(c) for c in constants]) + \
+                     '\n')
+        lines.append(distance_matrix(symbols, matrix))
+        lines.append(' Stoichiometry    C{}\n'.format(atoms))
+        lines.append(' SCF Done:  E(RB3LYP) = {:.10f}     '
+                     'A.U. after   10 cycles\n'.format(energy))
+        for label, eigenvalues in (('occ.', occupied[:5]),
+                                   ('occ.', occupied[5:]),
+                                   ('virt.', virtual[:5]),
+                                   ('virt.', virtual[5:])):
+            lines.append(' Alpha {:>5s} eigenvalues --'.format(label) + \
+                         ''.join(['{:10.5f}'.format(e) \
+                                  for e in eigenvalues]) + '\n')
+        lines.append('          Condensed to atoms (all electrons):\n')
+        lines.append(charges('Mulliken charges', symbols,
+                             rng.uniform(-1, 1, atoms)))
+        lines.append(' Sum of Mulliken charges =   0.00000\n')
+        lines.append(charges('Mulliken charges with hydrogens summed into '
+                             'heavy atoms', [symbols[i] for i in heavy],
+                             rng.uniform(-1, 1, len(heavy))))
+        lines.append(' Electronic spatial extent (au):  <R**2>=  '
+                     '        1234.5678\n')
+        lines.append(' Leave Link  601\n')
+        values['atom_positions'].extend([positions, positions])
+        values['distance_matrix'].append(matrix + matrix.T)
+        values['rotational_constants'].append(constants)
+        values['scf_energy'].append(energy)
+        values['HOMO'].append(occupied[-1])
+    lines.append(' Zero-point vibrational energy     587487.4 (Joules/Mol)\n'
+                 ' Molecular mass:   212.10620 amu.\n'
+                 '                     E (Thermal)             CV'
+                 '                S\n'
+                 '                      KCal/Mol        Cal/Mol-Kelvin'
+                 '    Cal/Mol-Kelvin\n'
+                 ' Total                  111.141             46.009'
+                 '            125.125\n'
+                 ' Electronic               0.000              0.000'
+                 '              0.000\n'
+                 ' Translational            0.889              2.981'
+                 '             41.608\n'
+                 ' Rotational               0.889              2.981'
+                 '             32.507\n'
+                 ' Vibrational            109.364             40.047'
+                 '             51.010\n'
+                 ' Normal termination of Gaussian 09 at '
+                 'Mon Jan  1 00:00:00 2024.\n')
+    return ''.join(lines), values
+
+
+class LogDir(object):
+    """
+    A temporary directory, removed on exit, to write logs (and caches,
+    indices, etc.) to.
+
+    Example:
+
+    ```
+    with LogDir() as tmp:
+        filename = tmp.write('job.log', text)
+    ```
+    """
+    def __init__(self):
+        self.path = tempfile.mkdtemp()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Removes the directory, and everything in it.
+        """
+        shutil.rmtree(self.path)
+
+    def join(self, *names):
+        """
+        Returns the path of `names` in the directory.
+        """
+        return os.path.join(self.path, *names)
+
+    def write(self, name, text, opener=open):
+        """
+        Writes `text` to the file `name` (e.g. 'b/c.log', creating 'b'),
+        opened with `opener`, e.g. gzip.open, and returns its path.
+        """
+        filename = self.join(name)
+        dirname = os.path.dirname(filename)
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        with opener(filename, 'wb') as ofs:
+            ofs.write(text.encode('latin1'))
+        return filename
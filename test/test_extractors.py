@@ -1,8 +1,19 @@
 from __future__ import print_function
 import sys
 sys.path.append('..')
+from parse.core.extractors import RegexExtractor
 from parse.core.extractors import RegexRangeExtractor
+from parse.core.extractors import MultiRegexRangeExtractor
+from parse.core.extractors import required_literal
+from parse.core.buffers import mapped, span_text
+from parse.core.incremental import IncrementalScan
+from parse.core.parallel import parallel_spans
+from parse.core import transport
+from parse.core.tables import read_table, read_values
+from parse.core.stacks import stack
+from parse.core.fortran import read_fixed
 from parse.gaussian.log import get_distance_matrix
+from synthetic import gaussian_log, LogDir
 import numpy as np
 import re
 
@@ -40,6 +51,278 @@ class TestClass: # keep this the same
 		print(matches[0])
 		print("</RegexRangeExtractor>")
 
+	def test_MultiRegexRangeExtractorAlternation(self):
+		# the line-start prefix of a start pattern with a top-level '|'
+		# only binds to its first alternative
+		text = 'x\n  foo Bar\n 1\nEnd\n  Q here\nEnd\n'
+		mre = MultiRegexRangeExtractor([(r'^\s*(Q)|(Bar)', r'^End'),
+										(r'^\s*Distance', r'^End')])
+		lines = mre(iter(text.splitlines(True)))
+		spans = mre.spans(text)
+		assert lines == [[span_text(text, b, e) for b, e in s] for s in spans]
+		assert lines[0] == [' 1\n', '']
+
+	def test_required_literal(self):
+		assert required_literal(r'^\s*SCF Done:') == 'SCF Done:'
+		assert required_literal(r'Coordinates \(Angstroms\)') == \
+			'Coordinates (Angstroms)'
+		assert required_literal(r'^\s*Alpha\s+occ\.\s+eigenvalues') == \
+			'eigenvalues'
+		assert required_literal(r'^\s*-{5,}') is None
+		assert required_literal(r'^\s*(Electronic)|(APT)') is None
+
+	def test_RegexRangeExtractorFromEndStartRun(self):
+		# blocks whose start pattern matches several consecutive lines
+		text = 'head\n' \
+			' Alpha  occ. eigenvalues --  -1.0  -2.0\n' \
+			' Alpha  occ. eigenvalues --  -0.5\n' \
+			' Alpha virt. eigenvalues --   0.1\n' \
+			' Alpha  occ. eigenvalues --  -3.0\n' \
+			' Alpha  occ. eigenvalues --  -0.25\n' \
+			' Alpha virt. eigenvalues --   0.2\n'
+		rre = RegexRangeExtractor(r'^\s*Alpha\s+occ\.\s+eigenvalues',
+								  r'^\s*Alpha\s+virt\.\s+eigenvalues',
+								  include_start=True)
+		spans = list(rre.iter_spans_from_end(text))
+		assert spans == rre.spans(text)[::-1]
+		assert span_text(text, *spans[0]).count('occ.') == 2
+
+	def test_transport(self):
+		values = {'positions' : [np.random.rand(100, 3) for i in range(3)],
+			'energy' : -1.5,
+			'charges' : (np.arange(4), 'e')}
+		received = transport.receive(transport.share(values))
+		assert received['energy'] == values['energy']
+		assert received['charges'][1] == 'e'
+		assert np.array_equal(received['charges'][0], values['charges'][0])
+		for a, b in zip(received['positions'], values['positions']):
+			assert np.array_equal(a, b)
+
+	def test_read_table(self):
+		block = 'header\n  1  C  -0.5  1.0  2.0\n  2  Cl  0.25  3.0  4.0\n'
+		indices, symbols, xyz = read_table(block,
+			(int, str, None, (float, 2)), skip=1)
+		assert indices.tolist() == [1, 2]
+		assert symbols.tolist() == ['C', 'Cl']
+		assert xyz.shape == (2, 2)
+		assert np.allclose(xyz, [[1., 2.], [3., 4.]])
+		try:
+			read_table(block, (int, str), skip=1)
+			assert False
+		except ValueError:
+			pass
+		values = read_values(' occ. -- -1.5  2.0\n occ. --  3.25\n', label='--')
+		assert np.allclose(values, [-1.5, 2.0, 3.25])
+
+	def test_stack(self):
+		arrays = [np.random.rand(5, 3) for i in range(40)]
+		values = stack(iter(arrays), capacity=3)
+		assert np.array_equal(values, np.array(arrays))
+		with LogDir() as tmp:
+			filename = tmp.join('stack.npy')
+			values = stack(iter(arrays), dtype=np.float32, out=filename)
+			assert values.shape == (40, 5, 3)
+			assert np.load(filename).dtype == np.float32
+			assert np.allclose(np.load(filename), arrays, atol=1e-6)
+			del values
+			assert stack([], out=filename).shape == (0,)
+		try:
+			stack([np.zeros(3), np.zeros(4)])
+			assert False
+		except ValueError:
+			pass
+
+	def test_read_fixed(self):
+		block = ' Alpha  occ. eigenvalues -- -100.23456-100.23400 -10.23456\n' \
+			' Alpha  occ. eigenvalues --   -1.03364**********\n'
+		values = read_fixed(block, 10, label='-- ')
+		assert np.allclose(values[:4], [-100.23456, -100.234, -10.23456, -1.03364])
+		assert np.isnan(values[4])
+		block = ' Polarizability= 7.55698563D+00-3.49112367D+01 9.67862014D+00\n' \
+			'                 1.26424183D+01 1.49929498d+00 8.38127236D+00\n'
+		values = read_fixed(block, 15, label='=')
+		assert np.allclose(values, [7.55698563, -34.9112367, 9.67862014,
+			12.6424183, 1.49929498, 8.38127236])
+
 	def tearDown(self):
 		# clean up
 		pass
+
+
+class TestSynthetic:
+	"""
+	Tests run on a small log written for them (see synthetic.py), rather
+	than on the logs in data/.
+	"""
+	steps = 12
+
+	def setUp(self):
+		self.tmp = LogDir()
+		text, values = gaussian_log(steps=self.steps)
+		self.filename = self.tmp.write('job.log', text)
+
+	def test_MultiRegexRangeExtractor(self):
+		extractors = [RegexRangeExtractor(r'^\s*Distance', r'^\s*[a-zA-Z]'),
+					  RegexRangeExtractor(r'Coordinates \(Angstroms\)',
+										  r'^\s*-{5,}',
+										  skip=2,
+										  include_start=True),
+					  RegexRangeExtractor(r'^\s*Alpha\s+virt\.\s+eigenvalues',
+										  r'^\s*Alpha\s+virt\.\s+eigenvalues',
+										  reverse_stop=True,
+										  include_start=True)]
+		mre = MultiRegexRangeExtractor(extractors)
+		with open(self.filename) as ifs:
+			matches = mre(ifs)
+		assert len(matches) == len(extractors)
+		assert len(matches[0]) == self.steps
+		for rre, match in zip(extractors, matches):
+			with open(self.filename) as ifs:
+				assert match == rre(ifs)
+
+	def test_MultiRegexRangeExtractorStops(self):
+		# blocks closed by jumping to their stop line: with and without
+		# a literal, with other blocks starting inside them, and with a
+		# stop that a search of the whole buffer would miss
+		text = 'head\n Distance\n  1\n\n  2 3\n Mulliken\n  4\n Sum\n' \
+			' x\n Distance\n  5\n'
+		extractors = [RegexRangeExtractor(r'^\s*Distance', r'^\s*[a-zA-Z]'),
+			RegexRangeExtractor(r'^\s*Mulliken', r'^\s*Sum',
+				include_stop=True),
+			RegexRangeExtractor(r'^\s*Distance', r'^$', skip=1)]
+		mre = MultiRegexRangeExtractor(extractors)
+		spans = mre.spans(text)
+		assert spans == [rre.spans(text) for rre in extractors]
+		blocks = [[span_text(text, b, e) for b, e in s] for s in spans]
+		assert blocks[0] == ['  1\n\n  2 3\n', '  5\n']
+		assert blocks[1] == ['  4\n Sum\n']
+		assert blocks[2] == ['  1\n', '  5\n']
+		assert mre(iter(text.splitlines(True)))[:2] == blocks[:2]
+
+	def test_RegexRangeExtractorSpans(self):
+		rre = RegexRangeExtractor(r'Coordinates \(Angstroms\)', r'^\s*-{5,}',
+								  skip=2,
+								  include_start=True)
+		filename = self.filename
+		with open(filename) as ifs:
+			matches = rre(ifs)
+		with mapped(filename) as buf:
+			spans = rre.spans(buf)
+			assert [span_text(buf, b, e) for b, e in spans] == matches
+
+	def test_RegexRangeExtractorInPlace(self):
+		# a file searched in place (memory mapped) and one read line by line
+		rre = RegexRangeExtractor(r'^\s*Distance', r'^\s*[a-zA-Z]')
+		with open(self.filename) as ifs:
+			matches = rre(ifs)
+		with open(self.filename) as ifs:
+			lines = rre(iter(ifs.readline, ''))
+		assert matches == lines
+
+	def test_RegexRangeExtractorIterBlocks(self):
+		rre = RegexRangeExtractor(r'^\s*Distance', r'^\s*[a-zA-Z]')
+		with open(self.filename) as ifs:
+			matches = rre(ifs)
+		with open(self.filename) as ifs:
+			blocks = rre.iter_blocks(ifs)
+			assert next(blocks) == matches[0]
+			assert [matches[0]] + list(blocks) == matches
+
+	def test_RegexRangeExtractorMaxMatches(self):
+		rre = RegexRangeExtractor(r'^\s*Distance', r'^\s*[a-zA-Z]')
+		with open(self.filename) as ifs:
+			matches = rre(ifs)
+		with open(self.filename) as ifs:
+			assert rre(ifs, max_matches=1) == matches[:1]
+		with open(self.filename) as ifs:
+			assert rre(ifs, debug=True, max_matches=2) == matches[:2]
+
+	def test_RegexRangeExtractorFromEnd(self):
+		rre = RegexRangeExtractor(r'^\s*Distance', r'^\s*[a-zA-Z]')
+		with open(self.filename) as ifs:
+			matches = rre(ifs)
+		with open(self.filename) as ifs:
+			assert rre(ifs, from_end=True) == matches[::-1]
+		with open(self.filename) as ifs:
+			assert rre(ifs, from_end=True, max_matches=1) == matches[-1:]
+
+	def test_RegexRangeExtractorFromEndOpen(self):
+		# the last block of a running job, cut off before its stop line,
+		# is left out
+		text = 'Start\n 1\nEnd\nStart\n 2\nEnd\nStart\n 3\n'
+		rre = RegexRangeExtractor(r'^Start', r'^End')
+		spans = list(rre.iter_spans_from_end(text))
+		assert spans == rre.spans(text)[-2::-1]
+		assert span_text(text, *spans[0]) == ' 2\n'
+		# ...but a single line is complete at the end of the text
+		text = 'Start\n 1\nStart\n'
+		rex = RegexExtractor(r'^Start')
+		spans = list(rex.iter_spans_from_end(text))
+		assert spans == rex.spans(text)[::-1]
+		assert span_text(text, *spans[0]) == 'Start\n'
+
+	def test_IncrementalScan(self):
+		rre = RegexRangeExtractor(r'^\s*Distance', r'^\s*[a-zA-Z]')
+		with open(self.filename, 'rb') as ifs:
+			contents = ifs.read()
+		with open(self.filename) as ifs:
+			matches = rre(ifs)
+		filename = self.tmp.join('growing.log')
+		scan = IncrementalScan([rre])
+		blocks = []
+		# write the file in pieces that cut lines, and blocks, in two
+		for end in range(1000, len(contents) + 1000, 1000):
+			with open(filename, 'wb') as ofs:
+				ofs.write(contents[:end])
+			blocks.extend(scan.update(filename)[0])
+		assert blocks == matches
+
+	def test_IncrementalScanState(self):
+		rre = RegexRangeExtractor(r'^\s*Distance', r'^\s*[a-zA-Z]')
+		with open(self.filename, 'rb') as ifs:
+			contents = ifs.read()
+		with open(self.filename) as ifs:
+			matches = rre(ifs)
+		filename = self.tmp.join('growing.log')
+		state = self.tmp.join('growing.log.state')
+		with open(filename, 'wb') as ofs:
+			ofs.write(contents[:len(contents)//2])
+		scan = IncrementalScan([rre], keep=True)
+		scan.update(filename)
+		scan.save(state)
+		with open(filename, 'wb') as ofs:
+			ofs.write(contents)
+		# a new scan carries on from the saved state
+		scan = IncrementalScan([rre], keep=True)
+		assert scan.load(state)
+		offset = scan.offset
+		assert offset > 0
+		scan.update(filename)
+		assert scan.blocks[0] == matches
+		# ...unless the file no longer holds what was read
+		with open(filename, 'wb') as ofs:
+			ofs.write(contents[:offset - 10] + 10*b'#' + contents[offset:])
+		scan = IncrementalScan([rre], keep=True)
+		assert scan.load(state)
+		scan.update(filename)
+		assert len(scan.blocks[0]) == len(matches)
+
+	def test_parallel_spans(self):
+		filename = self.filename
+		extractors = [RegexRangeExtractor(r'^\s*Distance', r'^\s*[a-zA-Z]'),
+			RegexRangeExtractor(r'^\s*Standard orientation', r'^\s*Rotational',
+				include_start=True, skip=4),
+			RegexRangeExtractor(r'^\s*Mulliken', r'^\s*Sum', reverse_stop=True)]
+		with mapped(filename) as buf:
+			spans = [rre.spans(buf) for rre in extractors]
+		# chunks small enough that blocks, and skipped lines, cross them
+		for chunksize in (1000, 9999):
+			assert parallel_spans(filename, extractors,
+				workers=2, chunksize=chunksize) == spans
+		with open(filename) as ifs:
+			matches = extractors[0](ifs)
+		with open(filename) as ifs:
+			assert extractors[0](ifs, workers=2) == matches
+
+	def tearDown(self):
+		self.tmp.close()
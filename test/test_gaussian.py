@@ -1,8 +1,20 @@
 from __future__ import print_function
+import gzip
+import os
+import pickle
+import sqlite3
 import sys
+import time
+import warnings
+from unittest import SkipTest
 sys.path.append('..')
 from StringIO import StringIO
 import numpy as np
+from parse.core import cache
+from parse.core import transport
+from parse.core.extractors import MultiRegexRangeExtractor
+from parse.core.extractors import RegexRangeExtractor
+from parse.core.extractors import required_literal
 # log
 from parse.gaussian import get_apt_charges
 from parse.gaussian import get_atom_count
@@ -30,6 +42,26 @@ from parse.gaussian import get_scf_energy
 from parse.gaussian import get_SMD_CDS_energy
 from parse.gaussian import get_spectroscopic_data
 from parse.gaussian import get_ZPE
+from parse.gaussian import Campaign
+from parse.gaussian import Corpus
+from parse.gaussian import follow
+from parse.gaussian import GaussianLog
+from parse.gaussian import index_jobs
+from parse.gaussian import index_log
+from parse.gaussian import parse_all
+from parse.gaussian import parse_jobs
+from parse.gaussian import parse_many
+from parse.gaussian import read_job
+from parse.gaussian import iter_atom_positions
+from parse.gaussian import iter_scf_energy
+from parse.gaussian.log import aio
+from parse.gaussian.log import jobs
+try:
+    # python 3 only
+    import asyncio
+except ImportError:
+    asyncio = None
+from synthetic import gaussian_log, LogDir
 
 # parse the thermodynamic table
 def parse_thermo(filename):
@@ -287,3 +319,387 @@ class TestClass: # keep this the same
     def tearDown(self):
         pass
 #class TestClass: # keep this the same
+
+
+class TestSynthetic:
+    """
+    Tests run on a small log written for them (see synthetic.py), rather
+    than on the logs in data/.
+    """
+    text = None
+    values = None
+
+    def setUp(self):
+        if TestSynthetic.text is None:
+            TestSynthetic.text, TestSynthetic.values = gaussian_log()
+        self.text = TestSynthetic.text
+        self.values = TestSynthetic.values
+
+    def test_get_atom_positions_trajectory(self):
+        positions = self.values['atom_positions']
+        values = get_atom_positions(StringIO(self.text), trajectory=True)
+        assert(values.shape == (len(positions),) + positions[0].shape)
+        assert(np.allclose(values, positions))
+        with LogDir() as tmp:
+            filename = tmp.join('trajectory.npy')
+            values = get_atom_positions(StringIO(self.text), trajectory=True,
+                                        dtype=np.float32, out=filename)
+            assert(values.dtype == np.float32)
+            assert(np.allclose(np.load(filename), positions, atol=1e-5))
+            del values
+
+    def test_get_distance_matrix_condensed(self):
+        values = get_distance_matrix(StringIO(self.text), dtype=np.float32,
+                                     condensed=True)
+        matrix = self.values['distance_matrix'][0]
+        N = len(matrix)
+        assert(values[0].dtype == np.float32)
+        assert(values[0].shape == (N*(N - 1)//2,))
+        assert(np.allclose(values[0], matrix[np.triu_indices(N, 1)],
+                           atol=1e-5))
+
+    def test_get_distance_matrix_from_coordinates(self):
+        matrices = self.values['distance_matrix']
+        values = get_distance_matrix(StringIO(self.text),
+                                     source='coordinates')
+        assert(len(values) == len(matrices))
+        assert(all([np.allclose(a, b, atol=1e-5) for a, b in \
+                    zip(values, matrices)]))
+
+    def test_parse_all(self):
+        values = parse_all(StringIO(self.text),
+                           fields=['scf_energy',
+                                   'atom_positions',
+                                   'entropy',
+                                   ('mulliken_charges',
+                                    {'hydrogen_summed_into_heavy_atoms': True})])
+        assert(np.allclose(values['scf_energy'], self.values['scf_energy']))
+        positions = self.values['atom_positions']
+        assert(len(values['atom_positions']) == len(positions))
+        assert(all([np.allclose(a, b) for a, b in \
+                    zip(values['atom_positions'], positions)]))
+        assert(values['entropy'] == get_entropy(StringIO(self.text)))
+        charges = get_mulliken_charges(StringIO(self.text),
+                                       hydrogen_summed_into_heavy_atoms=True)
+        assert(len(values['mulliken_charges']) == len(charges))
+        assert(np.allclose(values['mulliken_charges'][0][2], charges[0][2]))
+
+    def test_parse_all_single_pass(self):
+        getters = [get_scf_energy, get_atom_positions, get_mulliken_charges,
+                   get_HOMO, get_rotational_constants, get_distance_matrix]
+        fields = [getter.__name__[len('get_'):] for getter in getters]
+        text, values = gaussian_log(steps=20, atoms=30)
+        # the log is searched once, by the fused extractor, and each
+        # field converted from the blocks found for it
+        calls = []
+        def counted(cls, name):
+            method = cls.__dict__[name]
+            def wrapper(*args, **kwds):
+                calls.append(name)
+                return method(*args, **kwds)
+            setattr(cls, name, wrapper)
+            return method
+        walk = counted(RegexRangeExtractor, '_walk')
+        spans = counted(MultiRegexRangeExtractor, 'spans')
+        try:
+            parse_all(StringIO(text), fields)
+        finally:
+            RegexRangeExtractor._walk = walk
+            MultiRegexRangeExtractor.spans = spans
+        assert(calls == ['spans'])
+        # ...so it takes no longer than the getters, one at a time (with
+        # a margin for the noise of the timings)
+        separate = fused = float('inf')
+        for i in range(3):
+            begin = time.time()
+            for getter in getters:
+                getter(StringIO(text))
+            separate = min(separate, time.time() - begin)
+            begin = time.time()
+            parse_all(StringIO(text), fields)
+            fused = min(fused, time.time() - begin)
+        assert(fused < 1.5*separate)
+
+    def test_iter_atom_positions(self):
+        values = list(iter_atom_positions(StringIO(self.text)))
+        positions = self.values['atom_positions']
+        assert(len(values) == len(positions))
+        assert(all([np.allclose(a, b) for a, b in zip(values, positions)]))
+
+    def test_iter_scf_energy(self):
+        values = list(iter_scf_energy(StringIO(self.text)))
+        assert(np.allclose(values, self.values['scf_energy']))
+
+    def test_last(self):
+        assert(np.isclose(get_scf_energy(StringIO(self.text), last=True),
+                          self.values['scf_energy'][-1]))
+        last = get_atom_positions(StringIO(self.text), last=True)
+        assert(np.allclose(last, self.values['atom_positions'][-1]))
+
+    def test_last_truncated(self):
+        # the log of a running job, cut off in its last coordinates table
+        positions = self.values['atom_positions']
+        first = self.text.rfind('Coordinates (Angstroms)')
+        end = self.text.find(' ---', self.text.find('\n', first + 100))
+        for cut in range(first, end + 1):
+            last = get_atom_positions(StringIO(self.text[:cut]), last=True)
+            assert(np.allclose(last, positions[-2]))
+        end = self.text.find('\n', end) + 1
+        last = get_atom_positions(StringIO(self.text[:end]), last=True)
+        assert(np.allclose(last, positions[-1]))
+
+    def test_get_distance_matrix_truncated(self):
+        # the log of a running job, cut off in its last distance matrix,
+        # of 12 atoms, i.e. in three blocks of columns
+        text, values = gaussian_log(steps=2, atoms=12)
+        matrices = values['distance_matrix']
+        first = text.rfind('Distance matrix')
+        end = text.find('Stoichiometry', first)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            for cut in range(first, end + 1):
+                found = get_distance_matrix(StringIO(text[:cut]))
+                assert(len(found) == 1)
+                assert(np.allclose(found[0], matrices[0]))
+        assert(not caught)
+        # complete, once the line after it has begun
+        found = get_distance_matrix(StringIO(text[:end + 1]))
+        assert(len(found) == 2)
+        assert(np.allclose(found[1], matrices[1]))
+
+    def test_index_log(self):
+        with LogDir() as tmp:
+            filename = tmp.write('job.log', self.text)
+            scanned = get_scf_energy(filename)
+            sidecar = index_log(filename)
+            assert(os.path.exists(sidecar))
+            assert(np.allclose(get_scf_energy(filename), scanned))
+            assert(np.isclose(get_scf_energy(filename, last=True),
+                              scanned[-1]))
+
+    def test_cache(self):
+        with LogDir() as tmp:
+            filename = tmp.write('job.log', self.text)
+            scanned = get_mulliken_charges(filename)
+            cache.enable(tmp.join('cache.sqlite'))
+            try:
+                for i in range(2):
+                    values = get_mulliken_charges(filename)
+                    assert(len(values) == len(scanned))
+                    for a, b in zip(values, scanned):
+                        assert(np.allclose(a[2], b[2]))
+            finally:
+                cache.disable()
+
+    def test_cache_stale(self):
+        with LogDir() as tmp:
+            results = cache.ResultCache(tmp.join('cache.sqlite'))
+            # pickles cut short, or of a class that no longer exists
+            for blob in (pickle.dumps([1, 2, 3], 2)[:-4],
+                         b'cno_such_module\nValue\n(tR.'):
+                results.put('key', None)
+                db = results._connect()
+                with db:
+                    db.execute('UPDATE results SET value = ?',
+                               (sqlite3.Binary(blob),))
+                assert(results.get('key') == (False, None))
+                assert(db.execute('SELECT COUNT(*) '
+                                  'FROM results').fetchone()[0] == 0)
+            results.put('key', [1, 2, 3])
+            assert(results.get('key') == (True, [1, 2, 3]))
+
+    def test_GaussianLog(self):
+        with LogDir() as tmp:
+            log = GaussianLog(tmp.write('job.log', self.text))
+            assert(np.allclose(log.scf_energy, self.values['scf_energy']))
+            assert(np.allclose(log.homo, self.values['HOMO']))
+            assert(log['HOMO'] is log.homo)
+
+    def test_parse_many(self):
+        with LogDir() as tmp:
+            filename = tmp.write('job.log', self.text)
+            values = parse_many([filename, filename],
+                                fields=['scf_energy', 'rotational_constants'],
+                                workers=2)
+            assert(values['path'] == [filename, filename])
+            assert(np.allclose(values['scf_energy'],
+                               self.values['scf_energy'][-1]))
+            assert(values['rotational_constants'].shape == (2, 3))
+            # arrays returned through shared memory, or pickled: the
+            # positions of a molecule large enough to be shared
+            text, values = gaussian_log(steps=1, atoms=200)
+            filename = tmp.write('large.log', text)
+            released = []
+            release = transport.release
+            transport.release = lambda segment: \
+                released.append(release(segment) or segment)
+            try:
+                positions = [parse_many([filename, filename],
+                                        fields=['atom_positions'],
+                                        workers=2,
+                                        shared=shared)['atom_positions'] \
+                             for shared in (True, False)]
+            finally:
+                transport.release = release
+            # one segment per file, only when shared
+            assert(len(released) == 2)
+            for p in positions:
+                assert(np.allclose(p, values['atom_positions'][-1]))
+
+    def test_iter_parse_many(self):
+        with LogDir() as tmp:
+            paths = 20*[tmp.write('job.log', self.text)]
+            paths.append(tmp.join('missing.log'))
+            start = time.time()
+            values = list(aio.iter_parse_many(paths, fields=['scf_energy'],
+                                              concurrency=20,
+                                              reader=aio.slow_reader(0.1)))
+            elapsed = time.time() - start
+        assert(len(values) == len(paths))
+        # the reads wait at once, not one after another
+        assert(elapsed < 1.)
+        for path, value, error in values:
+            if path == paths[-1]:
+                assert(value is None)
+                assert(error.startswith('IOError') or
+                       error.startswith('FileNotFoundError'))
+                continue
+            assert(error is None)
+            assert(np.allclose(value['scf_energy'],
+                               self.values['scf_energy']))
+
+    def test_aparse_many(self):
+        if asyncio is None or not hasattr(aio, 'aparse_many'):
+            raise SkipTest('asyncio requires Python 3.6+')
+        with LogDir() as tmp:
+            paths = 20*[tmp.write('job.log', self.text)]
+            loop = asyncio.new_event_loop()
+            try:
+                records = aio.aparse_many(paths, fields=['scf_energy'],
+                                          concurrency=20,
+                                          reader=aio.slow_reader(0.1))
+                values = []
+                while True:
+                    try:
+                        values.append(
+                            loop.run_until_complete(records.__anext__()))
+                    except StopAsyncIteration:
+                        break
+            finally:
+                loop.close()
+        assert(len(values) == len(paths))
+        for path, value, error in values:
+            assert(error is None)
+            assert(np.allclose(value['scf_energy'],
+                               self.values['scf_energy']))
+
+    def test_compressed(self):
+        with LogDir() as tmp:
+            filename = tmp.write('job.log.gz', self.text, opener=gzip.open)
+            values = get_scf_energy(filename)
+            assert(np.allclose(values, self.values['scf_energy']))
+            values = parse_all(filename, ['scf_energy'])
+            assert(np.allclose(values['scf_energy'],
+                               self.values['scf_energy']))
+
+    def test_follow(self):
+        with LogDir() as tmp:
+            filename = tmp.write('job.log', self.text)
+            values = []
+            for new in follow(filename, ['scf_energy'],
+                              interval=0.01, idle=0):
+                values.extend(new['scf_energy'])
+        assert(np.allclose(values, self.values['scf_energy']))
+
+    def test_jobs(self):
+        with LogDir() as tmp:
+            # two jobs, as in an opt+freq calculation
+            filename = tmp.write('job.log', self.text + self.text)
+            spans = index_jobs(filename)
+            assert(len(spans) == 2)
+            assert(read_job(filename, 1) == self.text)
+            scf = self.values['scf_energy']
+            values = parse_jobs(filename, ['scf_energy'], workers=2)
+            assert([v['job'] for v in values] == [0, 1])
+            for v in values:
+                assert(np.allclose(v['scf_energy'], scf))
+            values = parse_jobs(filename, ['scf_energy'], jobs=-1)
+            assert(len(values) == 1)
+            assert(values[0]['span'] == spans[1])
+            # a later step of the same run, which has no banner of its own
+            step = ' Link1:  Proceeding to internal job step number  2.\n' + \
+                   self.text.split('\n', 1)[1]
+            filename = tmp.write('link1.log', self.text + step)
+            spans = index_jobs(filename)
+            assert(len(spans) == 2)
+            assert(read_job(filename, 0) == self.text)
+            assert(read_job(filename, 1) == step)
+            # the index holds the same starts
+            index_log(filename)
+            assert(index_jobs(filename) == spans)
+        # found by their literal text, rather than by testing every line
+        for start in jobs.STARTS:
+            assert(required_literal(start) is not None)
+
+    def test_Campaign(self):
+        with LogDir() as tmp:
+            filename = tmp.write('job.log', self.text)
+            malformed = tmp.write('malformed.log', 'not a log\n')
+            missing = tmp.join('missing.log')
+            paths = [filename, malformed, missing]
+            campaign = Campaign(tmp.join('campaign'), ['scf_energy'])
+            assert(campaign.add(paths) == 3)
+            # a worker that dies holding its lease
+            campaign.lease = 0.
+            assert(campaign._lease('lost', 1) == [filename])
+            campaign.lease = 600.
+            status = campaign.run(workers=2, batch=1)
+            assert(status['done'] == 2)
+            assert(status['failed'] == 1)
+            records = dict((r['path'], r) for r in campaign.results())
+            assert(np.allclose(records[filename]['values']['scf_energy'],
+                               self.values['scf_energy']))
+            assert(records[missing]['values'] is None)
+            assert(list(campaign.errors()) == [missing])
+            # resumed: nothing is parsed again
+            assert(campaign.add(paths) == 0)
+            assert(campaign.work() == 0)
+
+    def test_Campaign_missing(self):
+        with LogDir() as tmp:
+            # a path read back from the queue is a file name, even if it
+            # was added as unicode
+            missing = u'{}'.format(tmp.join('missing.log'))
+            campaign = Campaign(tmp.join('campaign'), ['scf_energy'])
+            campaign.add([missing])
+            status = campaign.run(workers=1)
+            assert(status['done'] == 0)
+            assert(status['failed'] == 1)
+            records = list(campaign.results())
+            assert(records[0]['values'] is None)
+            assert(records[0]['error'] is not None)
+
+    def test_Corpus(self):
+        with LogDir() as tmp:
+            for name in ('a.log', 'b/c.log'):
+                tmp.write(name, self.text)
+            corpus = Corpus(tmp.path, ['scf_energy'])
+            changes = corpus.update(workers=2)
+            assert(sorted(changes['added']) == ['a.log', 'b/c.log'])
+            assert(np.allclose(corpus.values('b/c.log')['scf_energy'],
+                               self.values['scf_energy']))
+            # nothing changed
+            changes = corpus.update(workers=2)
+            assert(changes['added'] == changes['modified'] == [])
+            assert(changes['unchanged'] == 2)
+            # one log added, one modified, one deleted
+            with open(tmp.join('a.log'), 'a') as ofs:
+                ofs.write('\n')
+            os.remove(tmp.join('b/c.log'))
+            tmp.write('d.log', self.text)
+            changes = corpus.update(workers=1)
+            assert(changes == {'added' : ['d.log'],
+                               'modified' : ['a.log'],
+                               'deleted' : ['b/c.log'],
+                               'unchanged' : 0})
+            assert(sorted(corpus.manifest()) == ['a.log', 'd.log'])